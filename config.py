@@ -10,11 +10,9 @@ import platform
 # Renkli konsol çıktısı için colorama'yı başlat
 init()
 
-# .env dosyasını yükle
+# .env dosyasını yükle (değerler ortam değişkenlerinden de verilebilir; eksik kritik değerler aşağıda kontrol edilir)
 dotenv_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".env")
-if not load_dotenv(dotenv_path):
-    print_warning(f".env dosyası bulunamadı: {dotenv_path}")
-    sys.exit(1)
+load_dotenv(dotenv_path)
 
 # Logging yapılandırması
 LOG_DIR = "logs"
@@ -114,6 +112,18 @@ MAX_VIDEO_DURATION = parse_int_env("MAX_VIDEO_DURATION", 600)
 VIDEO_QUALITY = validate_video_quality(os.getenv("VIDEO_QUALITY", "1080p"))
 DEFAULT_LANGUAGE = os.getenv("DEFAULT_LANGUAGE", "tr")
 
+# En-boy oranına göre çıktı çözünürlükleri (genişlik, yükseklik)
+ASPECT_RATIO_RESOLUTIONS = {
+    "16:9": (1920, 1080),
+    "9:16": (1080, 1920)
+}
+
+# Eşzamanlılık Ayarları
+SCENE_CONCURRENCY = max(int(os.getenv("SCENE_CONCURRENCY", "4")), 1)  # Aynı anda işlenen sahne sayısı
+BATCH_WORKERS = max(int(os.getenv("BATCH_WORKERS", "4")), 1)  # Toplu modda aynı anda işlenen iş sayısı
+API_CONCURRENCY = max(int(os.getenv("API_CONCURRENCY", "8")), 1)  # Aynı anda yapılabilecek API çağrısı sayısı
+FFMPEG_CONCURRENCY = max(int(os.getenv("FFMPEG_CONCURRENCY", "2")), 1)  # Aynı anda çalışabilecek FFmpeg kodlaması
+
 # DALL-E Ayarları
 DALLE_SETTINGS = {
     "dall-e-2": {
@@ -13,11 +13,16 @@ from PyQt5.QtWidgets import (
 from PyQt5.QtCore import Qt, QThread, pyqtSignal, QTimer
 from PyQt5.QtGui import QFont, QPalette, QColor, QClipboard
 
-from modules.content_generator import generate_youtube_content
+from modules.content_generator import SceneFeed
+from modules.job_brief import generate_job_brief, JobBrief
 from modules.tts_generator import generate_tts
 from modules.video_search_service import VideoSearchService
+from modules.pexels_client import PexelsRateLimitError
+from modules.search_planner import SearchPlanner
 from modules.video_editor import create_video
-from config import print_error, print_success, print_warning
+from modules.pipeline import StagePipeline
+from modules.clip_selector import fetch_selection
+from config import print_error, print_success, print_warning, ASPECT_RATIO_RESOLUTIONS
 
 class VideoWorker(QThread):
     """Video oluşturma işlemlerini arka planda yürüten worker sınıfı"""
@@ -72,154 +77,185 @@ class VideoWorker(QThread):
                 "subtitle_language": self.subtitle_language
             }
             
-            # 1. OpenAI ile içerik üret (20%)
-            self.log.emit(f"🚀 [{self.duration_seconds} saniye - Dil: {self.content_language.upper()} - Altyazı: {self.subtitle_language.upper()}] İçerik oluşturuluyor...", "info")
-            content = generate_youtube_content(
-                topic=self.topic,
-                duration_seconds=self.duration_seconds,
-                content_language=self.content_language,
-                subtitle_language=self.subtitle_language
-            )
-            if not content:
-                raise Exception("İçerik oluşturulamadı")
-            self.update_progress(20)
+            pipeline = StagePipeline("video_pipeline")
             
-            # İçeriği kaydet ve altyazıyı güncelle
-            content_file = os.path.join(self.project_dir, "content.json")
-            with open(content_file, "w", encoding="utf-8") as f:
-                json.dump(content, f, ensure_ascii=False, indent=2)
-            metadata.update(content)
+            # İçerik akış halinde üretilirken sahne listesi arama aşamasına erken aktarılır
+            scene_feed = SceneFeed(on_scene=lambda index, scene: self.log.emit(f"🧩 Sahne {index} hazır: {scene.get('query', '')}", "info"))
             
-            # Altyazı metnini güncelle
-            self.video_style["subtitle"]["text"] = content["subtitle_text"]
-            
-            # 2. Pexels'ten videolar (70%)
-            self.log.emit(f"🎥 [{self.duration_seconds} saniye] Videolar aranıyor...", "info")
-            videos_dir = os.path.join(self.project_dir, "videos")
-            os.makedirs(videos_dir, exist_ok=True)
-            
-            video_files = []
-            total_duration = 0
-            video_index = 1
-            min_scene_duration = self.content_settings.get("min_scene_duration", 5)
-            
-            # Her sahne için video ara ve indir
-            for scene in content["pexels_prompts"]:
-                if len(video_files) >= 6:  # En fazla 6 video
-                    break
-                    
-                scene_duration = min(int(scene["duration"]), self.duration_seconds - total_duration)
-                if scene_duration <= 0:
-                    break
-                    
-                self.log.emit(f"🔍 Video aranıyor ({video_index}. sahne): {scene['description']}", "info")
+            def content_stage(inputs: dict) -> dict:
+                # 1. OpenAI ile içerik üret (20%)
+                self.log.emit(f"🚀 [{self.duration_seconds} saniye - Dil: {self.content_language.upper()} - Altyazı: {self.subtitle_language.upper()}] İçerik oluşturuluyor...", "info")
+                try:
+                    # Senaryo, altyazı, SEO ve sahne arama terimleri tek istekte (iş özeti)
+                    brief = generate_job_brief(
+                        topic=self.topic,
+                        duration_seconds=self.duration_seconds,
+                        content_language=self.content_language,
+                        subtitle_language=self.subtitle_language,
+                        scene_feed=scene_feed
+                    )
+                finally:
+                    # Arama aşaması hiçbir durumda beklemede kalmasın (liste iletildiyse etkisizdir)
+                    scene_feed.close(error=Exception("İçerik oluşturulamadı"))
+                content = brief.content if brief else None
+                if not content:
+                    raise Exception("İçerik oluşturulamadı")
+                self.update_progress(20)
                 
-                # Ana arama terimleri
-                search_terms = [
-                    scene['query'],  # Ana arama terimi
-                    self.topic,  # Yedek olarak konuyu da dene
-                    scene['description']  # Son çare olarak açıklamayı dene
-                ]
+                # İçeriği kaydet ve altyazıyı güncelle
+                content_file = os.path.join(self.project_dir, "content.json")
+                with open(content_file, "w", encoding="utf-8") as f:
+                    json.dump(content, f, ensure_ascii=False, indent=2)
+                metadata.update(content)
                 
-                video_found = False
-                for term in search_terms:
-                    if video_found:
-                        break
-                        
-                    self.log.emit(f"🔍 Arama terimi: {term}", "info")
-                    videos = self.video_service.search_videos(
-                        query=term,
-                        min_duration=min_scene_duration,
-                        max_duration=scene_duration + 5
-                    )
+                # Altyazı metnini güncelle
+                self.video_style["subtitle"]["text"] = content["subtitle_text"]
+                return content
+                
+            # Sahne listesi içerik akışından erken gelir; bekleme ayrı aşama olarak ölçülür,
+            # böylece arama aşamasının süresine içerik üretimi karışmaz
+            def scenes_stage(inputs: dict) -> JobBrief:
+                return JobBrief.from_scene_feed(self.topic, scene_feed)
+                
+            # TTS ve video arama yalnızca içeriğe bağlı olduğu için paralel çalışır
+            def search_stage(inputs: dict) -> list:
+                # 2. Pexels'te sahne adayları (50%); sahne listesi gelir gelmez, içeriğin kalanı beklenmeden
+                brief = inputs["scenes"]
+                prompts = brief.scenes
+                self.log.emit(f"🎥 [{self.duration_seconds} saniye] Videolar aranıyor...", "info")
+                min_scene_duration = self.content_settings.get("min_scene_duration", 5)
+                
+                # Arama terimleri iş özetinden gelir; özette yoksa tüm sahneler için tek seferde planlanır
+                # (sahne aramaları ek GPT çağrısı yapmaz)
+                plan = brief.search_plan(self.video_service.planner)
+                
+                def search(term: str, search_plan: dict, min_duration: int, max_duration: int) -> list:
+                    self.log.emit(f"🔍 Arama terimleri: {', '.join(search_plan['terms'])}", "info")
+                    try:
+                        return self.video_service.search_videos(
+                            query=term,
+                            min_duration=min_duration,
+                            max_duration=max_duration,
+                            target_size=ASPECT_RATIO_RESOLUTIONS.get(self.aspect_ratio),
+                            plan=search_plan
+                        )
+                    except PexelsRateLimitError:
+                        # Kota açılmadıysa yedek (yanlış) görüntülere düşmek yerine işi durdur
+                        raise
+                    except Exception:
+                        return []
+                
+                # Her sahne için sıralı adayları topla; indirme, seslendirme süresi belli olunca yapılır
+                scenes = []
+                for index, scene in enumerate(prompts, 1):
+                    self.log.emit(f"🔍 Video aranıyor ({index}. sahne): {scene['description']}", "info")
                     
+                    # Planda sahne terimlerinden sonra konunun ortak terimleri de denenir
+                    videos = search(
+                        scene['query'],
+                        SearchPlanner.scene_plan(plan, index - 1),
+                        min_scene_duration,
+                        max(int(scene["duration"]), min_scene_duration) + 5
+                    )
                     if videos:
-                        for video in videos:
-                            video_file = os.path.join(videos_dir, f"video_{video_index}.mp4")
-                            if self.video_service.download_video(video, video_file):
-                                video_files.append(video_file)
-                                total_duration += video['duration']
-                                video_index += 1
-                                video_found = True
-                                
-                                # Video bilgilerini metadata'ya ekle
-                                if 'videos' not in metadata:
-                                    metadata['videos'] = []
-                                metadata['videos'].append({
-                                    'scene': scene['description'],
-                                    'query': term,
-                                    'duration': video['duration']
-                                })
-                                break
+                        scenes.append({'scene': scene['description'], 'query': scene['query'], 'candidates': videos})
+                    else:
+                        self.log.emit(f"⚠️ Video bulunamadı: {scene['description']}", "warning")
+                        
+                    self.update_progress(20 + (30 * index // len(prompts)))
+                    
+                # En az 2 sahne kontrolü
+                if len(scenes) < 2:
+                    # Yedek arama: planın ana konusu ve ortak terimleri (İngilizce)
+                    backup_terms = [plan['main_subject']] + plan['shared_terms']
+                    for term in backup_terms:
+                        if len(scenes) >= 2:
+                            break
+                            
+                        self.log.emit(f"🔍 Yedek arama: {term}", "info")
+                        backup_plan = {
+                            "main_subject": plan['main_subject'],
+                            "subject_type": plan['subject_type'],
+                            "terms": [term],
+                            "backup_terms": []
+                        }
+                        videos = search(term, backup_plan, 5, 15)
+                        if videos:
+                            scenes.append({'scene': 'Yedek video', 'query': term, 'candidates': videos})
+                
+                if not scenes:
+                    raise Exception("Yeterli video bulunamadı! Bulunan video sayısı: 0")
+                return scenes
+                
+            def footage_stage(inputs: dict) -> tuple:
+                scenes = inputs["search"]
+                # 3. Seslendirme süresini kapsayan en az sayıda klibi seç ve indir (70%)
+                from modules.video_editor import get_audio_duration
+                audio_duration = get_audio_duration(inputs["tts"])
+                self.log.emit(f"TTS süresi: {audio_duration} saniye. Klipler bu süreye göre seçiliyor.", "info")
+                videos_dir = os.path.join(self.project_dir, "videos")
+                os.makedirs(videos_dir, exist_ok=True)
                 
-                if not video_found:
-                    self.log.emit(f"⚠️ Video bulunamadı: {scene['description']}", "warning")
+                def download(video: dict, seconds: float):
+                    video_file = os.path.join(videos_dir, f"video_{video['id']}.mp4")
+                    return self.video_service.download_video(video, video_file, max_seconds=seconds)
                     
-                self.update_progress(20 + (50 * len(video_files) // len(content["pexels_prompts"])))
+                selection = fetch_selection([scene['candidates'] for scene in scenes], audio_duration, download)
                 
-            # En az 2 video kontrolü
-            if len(video_files) < 2:
-                # Yedek arama terimleri ile tekrar dene
-                backup_terms = [
-                    self.topic,  # Ana konu
-                    content["seo"]["title"],  # Video başlığı
-                    content["pexels_prompts"][0]["query"]  # İlk sahnenin sorgusu
+                # Video bilgilerini metadata'ya ekle
+                metadata['videos'] = [
+                    {
+                        'scene': scenes[item['scene']]['scene'],
+                        'query': scenes[item['scene']]['query'],
+                        'duration': item['video']['duration'],
+                        'used_seconds': round(item['seconds'], 2)
+                    }
+                    for item in selection
                 ]
+                self.update_progress(70)
+                self.log.emit(f"✅ Toplam {len(selection)} video indirildi", "success")
+                return [item['path'] for item in selection], [item['seconds'] for item in selection]
                 
-                for term in backup_terms:
-                    if len(video_files) >= 2:
-                        break
-                        
-                    self.log.emit(f"🔍 Yedek arama: {term}", "info")
-                    videos = self.video_service.search_videos(
-                        query=term,
-                        min_duration=5,
-                        max_duration=15
-                    )
-                    
-                    if videos:
-                        for video in videos[:2]:  # En fazla 2 video daha ekle
-                            video_file = os.path.join(videos_dir, f"video_{video_index}.mp4")
-                            if self.video_service.download_video(video, video_file):
-                                video_files.append(video_file)
-                                total_duration += video['duration']
-                                video_index += 1
-                                
-                                # Video bilgilerini metadata'ya ekle
-                                if 'videos' not in metadata:
-                                    metadata['videos'] = []
-                                metadata['videos'].append({
-                                    'scene': 'Yedek video',
-                                    'query': term,
-                                    'duration': video['duration']
-                                })
-            
-            if len(video_files) < 2:
-                raise Exception(f"Yeterli video bulunamadı! Bulunan video sayısı: {len(video_files)}")
-            
-            self.log.emit(f"✅ Toplam {len(video_files)} video indirildi", "success")
-            
-            # 3. TTS ile seslendirme (90%)
-            self.log.emit(f"🎤 [{self.duration_seconds} saniye - Ses: {self.voice} - Hız: {self.speed}x] Seslendirme oluşturuluyor...", "info")
-            audio_file = os.path.join(self.project_dir, "audio.mp3")
-            if not generate_tts(content["tts_text"], audio_file, self.voice, self.speed):
-                raise Exception("Seslendirme oluşturulamadı")
-            self.update_progress(90)
-            
-            # 4. Video montaj (100%)
-            self.log.emit(f"🎬 Final video oluşturuluyor...", "info")
-            video_file = os.path.join(self.project_dir, "video.mp4")
-            
-            # TTS süresine göre video süresini ayarla
-            from modules.video_editor import get_audio_duration
-            audio_duration = get_audio_duration(audio_file)
-            self.log.emit(f"TTS süresi: {audio_duration} saniye. Video bu süreye göre ayarlanıyor.", "info")
-            
-            if not create_video(video_files, audio_file, video_file, video_style=self.video_style, duration=audio_duration, aspect_ratio=self.aspect_ratio):
-                raise Exception("Final video oluşturulamadı")
+            def tts_stage(inputs: dict) -> str:
+                content = inputs["content"]
+                # 4. TTS ile seslendirme
+                self.log.emit(f"🎤 [{self.duration_seconds} saniye - Ses: {self.voice} - Hız: {self.speed}x] Seslendirme oluşturuluyor...", "info")
+                audio_file = os.path.join(self.project_dir, "audio.mp3")
+                if not generate_tts(content["tts_text"], audio_file, self.voice, self.speed):
+                    raise Exception("Seslendirme oluşturulamadı")
+                return audio_file
+                
+            def render_stage(inputs: dict) -> str:
+                video_files, clip_durations = inputs["footage"]
+                audio_file = inputs["tts"]
+                # 5. Video montaj (100%)
+                self.update_progress(90)
+                self.log.emit(f"🎬 Final video oluşturuluyor...", "info")
+                video_file = os.path.join(self.project_dir, "video.mp4")
+                
+                # TTS süresine göre video süresini ayarla
+                from modules.video_editor import get_audio_duration
+                audio_duration = get_audio_duration(audio_file)
+                
+                if not create_video(video_files, audio_file, video_file, video_style=self.video_style, duration=audio_duration, aspect_ratio=self.aspect_ratio,
+                                    clip_durations=clip_durations):
+                    raise Exception("Final video oluşturulamadı")
+                return video_file
+                
+            # content → tts, sahne listesi (scenes) → search; {tts, search} → footage → render
+            pipeline.add_stage("content", content_stage)
+            pipeline.add_stage("tts", tts_stage, deps=["content"])
+            pipeline.add_stage("scenes", scenes_stage)
+            pipeline.add_stage("search", search_stage, deps=["scenes"])
+            pipeline.add_stage("footage", footage_stage, deps=["tts", "search"])
+            pipeline.add_stage("render", render_stage, deps=["tts", "footage"])
+            try:
+                results = pipeline.run()
+            finally:
+                pipeline.report(log=lambda message: self.log.emit(message, "info"))
                 
             self.update_progress(100)
-            self.finished.emit(True, video_file, metadata)
+            self.finished.emit(True, results["render"], metadata)
             
         except Exception as e:
             self.log.emit(f"❌ Hata: {str(e)}", "error")
@@ -770,11 +806,16 @@ from PyQt5.QtWidgets import (
 from PyQt5.QtCore import Qt, QThread, pyqtSignal, QTimer
 from PyQt5.QtGui import QFont, QPalette, QColor, QClipboard
 
-from modules.content_generator import generate_youtube_content
+from modules.content_generator import SceneFeed
+from modules.job_brief import generate_job_brief, JobBrief
 from modules.tts_generator import generate_tts
 from modules.video_search_service import VideoSearchService
+from modules.pexels_client import PexelsRateLimitError
+from modules.search_planner import SearchPlanner
 from modules.video_editor import create_video
-from config import print_error, print_success, print_warning
+from modules.pipeline import StagePipeline
+from modules.clip_selector import fetch_selection
+from config import print_error, print_success, print_warning, ASPECT_RATIO_RESOLUTIONS
 
 class VideoWorker(QThread):
     """Video oluşturma işlemlerini arka planda yürüten worker sınıfı"""
@@ -829,154 +870,185 @@ class VideoWorker(QThread):
                 "subtitle_language": self.subtitle_language
             }
             
-            # 1. OpenAI ile içerik üret (20%)
-            self.log.emit(f"🚀 [{self.duration_seconds} saniye - Dil: {self.content_language.upper()} - Altyazı: {self.subtitle_language.upper()}] İçerik oluşturuluyor...", "info")
-            content = generate_youtube_content(
-                topic=self.topic,
-                duration_seconds=self.duration_seconds,
-                content_language=self.content_language,
-                subtitle_language=self.subtitle_language
-            )
-            if not content:
-                raise Exception("İçerik oluşturulamadı")
-            self.update_progress(20)
-            
-            # İçeriği kaydet ve altyazıyı güncelle
-            content_file = os.path.join(self.project_dir, "content.json")
-            with open(content_file, "w", encoding="utf-8") as f:
-                json.dump(content, f, ensure_ascii=False, indent=2)
-            metadata.update(content)
-            
-            # Altyazı metnini güncelle
-            self.video_style["subtitle"]["text"] = content["subtitle_text"]
+            pipeline = StagePipeline("video_pipeline")
             
-            # 2. Pexels'ten videolar (70%)
-            self.log.emit(f"🎥 [{self.duration_seconds} saniye] Videolar aranıyor...", "info")
-            videos_dir = os.path.join(self.project_dir, "videos")
-            os.makedirs(videos_dir, exist_ok=True)
+            # İçerik akış halinde üretilirken sahne listesi arama aşamasına erken aktarılır
+            scene_feed = SceneFeed(on_scene=lambda index, scene: self.log.emit(f"🧩 Sahne {index} hazır: {scene.get('query', '')}", "info"))
             
-            video_files = []
-            total_duration = 0
-            video_index = 1
-            min_scene_duration = self.content_settings.get("min_scene_duration", 5)
-            
-            # Her sahne için video ara ve indir
-            for scene in content["pexels_prompts"]:
-                if len(video_files) >= 6:  # En fazla 6 video
-                    break
-                    
-                scene_duration = min(int(scene["duration"]), self.duration_seconds - total_duration)
-                if scene_duration <= 0:
-                    break
-                    
-                self.log.emit(f"🔍 Video aranıyor ({video_index}. sahne): {scene['description']}", "info")
+            def content_stage(inputs: dict) -> dict:
+                # 1. OpenAI ile içerik üret (20%)
+                self.log.emit(f"🚀 [{self.duration_seconds} saniye - Dil: {self.content_language.upper()} - Altyazı: {self.subtitle_language.upper()}] İçerik oluşturuluyor...", "info")
+                try:
+                    # Senaryo, altyazı, SEO ve sahne arama terimleri tek istekte (iş özeti)
+                    brief = generate_job_brief(
+                        topic=self.topic,
+                        duration_seconds=self.duration_seconds,
+                        content_language=self.content_language,
+                        subtitle_language=self.subtitle_language,
+                        scene_feed=scene_feed
+                    )
+                finally:
+                    # Arama aşaması hiçbir durumda beklemede kalmasın (liste iletildiyse etkisizdir)
+                    scene_feed.close(error=Exception("İçerik oluşturulamadı"))
+                content = brief.content if brief else None
+                if not content:
+                    raise Exception("İçerik oluşturulamadı")
+                self.update_progress(20)
                 
-                # Ana arama terimleri
-                search_terms = [
-                    scene['query'],  # Ana arama terimi
-                    self.topic,  # Yedek olarak konuyu da dene
-                    scene['description']  # Son çare olarak açıklamayı dene
-                ]
+                # İçeriği kaydet ve altyazıyı güncelle
+                content_file = os.path.join(self.project_dir, "content.json")
+                with open(content_file, "w", encoding="utf-8") as f:
+                    json.dump(content, f, ensure_ascii=False, indent=2)
+                metadata.update(content)
                 
-                video_found = False
-                for term in search_terms:
-                    if video_found:
-                        break
-                        
-                    self.log.emit(f"🔍 Arama terimi: {term}", "info")
-                    videos = self.video_service.search_videos(
-                        query=term,
-                        min_duration=min_scene_duration,
-                        max_duration=scene_duration + 5
-                    )
+                # Altyazı metnini güncelle
+                self.video_style["subtitle"]["text"] = content["subtitle_text"]
+                return content
+                
+            # Sahne listesi içerik akışından erken gelir; bekleme ayrı aşama olarak ölçülür,
+            # böylece arama aşamasının süresine içerik üretimi karışmaz
+            def scenes_stage(inputs: dict) -> JobBrief:
+                return JobBrief.from_scene_feed(self.topic, scene_feed)
+                
+            # TTS ve video arama yalnızca içeriğe bağlı olduğu için paralel çalışır
+            def search_stage(inputs: dict) -> list:
+                # 2. Pexels'te sahne adayları (50%); sahne listesi gelir gelmez, içeriğin kalanı beklenmeden
+                brief = inputs["scenes"]
+                prompts = brief.scenes
+                self.log.emit(f"🎥 [{self.duration_seconds} saniye] Videolar aranıyor...", "info")
+                min_scene_duration = self.content_settings.get("min_scene_duration", 5)
+                
+                # Arama terimleri iş özetinden gelir; özette yoksa tüm sahneler için tek seferde planlanır
+                # (sahne aramaları ek GPT çağrısı yapmaz)
+                plan = brief.search_plan(self.video_service.planner)
+                
+                def search(term: str, search_plan: dict, min_duration: int, max_duration: int) -> list:
+                    self.log.emit(f"🔍 Arama terimleri: {', '.join(search_plan['terms'])}", "info")
+                    try:
+                        return self.video_service.search_videos(
+                            query=term,
+                            min_duration=min_duration,
+                            max_duration=max_duration,
+                            target_size=ASPECT_RATIO_RESOLUTIONS.get(self.aspect_ratio),
+                            plan=search_plan
+                        )
+                    except PexelsRateLimitError:
+                        # Kota açılmadıysa yedek (yanlış) görüntülere düşmek yerine işi durdur
+                        raise
+                    except Exception:
+                        return []
+                
+                # Her sahne için sıralı adayları topla; indirme, seslendirme süresi belli olunca yapılır
+                scenes = []
+                for index, scene in enumerate(prompts, 1):
+                    self.log.emit(f"🔍 Video aranıyor ({index}. sahne): {scene['description']}", "info")
                     
+                    # Planda sahne terimlerinden sonra konunun ortak terimleri de denenir
+                    videos = search(
+                        scene['query'],
+                        SearchPlanner.scene_plan(plan, index - 1),
+                        min_scene_duration,
+                        max(int(scene["duration"]), min_scene_duration) + 5
+                    )
                     if videos:
-                        for video in videos:
-                            video_file = os.path.join(videos_dir, f"video_{video_index}.mp4")
-                            if self.video_service.download_video(video, video_file):
-                                video_files.append(video_file)
-                                total_duration += video['duration']
-                                video_index += 1
-                                video_found = True
-                                
-                                # Video bilgilerini metadata'ya ekle
-                                if 'videos' not in metadata:
-                                    metadata['videos'] = []
-                                metadata['videos'].append({
-                                    'scene': scene['description'],
-                                    'query': term,
-                                    'duration': video['duration']
-                                })
-                                break
+                        scenes.append({'scene': scene['description'], 'query': scene['query'], 'candidates': videos})
+                    else:
+                        self.log.emit(f"⚠️ Video bulunamadı: {scene['description']}", "warning")
+                        
+                    self.update_progress(20 + (30 * index // len(prompts)))
+                    
+                # En az 2 sahne kontrolü
+                if len(scenes) < 2:
+                    # Yedek arama: planın ana konusu ve ortak terimleri (İngilizce)
+                    backup_terms = [plan['main_subject']] + plan['shared_terms']
+                    for term in backup_terms:
+                        if len(scenes) >= 2:
+                            break
+                            
+                        self.log.emit(f"🔍 Yedek arama: {term}", "info")
+                        backup_plan = {
+                            "main_subject": plan['main_subject'],
+                            "subject_type": plan['subject_type'],
+                            "terms": [term],
+                            "backup_terms": []
+                        }
+                        videos = search(term, backup_plan, 5, 15)
+                        if videos:
+                            scenes.append({'scene': 'Yedek video', 'query': term, 'candidates': videos})
                 
-                if not video_found:
-                    self.log.emit(f"⚠️ Video bulunamadı: {scene['description']}", "warning")
+                if not scenes:
+                    raise Exception("Yeterli video bulunamadı! Bulunan video sayısı: 0")
+                return scenes
+                
+            def footage_stage(inputs: dict) -> tuple:
+                scenes = inputs["search"]
+                # 3. Seslendirme süresini kapsayan en az sayıda klibi seç ve indir (70%)
+                from modules.video_editor import get_audio_duration
+                audio_duration = get_audio_duration(inputs["tts"])
+                self.log.emit(f"TTS süresi: {audio_duration} saniye. Klipler bu süreye göre seçiliyor.", "info")
+                videos_dir = os.path.join(self.project_dir, "videos")
+                os.makedirs(videos_dir, exist_ok=True)
+                
+                def download(video: dict, seconds: float):
+                    video_file = os.path.join(videos_dir, f"video_{video['id']}.mp4")
+                    return self.video_service.download_video(video, video_file, max_seconds=seconds)
                     
-                self.update_progress(20 + (50 * len(video_files) // len(content["pexels_prompts"])))
+                selection = fetch_selection([scene['candidates'] for scene in scenes], audio_duration, download)
                 
-            # En az 2 video kontrolü
-            if len(video_files) < 2:
-                # Yedek arama terimleri ile tekrar dene
-                backup_terms = [
-                    self.topic,  # Ana konu
-                    content["seo"]["title"],  # Video başlığı
-                    content["pexels_prompts"][0]["query"]  # İlk sahnenin sorgusu
+                # Video bilgilerini metadata'ya ekle
+                metadata['videos'] = [
+                    {
+                        'scene': scenes[item['scene']]['scene'],
+                        'query': scenes[item['scene']]['query'],
+                        'duration': item['video']['duration'],
+                        'used_seconds': round(item['seconds'], 2)
+                    }
+                    for item in selection
                 ]
+                self.update_progress(70)
+                self.log.emit(f"✅ Toplam {len(selection)} video indirildi", "success")
+                return [item['path'] for item in selection], [item['seconds'] for item in selection]
                 
-                for term in backup_terms:
-                    if len(video_files) >= 2:
-                        break
-                        
-                    self.log.emit(f"🔍 Yedek arama: {term}", "info")
-                    videos = self.video_service.search_videos(
-                        query=term,
-                        min_duration=5,
-                        max_duration=15
-                    )
-                    
-                    if videos:
-                        for video in videos[:2]:  # En fazla 2 video daha ekle
-                            video_file = os.path.join(videos_dir, f"video_{video_index}.mp4")
-                            if self.video_service.download_video(video, video_file):
-                                video_files.append(video_file)
-                                total_duration += video['duration']
-                                video_index += 1
-                                
-                                # Video bilgilerini metadata'ya ekle
-                                if 'videos' not in metadata:
-                                    metadata['videos'] = []
-                                metadata['videos'].append({
-                                    'scene': 'Yedek video',
-                                    'query': term,
-                                    'duration': video['duration']
-                                })
-            
-            if len(video_files) < 2:
-                raise Exception(f"Yeterli video bulunamadı! Bulunan video sayısı: {len(video_files)}")
-            
-            self.log.emit(f"✅ Toplam {len(video_files)} video indirildi", "success")
-            
-            # 3. TTS ile seslendirme (90%)
-            self.log.emit(f"🎤 [{self.duration_seconds} saniye - Ses: {self.voice} - Hız: {self.speed}x] Seslendirme oluşturuluyor...", "info")
-            audio_file = os.path.join(self.project_dir, "audio.mp3")
-            if not generate_tts(content["tts_text"], audio_file, self.voice, self.speed):
-                raise Exception("Seslendirme oluşturulamadı")
-            self.update_progress(90)
-            
-            # 4. Video montaj (100%)
-            self.log.emit(f"🎬 Final video oluşturuluyor...", "info")
-            video_file = os.path.join(self.project_dir, "video.mp4")
-            
-            # TTS süresine göre video süresini ayarla
-            from modules.video_editor import get_audio_duration
-            audio_duration = get_audio_duration(audio_file)
-            self.log.emit(f"TTS süresi: {audio_duration} saniye. Video bu süreye göre ayarlanıyor.", "info")
-            
-            if not create_video(video_files, audio_file, video_file, video_style=self.video_style, duration=audio_duration, aspect_ratio=self.aspect_ratio):
-                raise Exception("Final video oluşturulamadı")
+            def tts_stage(inputs: dict) -> str:
+                content = inputs["content"]
+                # 4. TTS ile seslendirme
+                self.log.emit(f"🎤 [{self.duration_seconds} saniye - Ses: {self.voice} - Hız: {self.speed}x] Seslendirme oluşturuluyor...", "info")
+                audio_file = os.path.join(self.project_dir, "audio.mp3")
+                if not generate_tts(content["tts_text"], audio_file, self.voice, self.speed):
+                    raise Exception("Seslendirme oluşturulamadı")
+                return audio_file
+                
+            def render_stage(inputs: dict) -> str:
+                video_files, clip_durations = inputs["footage"]
+                audio_file = inputs["tts"]
+                # 5. Video montaj (100%)
+                self.update_progress(90)
+                self.log.emit(f"🎬 Final video oluşturuluyor...", "info")
+                video_file = os.path.join(self.project_dir, "video.mp4")
+                
+                # TTS süresine göre video süresini ayarla
+                from modules.video_editor import get_audio_duration
+                audio_duration = get_audio_duration(audio_file)
+                
+                if not create_video(video_files, audio_file, video_file, video_style=self.video_style, duration=audio_duration, aspect_ratio=self.aspect_ratio,
+                                    clip_durations=clip_durations):
+                    raise Exception("Final video oluşturulamadı")
+                return video_file
+                
+            # content → tts, sahne listesi (scenes) → search; {tts, search} → footage → render
+            pipeline.add_stage("content", content_stage)
+            pipeline.add_stage("tts", tts_stage, deps=["content"])
+            pipeline.add_stage("scenes", scenes_stage)
+            pipeline.add_stage("search", search_stage, deps=["scenes"])
+            pipeline.add_stage("footage", footage_stage, deps=["tts", "search"])
+            pipeline.add_stage("render", render_stage, deps=["tts", "footage"])
+            try:
+                results = pipeline.run()
+            finally:
+                pipeline.report(log=lambda message: self.log.emit(message, "info"))
                 
             self.update_progress(100)
-            self.finished.emit(True, video_file, metadata)
+            self.finished.emit(True, results["render"], metadata)
             
         except Exception as e:
             self.log.emit(f"❌ Hata: {str(e)}", "error")
@@ -1518,11 +1590,16 @@ from PyQt5.QtWidgets import (
 from PyQt5.QtCore import Qt, QThread, pyqtSignal, QTimer
 from PyQt5.QtGui import QFont, QPalette, QColor, QClipboard
 
-from modules.content_generator import generate_youtube_content
+from modules.content_generator import SceneFeed
+from modules.job_brief import generate_job_brief, JobBrief
 from modules.tts_generator import generate_tts
 from modules.video_search_service import VideoSearchService
+from modules.pexels_client import PexelsRateLimitError
+from modules.search_planner import SearchPlanner
 from modules.video_editor import create_video
-from config import print_error, print_success, print_warning
+from modules.pipeline import StagePipeline
+from modules.clip_selector import fetch_selection
+from config import print_error, print_success, print_warning, ASPECT_RATIO_RESOLUTIONS
 
 class VideoWorker(QThread):
     """Video oluşturma işlemlerini arka planda yürüten worker sınıfı"""
@@ -1577,154 +1654,185 @@ class VideoWorker(QThread):
                 "subtitle_language": self.subtitle_language
             }
             
-            # 1. OpenAI ile içerik üret (20%)
-            self.log.emit(f"🚀 [{self.duration_seconds} saniye - Dil: {self.content_language.upper()} - Altyazı: {self.subtitle_language.upper()}] İçerik oluşturuluyor...", "info")
-            content = generate_youtube_content(
-                topic=self.topic,
-                duration_seconds=self.duration_seconds,
-                content_language=self.content_language,
-                subtitle_language=self.subtitle_language
-            )
-            if not content:
-                raise Exception("İçerik oluşturulamadı")
-            self.update_progress(20)
-            
-            # İçeriği kaydet ve altyazıyı güncelle
-            content_file = os.path.join(self.project_dir, "content.json")
-            with open(content_file, "w", encoding="utf-8") as f:
-                json.dump(content, f, ensure_ascii=False, indent=2)
-            metadata.update(content)
-            
-            # Altyazı metnini güncelle
-            self.video_style["subtitle"]["text"] = content["subtitle_text"]
-            
-            # 2. Pexels'ten videolar (70%)
-            self.log.emit(f"🎥 [{self.duration_seconds} saniye] Videolar aranıyor...", "info")
-            videos_dir = os.path.join(self.project_dir, "videos")
-            os.makedirs(videos_dir, exist_ok=True)
+            pipeline = StagePipeline("video_pipeline")
             
-            video_files = []
-            total_duration = 0
-            video_index = 1
-            min_scene_duration = self.content_settings.get("min_scene_duration", 5)
+            # İçerik akış halinde üretilirken sahne listesi arama aşamasına erken aktarılır
+            scene_feed = SceneFeed(on_scene=lambda index, scene: self.log.emit(f"🧩 Sahne {index} hazır: {scene.get('query', '')}", "info"))
             
-            # Her sahne için video ara ve indir
-            for scene in content["pexels_prompts"]:
-                if len(video_files) >= 6:  # En fazla 6 video
-                    break
-                    
-                scene_duration = min(int(scene["duration"]), self.duration_seconds - total_duration)
-                if scene_duration <= 0:
-                    break
-                    
-                self.log.emit(f"🔍 Video aranıyor ({video_index}. sahne): {scene['description']}", "info")
+            def content_stage(inputs: dict) -> dict:
+                # 1. OpenAI ile içerik üret (20%)
+                self.log.emit(f"🚀 [{self.duration_seconds} saniye - Dil: {self.content_language.upper()} - Altyazı: {self.subtitle_language.upper()}] İçerik oluşturuluyor...", "info")
+                try:
+                    # Senaryo, altyazı, SEO ve sahne arama terimleri tek istekte (iş özeti)
+                    brief = generate_job_brief(
+                        topic=self.topic,
+                        duration_seconds=self.duration_seconds,
+                        content_language=self.content_language,
+                        subtitle_language=self.subtitle_language,
+                        scene_feed=scene_feed
+                    )
+                finally:
+                    # Arama aşaması hiçbir durumda beklemede kalmasın (liste iletildiyse etkisizdir)
+                    scene_feed.close(error=Exception("İçerik oluşturulamadı"))
+                content = brief.content if brief else None
+                if not content:
+                    raise Exception("İçerik oluşturulamadı")
+                self.update_progress(20)
                 
-                # Ana arama terimleri
-                search_terms = [
-                    scene['query'],  # Ana arama terimi
-                    self.topic,  # Yedek olarak konuyu da dene
-                    scene['description']  # Son çare olarak açıklamayı dene
-                ]
+                # İçeriği kaydet ve altyazıyı güncelle
+                content_file = os.path.join(self.project_dir, "content.json")
+                with open(content_file, "w", encoding="utf-8") as f:
+                    json.dump(content, f, ensure_ascii=False, indent=2)
+                metadata.update(content)
                 
-                video_found = False
-                for term in search_terms:
-                    if video_found:
-                        break
-                        
-                    self.log.emit(f"🔍 Arama terimi: {term}", "info")
-                    videos = self.video_service.search_videos(
-                        query=term,
-                        min_duration=min_scene_duration,
-                        max_duration=scene_duration + 5
-                    )
+                # Altyazı metnini güncelle
+                self.video_style["subtitle"]["text"] = content["subtitle_text"]
+                return content
+                
+            # Sahne listesi içerik akışından erken gelir; bekleme ayrı aşama olarak ölçülür,
+            # böylece arama aşamasının süresine içerik üretimi karışmaz
+            def scenes_stage(inputs: dict) -> JobBrief:
+                return JobBrief.from_scene_feed(self.topic, scene_feed)
+                
+            # TTS ve video arama yalnızca içeriğe bağlı olduğu için paralel çalışır
+            def search_stage(inputs: dict) -> list:
+                # 2. Pexels'te sahne adayları (50%); sahne listesi gelir gelmez, içeriğin kalanı beklenmeden
+                brief = inputs["scenes"]
+                prompts = brief.scenes
+                self.log.emit(f"🎥 [{self.duration_seconds} saniye] Videolar aranıyor...", "info")
+                min_scene_duration = self.content_settings.get("min_scene_duration", 5)
+                
+                # Arama terimleri iş özetinden gelir; özette yoksa tüm sahneler için tek seferde planlanır
+                # (sahne aramaları ek GPT çağrısı yapmaz)
+                plan = brief.search_plan(self.video_service.planner)
+                
+                def search(term: str, search_plan: dict, min_duration: int, max_duration: int) -> list:
+                    self.log.emit(f"🔍 Arama terimleri: {', '.join(search_plan['terms'])}", "info")
+                    try:
+                        return self.video_service.search_videos(
+                            query=term,
+                            min_duration=min_duration,
+                            max_duration=max_duration,
+                            target_size=ASPECT_RATIO_RESOLUTIONS.get(self.aspect_ratio),
+                            plan=search_plan
+                        )
+                    except PexelsRateLimitError:
+                        # Kota açılmadıysa yedek (yanlış) görüntülere düşmek yerine işi durdur
+                        raise
+                    except Exception:
+                        return []
+                
+                # Her sahne için sıralı adayları topla; indirme, seslendirme süresi belli olunca yapılır
+                scenes = []
+                for index, scene in enumerate(prompts, 1):
+                    self.log.emit(f"🔍 Video aranıyor ({index}. sahne): {scene['description']}", "info")
                     
+                    # Planda sahne terimlerinden sonra konunun ortak terimleri de denenir
+                    videos = search(
+                        scene['query'],
+                        SearchPlanner.scene_plan(plan, index - 1),
+                        min_scene_duration,
+                        max(int(scene["duration"]), min_scene_duration) + 5
+                    )
                     if videos:
-                        for video in videos:
-                            video_file = os.path.join(videos_dir, f"video_{video_index}.mp4")
-                            if self.video_service.download_video(video, video_file):
-                                video_files.append(video_file)
-                                total_duration += video['duration']
-                                video_index += 1
-                                video_found = True
-                                
-                                # Video bilgilerini metadata'ya ekle
-                                if 'videos' not in metadata:
-                                    metadata['videos'] = []
-                                metadata['videos'].append({
-                                    'scene': scene['description'],
-                                    'query': term,
-                                    'duration': video['duration']
-                                })
-                                break
+                        scenes.append({'scene': scene['description'], 'query': scene['query'], 'candidates': videos})
+                    else:
+                        self.log.emit(f"⚠️ Video bulunamadı: {scene['description']}", "warning")
+                        
+                    self.update_progress(20 + (30 * index // len(prompts)))
+                    
+                # En az 2 sahne kontrolü
+                if len(scenes) < 2:
+                    # Yedek arama: planın ana konusu ve ortak terimleri (İngilizce)
+                    backup_terms = [plan['main_subject']] + plan['shared_terms']
+                    for term in backup_terms:
+                        if len(scenes) >= 2:
+                            break
+                            
+                        self.log.emit(f"🔍 Yedek arama: {term}", "info")
+                        backup_plan = {
+                            "main_subject": plan['main_subject'],
+                            "subject_type": plan['subject_type'],
+                            "terms": [term],
+                            "backup_terms": []
+                        }
+                        videos = search(term, backup_plan, 5, 15)
+                        if videos:
+                            scenes.append({'scene': 'Yedek video', 'query': term, 'candidates': videos})
+                
+                if not scenes:
+                    raise Exception("Yeterli video bulunamadı! Bulunan video sayısı: 0")
+                return scenes
                 
-                if not video_found:
-                    self.log.emit(f"⚠️ Video bulunamadı: {scene['description']}", "warning")
+            def footage_stage(inputs: dict) -> tuple:
+                scenes = inputs["search"]
+                # 3. Seslendirme süresini kapsayan en az sayıda klibi seç ve indir (70%)
+                from modules.video_editor import get_audio_duration
+                audio_duration = get_audio_duration(inputs["tts"])
+                self.log.emit(f"TTS süresi: {audio_duration} saniye. Klipler bu süreye göre seçiliyor.", "info")
+                videos_dir = os.path.join(self.project_dir, "videos")
+                os.makedirs(videos_dir, exist_ok=True)
+                
+                def download(video: dict, seconds: float):
+                    video_file = os.path.join(videos_dir, f"video_{video['id']}.mp4")
+                    return self.video_service.download_video(video, video_file, max_seconds=seconds)
                     
-                self.update_progress(20 + (50 * len(video_files) // len(content["pexels_prompts"])))
+                selection = fetch_selection([scene['candidates'] for scene in scenes], audio_duration, download)
                 
-            # En az 2 video kontrolü
-            if len(video_files) < 2:
-                # Yedek arama terimleri ile tekrar dene
-                backup_terms = [
-                    self.topic,  # Ana konu
-                    content["seo"]["title"],  # Video başlığı
-                    content["pexels_prompts"][0]["query"]  # İlk sahnenin sorgusu
+                # Video bilgilerini metadata'ya ekle
+                metadata['videos'] = [
+                    {
+                        'scene': scenes[item['scene']]['scene'],
+                        'query': scenes[item['scene']]['query'],
+                        'duration': item['video']['duration'],
+                        'used_seconds': round(item['seconds'], 2)
+                    }
+                    for item in selection
                 ]
+                self.update_progress(70)
+                self.log.emit(f"✅ Toplam {len(selection)} video indirildi", "success")
+                return [item['path'] for item in selection], [item['seconds'] for item in selection]
                 
-                for term in backup_terms:
-                    if len(video_files) >= 2:
-                        break
-                        
-                    self.log.emit(f"🔍 Yedek arama: {term}", "info")
-                    videos = self.video_service.search_videos(
-                        query=term,
-                        min_duration=5,
-                        max_duration=15
-                    )
-                    
-                    if videos:
-                        for video in videos[:2]:  # En fazla 2 video daha ekle
-                            video_file = os.path.join(videos_dir, f"video_{video_index}.mp4")
-                            if self.video_service.download_video(video, video_file):
-                                video_files.append(video_file)
-                                total_duration += video['duration']
-                                video_index += 1
-                                
-                                # Video bilgilerini metadata'ya ekle
-                                if 'videos' not in metadata:
-                                    metadata['videos'] = []
-                                metadata['videos'].append({
-                                    'scene': 'Yedek video',
-                                    'query': term,
-                                    'duration': video['duration']
-                                })
-            
-            if len(video_files) < 2:
-                raise Exception(f"Yeterli video bulunamadı! Bulunan video sayısı: {len(video_files)}")
-            
-            self.log.emit(f"✅ Toplam {len(video_files)} video indirildi", "success")
-            
-            # 3. TTS ile seslendirme (90%)
-            self.log.emit(f"🎤 [{self.duration_seconds} saniye - Ses: {self.voice} - Hız: {self.speed}x] Seslendirme oluşturuluyor...", "info")
-            audio_file = os.path.join(self.project_dir, "audio.mp3")
-            if not generate_tts(content["tts_text"], audio_file, self.voice, self.speed):
-                raise Exception("Seslendirme oluşturulamadı")
-            self.update_progress(90)
-            
-            # 4. Video montaj (100%)
-            self.log.emit(f"🎬 Final video oluşturuluyor...", "info")
-            video_file = os.path.join(self.project_dir, "video.mp4")
-            
-            # TTS süresine göre video süresini ayarla
-            from modules.video_editor import get_audio_duration
-            audio_duration = get_audio_duration(audio_file)
-            self.log.emit(f"TTS süresi: {audio_duration} saniye. Video bu süreye göre ayarlanıyor.", "info")
-            
-            if not create_video(video_files, audio_file, video_file, video_style=self.video_style, duration=audio_duration, aspect_ratio=self.aspect_ratio):
-                raise Exception("Final video oluşturulamadı")
+            def tts_stage(inputs: dict) -> str:
+                content = inputs["content"]
+                # 4. TTS ile seslendirme
+                self.log.emit(f"🎤 [{self.duration_seconds} saniye - Ses: {self.voice} - Hız: {self.speed}x] Seslendirme oluşturuluyor...", "info")
+                audio_file = os.path.join(self.project_dir, "audio.mp3")
+                if not generate_tts(content["tts_text"], audio_file, self.voice, self.speed):
+                    raise Exception("Seslendirme oluşturulamadı")
+                return audio_file
+                
+            def render_stage(inputs: dict) -> str:
+                video_files, clip_durations = inputs["footage"]
+                audio_file = inputs["tts"]
+                # 5. Video montaj (100%)
+                self.update_progress(90)
+                self.log.emit(f"🎬 Final video oluşturuluyor...", "info")
+                video_file = os.path.join(self.project_dir, "video.mp4")
+                
+                # TTS süresine göre video süresini ayarla
+                from modules.video_editor import get_audio_duration
+                audio_duration = get_audio_duration(audio_file)
+                
+                if not create_video(video_files, audio_file, video_file, video_style=self.video_style, duration=audio_duration, aspect_ratio=self.aspect_ratio,
+                                    clip_durations=clip_durations):
+                    raise Exception("Final video oluşturulamadı")
+                return video_file
+                
+            # content → tts, sahne listesi (scenes) → search; {tts, search} → footage → render
+            pipeline.add_stage("content", content_stage)
+            pipeline.add_stage("tts", tts_stage, deps=["content"])
+            pipeline.add_stage("scenes", scenes_stage)
+            pipeline.add_stage("search", search_stage, deps=["scenes"])
+            pipeline.add_stage("footage", footage_stage, deps=["tts", "search"])
+            pipeline.add_stage("render", render_stage, deps=["tts", "footage"])
+            try:
+                results = pipeline.run()
+            finally:
+                pipeline.report(log=lambda message: self.log.emit(message, "info"))
                 
             self.update_progress(100)
-            self.finished.emit(True, video_file, metadata)
+            self.finished.emit(True, results["render"], metadata)
             
         except Exception as e:
             self.log.emit(f"❌ Hata: {str(e)}", "error")
@@ -1,21 +1,61 @@
 import os
 import json
 import argparse
-from typing import Dict, Tuple, Optional
-from modules.content_generator import generate_youtube_content
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, List, Tuple, Optional
+from modules.content_generator import SceneFeed, log_content_cache_stats, CONTENT_CACHE_ENABLED
+from modules.job_brief import generate_job_brief, JobBrief
 from modules.tts_generator import generate_tts
 from modules.video_search_service import VideoSearchService
+from modules.pexels_client import PexelsRateLimitError
+from modules.search_planner import SearchPlanner
 from modules.video_editor import create_video
-from config import print_error, print_success, print_warning
+from modules.pipeline import StagePipeline
+from modules.concurrency import api_limiter, ffmpeg_limiter, configure_limits
+from modules.checkpoint import CheckpointManifest
+from modules.http_client import log_connection_stats
+from modules.clip_selector import fetch_selection
+from modules.file_utils import atomic_write_json, stable_hash
+from config import (
+    print_error, print_success, print_warning, print_info,
+    SCENE_CONCURRENCY, BATCH_WORKERS, API_CONCURRENCY, FFMPEG_CONCURRENCY, ASPECT_RATIO_RESOLUTIONS
+)
 
-def create_project_folder(topic: str) -> str:
-    """Proje klasörünü oluştur"""
-    folder_name = '_'.join(topic.split()[:2])
-    folder_name = ''.join(c if c.isalnum() or c == '_' else '_' for c in folder_name)
+# Aynı proje klasörünü kullanan işler (toplu modda) aynı anda çalışmasın
+_project_locks_guard = threading.Lock()
+_project_locks: Dict[str, threading.Lock] = {}
+
+def create_project_folder(topic: str, folder_name: Optional[str] = None) -> str:
+    """Proje klasörünü oluştur (klasör adı verilmezse konunun ilk iki kelimesinden türetilir)"""
+    if not folder_name:
+        folder_name = '_'.join(topic.split()[:2])
+        folder_name = ''.join(c if c.isalnum() or c == '_' else '_' for c in folder_name)
     folder_path = os.path.join("output", folder_name)
     os.makedirs(folder_path, exist_ok=True)
     return folder_path
 
+def batch_folder_name(job: Dict) -> str:
+    """
+    Toplu işin proje klasörü adı
+    
+    Satır numarası ve konunun özeti eklenir; ilk iki kelimesi aynı olan konular
+    ("Makarna tarifi kolay" / "Makarna tarifi zor") farklı klasörlere yazılır, aynı
+    manifest tekrar çalıştırıldığında ise iş aynı klasörü (ve checkpoint'i) bulur.
+    """
+    slug = '_'.join(job["topic"].split()[:2])
+    slug = ''.join(c if c.isalnum() or c == '_' else '_' for c in slug)
+    return f"{job['line']:04d}_{slug}_{stable_hash(job['topic'])[:8]}"
+
+def get_project_lock(project_dir: str) -> threading.Lock:
+    """Proje klasörü için süreç içi kilidi döndür"""
+    key = os.path.abspath(project_dir)
+    with _project_locks_guard:
+        if key not in _project_locks:
+            _project_locks[key] = threading.Lock()
+        return _project_locks[key]
+
 def save_content(content: Dict, project_dir: str) -> str:
     """İçeriği JSON olarak kaydet"""
     content_file = os.path.join(project_dir, "content.json")
@@ -23,15 +63,156 @@ def save_content(content: Dict, project_dir: str) -> str:
         json.dump(content, f, ensure_ascii=False, indent=2)
     return content_file
 
-def download_video(video: Dict, project_dir: str) -> Optional[str]:
-    """Pexels'ten video indir"""
+def download_video(video: Dict, project_dir: str, video_service: Optional[VideoSearchService] = None,
+                   max_seconds: Optional[float] = None) -> Optional[str]:
+    """Pexels'ten video indir (max_seconds verilirse yalnızca kullanılacak kısım)"""
     video_file = os.path.join(project_dir, "videos", f"video_{video['id']}.mp4")
     os.makedirs(os.path.dirname(video_file), exist_ok=True)
     
-    video_service = VideoSearchService()
-    return video_service.download_video(video, video_file)
+    video_service = video_service or VideoSearchService()
+    return video_service.download_video(video, video_file, max_seconds=max_seconds)
 
-def create_youtube_video(topic: str, duration: int = 60, language: str = "tr") -> Tuple[Optional[str], Optional[Dict]]:
+class SceneVideoFetcher:
+    """Sahne adaylarını sınırlı sayıda worker ile eşzamanlı arayıp seçilen klipleri indiren yardımcı sınıf"""
+    
+    def __init__(self, project_dir: str, max_workers: int = SCENE_CONCURRENCY, checkpoint: Optional[CheckpointManifest] = None):
+        self.project_dir = project_dir
+        self.max_workers = max(int(max_workers), 1)
+        self.checkpoint = checkpoint
+        self.video_service = VideoSearchService()
+        
+        # Aynı video iki sahnede seçilirse dosyaya aynı anda yazılmasın
+        self._locks_guard = threading.Lock()
+        self._video_locks: Dict[int, threading.Lock] = {}
+        
+    def _get_video_lock(self, video_id: int) -> threading.Lock:
+        """Video ID'si için indirme kilidini döndür"""
+        with self._locks_guard:
+            if video_id not in self._video_locks:
+                self._video_locks[video_id] = threading.Lock()
+            return self._video_locks[video_id]
+            
+    def search_scene(self, idx: int, total: int, prompt, plan: Optional[Dict] = None) -> List[Dict]:
+        """Tek bir sahne için sıralı adayları ara (indirme yapmaz)"""
+        print_warning(f"Video {idx}/{total}: {prompt}")
+        try:
+            with api_limiter.slot():
+                return self.video_service.search_videos(
+                    query=prompt,
+                    per_page=3,
+                    min_duration=3,
+                    max_duration=10,
+                    target_size=ASPECT_RATIO_RESOLUTIONS["9:16"],
+                    plan=plan
+                )
+        except PexelsRateLimitError:
+            # Kota açılmadıysa sahneyi yedek adaylarla sessizce doldurmak yerine hatayı yükselt
+            raise
+        except Exception as e:
+            # Klip seçimi diğer sahnelerin adaylarıyla devam edebilir
+            print_warning(f"Video bulunamadı: {prompt} ({str(e)})")
+            return []
+        
+    def search_all(self, topic: str, prompts: List, plan: Optional[Dict] = None) -> List[List[Dict]]:
+        """
+        Tüm sahneler için adayları eşzamanlı ara
+        
+        Arama terimleri iş özetinden gelir; özet terim içermiyorsa iş başına tek GPT
+        çağrısıyla planlanır. Sahne aramaları ek çağrı yapmaz.
+        
+        Args:
+            topic (str): Video konusu
+            prompts (List): content["pexels_prompts"] listesi
+            plan (Dict, optional): İş özetinden çıkarılan arama planı
+            
+        Returns:
+            List[List[Dict]]: Sahne sırasıyla sıralı aday listeleri
+        """
+        if not prompts:
+            return []
+            
+        if not plan:
+            with api_limiter.slot():
+                plan = self.video_service.planner.plan(topic, prompts)
+            
+        total = len(prompts)
+        workers = min(self.max_workers, total)
+        print_warning(f"{total} sahne {workers} worker ile aranıyor...")
+        
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="scene") as executor:
+            futures = [
+                executor.submit(self.search_scene, idx, total, prompt, SearchPlanner.scene_plan(plan, idx - 1))
+                for idx, prompt in enumerate(prompts, 1)
+            ]
+            try:
+                # Sonuçları tamamlanma sırasına göre değil, sahne sırasına göre topla
+                scene_candidates = [future.result() for future in futures]
+            except Exception:
+                # Bir sahne başarısız olursa bekleyen işleri iptal et
+                for future in futures:
+                    future.cancel()
+                raise
+        if not any(scene_candidates):
+            raise Exception("Hiçbir sahne için video bulunamadı")
+        return scene_candidates
+        
+    def _download_clip(self, video: Dict, seconds: float) -> Optional[str]:
+        """Seçilen klibin kullanılacak kısmını indir"""
+        # CDN indirmeleri API bütçesinden slot almaz (GPT/TTS/Pexels çağrılarını bekletmesin);
+        # eşzamanlılık fetch_selection worker sayısıyla sınırlıdır
+        with self._get_video_lock(video['id']):
+            video_file = download_video(video, self.project_dir, self.video_service, max_seconds=seconds)
+        if video_file:
+            print_success(f"Video indirildi: {video_file}")
+        else:
+            print_warning(f"Video indirilemedi: {video['id']}")
+        return video_file
+        
+    def fetch_clips(self, scene_candidates: List[List[Dict]], target_duration: float) -> Tuple[List[str], List[float]]:
+        """
+        Seslendirme süresini kapsayan en az sayıda klibi seçip indir
+        
+        Args:
+            scene_candidates (List[List[Dict]]): search_all() sonucu
+            target_duration (float): Seslendirme süresi (sn)
+            
+        Returns:
+            Tuple[List[str], List[float]]: (Klip dosyaları, her klipten kullanılacak süre)
+        """
+        clips_file = os.path.join(self.project_dir, "clips.json")
+        input_hash = CheckpointManifest.input_hash(
+            "clips", [[video['id'] for video in videos] for videos in scene_candidates], round(target_duration, 2)
+        )
+        if self.checkpoint and self.checkpoint.is_complete("clips", input_hash):
+            self.checkpoint.report_skip("clips")
+            with open(clips_file, "r", encoding="utf-8") as f:
+                clips = json.load(f)
+            return [clip["path"] for clip in clips], [clip["seconds"] for clip in clips]
+            
+        try:
+            selection = fetch_selection(scene_candidates, target_duration, self._download_clip, max_workers=self.max_workers)
+        finally:
+            self.log_stats()
+            
+        clips = [{"scene": item["scene"], "path": item["path"], "seconds": item["seconds"]} for item in selection]
+        atomic_write_json(clips_file, clips)
+        if self.checkpoint:
+            self.checkpoint.mark_complete("clips", input_hash, [clips_file] + [clip["path"] for clip in clips])
+        return [clip["path"] for clip in clips], [clip["seconds"] for clip in clips]
+        
+    def log_stats(self) -> None:
+        """Arama, indirme ve bağlantı istatistiklerini yazdır"""
+        self.video_service.search_cache.log_stats()
+        self.video_service.pexels.log_stats()
+        self.video_service.analyzer.relevance_cache.log_stats()
+        if self.video_service.clip_store:
+            self.video_service.clip_store.log_stats()
+        self.video_service.log_transfer_stats()
+        log_connection_stats()
+
+def create_youtube_video(topic: str, duration: int = 60, language: str = "tr", concurrency: int = SCENE_CONCURRENCY,
+                         voice: str = "onyx", resume: bool = True, fresh: bool = False,
+                         project_name: Optional[str] = None) -> Tuple[Optional[str], Optional[Dict]]:
     """
     YouTube videosu oluştur
     
@@ -39,86 +220,287 @@ def create_youtube_video(topic: str, duration: int = 60, language: str = "tr") -
         topic (str): Video konusu
         duration (int): Video süresi (saniye)
         language (str): İçerik dili ("tr" veya "en")
+        concurrency (int): Aynı anda aranıp indirilecek sahne sayısı
+        voice (str): TTS sesi (alloy, echo, fable, onyx, nova, shimmer)
+        resume (bool): Proje klasöründeki checkpoint'e göre tamamlanmış aşamaları atla
+        fresh (bool): İçeriği önbellekten ya da checkpoint'ten almadan yeniden üret
+        project_name (str, optional): output altındaki proje klasörünün adı (toplu mod)
         
     Returns:
         Tuple[Optional[str], Optional[Dict]]: (Video dosyası yolu, İçerik bilgileri)
     """
+    pipeline = StagePipeline("video_pipeline")
+    project_lock = None
     try:
         # 1. Proje klasörü
         print_warning(f"🚀 Proje başlatılıyor: {topic}")
-        project_dir = create_project_folder(topic)
+        project_dir = create_project_folder(topic, project_name)
+        project_lock = get_project_lock(project_dir)
+        project_lock.acquire()
+        audio_file = os.path.join(project_dir, "audio.mp3")
+        output_file = os.path.join(project_dir, "video.mp4")
         
-        # 2. OpenAI API ile içerik üretimi
-        print_warning(f"📝 İçerik oluşturuluyor... (Dil: {language.upper()})")
-        content = generate_youtube_content(topic, duration, content_language=language)
-        if not content:
-            raise Exception("İçerik üretilemedi")
-            
-        # İçeriği kaydet
-        content_file = save_content(content, project_dir)
-        print_success(f"İçerik kaydedildi: {content_file}")
+        checkpoint = CheckpointManifest(project_dir)
+        if not resume:
+            checkpoint.invalidate()
+        elif fresh:
+            checkpoint.invalidate("content")
         
-        # 3. TTS ile seslendirme
-        print_warning("🎤 Seslendirme oluşturuluyor...")
-        audio_file = os.path.join(project_dir, "audio.mp3")
-        if not generate_tts(content["tts_text"], audio_file):
-            raise Exception("Ses oluşturulamadı")
-        print_success(f"Ses dosyası oluşturuldu: {audio_file}")
-        
-        # 4. Pexels'ten videolar
-        print_warning("🎥 Videolar aranıyor...")
-        video_service = VideoSearchService()
-        video_files = []
-        
-        for idx, prompt in enumerate(content["pexels_prompts"], 1):
-            print_warning(f"Video {idx}/{len(content['pexels_prompts'])}: {prompt}")
-            
-            # Video ara
-            videos = video_service.search_videos(
-                query=prompt,
-                per_page=3,
-                min_duration=3,
-                max_duration=10
-            )
-            if not videos:
-                raise Exception(f"Video bulunamadı: {prompt}")
+        # İçerik akış halinde üretilirken sahne listesi arama aşamasına erken aktarılır
+        scene_feed = SceneFeed(on_scene=lambda idx, scene: print_info(f"Sahne {idx} hazır: {scene.get('query', '')}"))
+        
+        def content_stage(inputs: Dict) -> Dict:
+            try:
+                return generate_content()
+            finally:
+                # Arama aşaması hiçbir durumda beklemede kalmasın (liste iletildiyse etkisizdir)
+                scene_feed.close(error=Exception("İçerik üretilemedi"))
                 
-            # İlk videoyu indir
-            video_file = download_video(videos[0], project_dir)
-            if not video_file:
-                raise Exception(f"Video indirilemedi: {prompt}")
+        def generate_content() -> Dict:
+            # 2. OpenAI API ile içerik üretimi
+            input_hash = CheckpointManifest.input_hash("content", topic, duration, language)
+            if checkpoint.is_complete("content", input_hash):
+                checkpoint.report_skip("content")
+                with open(checkpoint.get_outputs("content")[0], "r", encoding="utf-8") as f:
+                    content = json.load(f)
+                scene_feed.close(content["pexels_prompts"], fields={"search": content.get("search")})
+                return content
                 
-            video_files.append(video_file)
-            print_success(f"Video indirildi: {video_file}")
+            # Senaryo, altyazı, SEO ve sahne arama terimleri tek istekte (iş özeti)
+            print_warning(f"📝 İçerik oluşturuluyor... (Dil: {language.upper()})")
+            with api_limiter.slot():
+                brief = generate_job_brief(topic, duration, content_language=language, scene_feed=scene_feed, fresh=fresh)
+            if not brief:
+                raise Exception("İçerik üretilemedi")
+            content = brief.content
+                
+            # İçeriği kaydet
+            content_file = save_content(content, project_dir)
+            checkpoint.mark_complete("content", input_hash, [content_file])
+            print_success(f"İçerik kaydedildi: {content_file}")
+            return content
             
-        # 5. FFmpeg ile montaj
-        print_warning("🎬 Video oluşturuluyor...")
-        output_file = os.path.join(project_dir, "video.mp4")
-        
-        # TTS süresine göre video süresini ayarla
-        from modules.video_editor import get_audio_duration
-        audio_duration = get_audio_duration(audio_file)
-        print_warning(f"TTS süresi: {audio_duration} saniye. Video bu süreye göre ayarlanıyor.")
-        
-        if not create_video(video_files, audio_file, output_file, duration=audio_duration, aspect_ratio="9:16"):
-            raise Exception("Video oluşturulamadı")
+        def tts_stage(inputs: Dict) -> str:
+            # 3. TTS ile seslendirme
+            input_hash = CheckpointManifest.input_hash("tts", inputs["content"]["tts_text"], voice)
+            if checkpoint.is_complete("tts", input_hash):
+                checkpoint.report_skip("tts")
+                return audio_file
+                
+            print_warning("🎤 Seslendirme oluşturuluyor...")
+            with api_limiter.slot():
+                if not generate_tts(inputs["content"]["tts_text"], audio_file, voice):
+                    raise Exception("Ses oluşturulamadı")
+            checkpoint.mark_complete("tts", input_hash, [audio_file])
+            print_success(f"Ses dosyası oluşturuldu: {audio_file}")
+            return audio_file
+            
+        fetcher = SceneVideoFetcher(project_dir, max_workers=concurrency, checkpoint=checkpoint)
+            
+        def scenes_stage(inputs: Dict) -> JobBrief:
+            # İçerik akışında sahne listesinin gelmesini bekle; bekleme ayrı aşama olarak ölçülür,
+            # böylece arama aşamasının süresine ve kritik yola içerik üretimi karışmaz
+            return JobBrief.from_scene_feed(topic, scene_feed)
+            
+        def search_stage(inputs: Dict) -> List[List[Dict]]:
+            # 4. Pexels'te sahne adayları (sahne listesi gelir gelmez; içeriğin kalanı ve seslendirmeyle paralel)
+            brief = inputs["scenes"]
+            
+            # Adaylar sahnelere göre kaydedilir; yeniden çalıştırmada arama ve sıralama tekrarlanmaz,
+            # klip seçimi de aynı aday sırasıyla checkpoint'ini bulur
+            candidates_file = os.path.join(project_dir, "candidates.json")
+            input_hash = CheckpointManifest.input_hash("search", topic, brief.scenes, brief.content.get("search"))
+            if checkpoint.is_complete("search", input_hash):
+                checkpoint.report_skip("search")
+                with open(candidates_file, "r", encoding="utf-8") as f:
+                    return json.load(f)
+            
+            print_warning("🎥 Videolar aranıyor...")
+            # Arama planı özetten okunur; özet terim içermiyorsa tek istekte planlanır
+            with api_limiter.slot():
+                plan = brief.search_plan(fetcher.video_service.planner)
+            scene_candidates = fetcher.search_all(topic, brief.scenes, plan=plan)
+            atomic_write_json(candidates_file, scene_candidates)
+            checkpoint.mark_complete("search", input_hash, [candidates_file])
+            return scene_candidates
+            
+        def footage_stage(inputs: Dict) -> Tuple[List[str], List[float]]:
+            # 5. Seslendirme süresini kapsayan klipleri seç ve indir
+            from modules.video_editor import get_audio_duration
+            audio_duration = get_audio_duration(inputs["tts"])
+            print_warning(f"TTS süresi: {audio_duration} saniye. Klipler bu süreye göre seçiliyor.")
+            return fetcher.fetch_clips(inputs["search"], audio_duration)
+            
+        def render_stage(inputs: Dict) -> str:
+            # 6. FFmpeg ile montaj
+            print_warning("🎬 Video oluşturuluyor...")
+            from modules.video_editor import get_audio_duration
+            video_files, clip_durations = inputs["footage"]
+            audio_duration = get_audio_duration(inputs["tts"])
+            
+            with ffmpeg_limiter.slot():
+                if not create_video(video_files, inputs["tts"], output_file, duration=audio_duration, aspect_ratio="9:16",
+                                    clip_durations=clip_durations):
+                    raise Exception("Video oluşturulamadı")
+            return output_file
+            
+        # content → tts, sahne listesi (scenes) → search; {tts, search} → footage → render
+        pipeline.add_stage("content", content_stage)
+        pipeline.add_stage("tts", tts_stage, deps=["content"])
+        pipeline.add_stage("scenes", scenes_stage)
+        pipeline.add_stage("search", search_stage, deps=["scenes"])
+        pipeline.add_stage("footage", footage_stage, deps=["tts", "search"])
+        pipeline.add_stage("render", render_stage, deps=["tts", "footage"])
+        results = pipeline.run()
             
         print_success(f"Video başarıyla oluşturuldu: {output_file}")
-        return output_file, content
+        return results["render"], results["content"]
         
     except Exception as e:
         print_error(f"Hata: {str(e)}")
         return None, None
+    finally:
+        if project_lock:
+            project_lock.release()
+        pipeline.report()
+        if CONTENT_CACHE_ENABLED:
+            log_content_cache_stats()
+
+def load_manifest(manifest_path: str) -> List[Dict]:
+    """
+    Toplu iş manifestini oku
+    
+    Her satır bir JSON nesnesidir: {"topic": ..., "duration": 60, "language": "tr", "voice": "onyx"}
+    
+    Args:
+        manifest_path (str): JSONL manifest dosyası
+        
+    Returns:
+        List[Dict]: İş listesi (geçersiz satırlar "error" alanıyla döner)
+    """
+    jobs = []
+    with open(manifest_path, "r", encoding="utf-8") as f:
+        for line_no, line in enumerate(f, 1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                job = json.loads(line)
+                if not isinstance(job, dict) or not job.get("topic"):
+                    raise ValueError("topic alanı zorunlu")
+            except (json.JSONDecodeError, ValueError) as e:
+                job = {"error": f"Geçersiz manifest satırı: {str(e)}"}
+            job["line"] = line_no
+            jobs.append(job)
+    return jobs
+
+def run_batch_job(job: Dict, concurrency: int, resume: bool = True, fresh: bool = False) -> Dict:
+    """Manifestteki tek bir işi çalıştır ve sonuç kaydını döndür"""
+    result = {"line": job["line"], "topic": job.get("topic")}
+    if "error" in job:
+        result.update({"status": "failed", "error": job["error"]})
+        return result
+        
+    started = time.perf_counter()
+    video_file, content = create_youtube_video(
+        job["topic"],
+        int(job.get("duration", 60)),
+        job.get("language", "tr"),
+        concurrency,
+        job.get("voice", "onyx"),
+        resume,
+        fresh,
+        batch_folder_name(job)
+    )
+    result["elapsed"] = round(time.perf_counter() - started, 2)
+    
+    if video_file and content:
+        result.update({
+            "status": "ok",
+            "video_file": video_file,
+            "title": content["seo"]["title"]
+        })
+    else:
+        result.update({"status": "failed", "error": "Video oluşturulamadı"})
+    return result
+
+def run_batch(manifest_path: str, output_path: str, workers: int = BATCH_WORKERS, concurrency: int = SCENE_CONCURRENCY,
+              resume: bool = True, fresh: bool = False) -> int:
+    """
+    JSONL manifestindeki konuları worker havuzuyla işle
+    
+    Sonuçlar her iş bittiğinde çıktı JSONL dosyasına yazılır.
+    
+    Args:
+        manifest_path (str): Girdi manifest dosyası
+        output_path (str): Sonuçların yazılacağı JSONL dosyası
+        workers (int): Aynı anda işlenecek iş sayısı
+        concurrency (int): İş başına aynı anda işlenecek sahne sayısı
+        resume (bool): Checkpoint'e göre tamamlanmış aşamaları atla
+        fresh (bool): İçerikleri önbellekten almadan yeniden üret
+        
+    Returns:
+        int: Başarısız iş sayısı
+    """
+    jobs = load_manifest(manifest_path)
+    print_info(f"{len(jobs)} iş {workers} worker ile işlenecek "
+               f"(API limiti: {api_limiter.limit}, FFmpeg limiti: {ffmpeg_limiter.limit})")
+    
+    failed = 0
+    write_lock = threading.Lock()
+    with open(output_path, "a", encoding="utf-8") as out, \
+            ThreadPoolExecutor(max_workers=max(workers, 1), thread_name_prefix="batch") as executor:
+        futures = {executor.submit(run_batch_job, job, concurrency, resume, fresh): job for job in jobs}
+        for future in as_completed(futures):
+            job = futures[future]
+            try:
+                result = future.result()
+            except Exception as e:
+                result = {"line": job["line"], "topic": job.get("topic"), "status": "failed", "error": str(e)}
+                
+            if result["status"] != "ok":
+                failed += 1
+                
+            # Sonucu iş biter bitmez yaz
+            with write_lock:
+                out.write(json.dumps(result, ensure_ascii=False) + "\n")
+                out.flush()
+            print_info(f"İş tamamlandı (satır {result['line']}): {result['status']}")
+            
+    print_success(f"Toplu işlem bitti: {len(jobs) - failed}/{len(jobs)} başarılı. Sonuçlar: {output_path}")
+    return failed
 
 def main():
     """Ana program"""
     parser = argparse.ArgumentParser(description="YouTube Video Otomasyon Aracı")
-    parser.add_argument("--topic", required=True, help="Video konusu")
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--topic", help="Video konusu")
+    source.add_argument("--batch", metavar="MANIFEST", help="Konuları içeren JSONL manifest dosyası")
     parser.add_argument("--duration", type=int, default=60, help="Video süresi (saniye)")
     parser.add_argument("--language", choices=["tr", "en"], default="tr", help="İçerik dili (tr veya en)")
+    parser.add_argument("--voice", default="onyx", help="TTS sesi (alloy, echo, fable, onyx, nova, shimmer)")
+    parser.add_argument("--concurrency", type=int, default=SCENE_CONCURRENCY, help="Aynı anda işlenecek sahne sayısı")
+    parser.add_argument("--workers", type=int, default=BATCH_WORKERS, help="Toplu modda aynı anda işlenecek iş sayısı")
+    parser.add_argument("--api-concurrency", type=int, default=API_CONCURRENCY, help="Toplam eşzamanlı API çağrısı limiti")
+    parser.add_argument("--ffmpeg-concurrency", type=int, default=FFMPEG_CONCURRENCY, help="Toplam eşzamanlı FFmpeg kodlama limiti")
+    parser.add_argument("--output", help="Toplu mod sonuç dosyası (varsayılan: <manifest>.results.jsonl)")
+    parser.add_argument("--no-resume", action="store_true", help="Checkpoint'i yok say ve tüm aşamaları baştan çalıştır")
+    parser.add_argument("--fresh", action="store_true", help="İçeriği önbellekten almadan yeniden üret (CONTENT_CACHE_ENABLED)")
     args = parser.parse_args()
     
-    video_file, content = create_youtube_video(args.topic, args.duration, args.language)
+    configure_limits(args.api_concurrency, args.ffmpeg_concurrency)
+    
+    if args.batch:
+        output_path = args.output or f"{os.path.splitext(args.batch)[0]}.results.jsonl"
+        failed = run_batch(args.batch, output_path, args.workers, args.concurrency, not args.no_resume, args.fresh)
+        if failed:
+            print(f"\n❌ {failed} iş başarısız oldu!")
+        else:
+            print("\n✅ Tüm işler başarıyla tamamlandı!")
+        return
+    
+    video_file, content = create_youtube_video(args.topic, args.duration, args.language, args.concurrency, args.voice,
+                                               not args.no_resume, args.fresh)
     if video_file and content:
         print("\n✅ İşlem başarıyla tamamlandı!")
         print(f"Video: {video_file}")
@@ -0,0 +1,104 @@
+import os
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from typing import Dict, List, Optional
+from config import print_info, print_warning
+from .video_analyzer import VideoAnalyzer
+
+# Sıralama bütçeleri
+RANKING_ENABLED = os.getenv("RANKING_ENABLED", "true").lower() in ("1", "true", "yes")
+RANK_POOL_SIZE = max(int(os.getenv("RANK_POOL_SIZE", "12")), 1)  # Sıralamaya girecek azami aday sayısı
+RANK_SURVIVORS = max(int(os.getenv("RANK_SURVIVORS", "3")), 0)  # Ucuz elemeden sonra GPT ile skorlanacak aday sayısı (maliyet bütçesi)
+RANK_RELEVANCE_TIMEOUT = float(os.getenv("RANK_RELEVANCE_TIMEOUT", "8"))  # Sahne başına GPT skorlaması için beklenecek azami süre (sn)
+
+# GPT skorlaması arka planda sürerken sahne beklemesin diye ayrı havuz; geç gelen skorlar yine önbelleğe yazılır
+_relevance_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="relevance")
+
+class CandidateRanker:
+    """
+    Bütçeli iki aşamalı aday sıralayıcı
+
+    1. Ucuz aşama: tüm havuz için vektörel kalite skoru ve yerel sözcüksel skor; en iyi
+       `survivors` aday seçilir
+    2. Pahalı aşama: yalnızca seçilen adaylar GPT ile (tek istekte, önbellekli) skorlanır;
+       `timeout` içinde yanıt gelmezse ucuz skorlarla devam edilir
+
+    Sonuç: önce GPT ile doğrulanan adaylar, sonra diğerleri; her grup kendi skoruna göre sıralı.
+    """
+
+    def __init__(self, analyzer: VideoAnalyzer, survivors: int = RANK_SURVIVORS,
+                 timeout: float = RANK_RELEVANCE_TIMEOUT, weights: Dict[str, float] = None):
+        self.analyzer = analyzer
+        self.survivors = survivors
+        self.timeout = timeout
+        self.weights = weights or {'relevance': 0.6, 'quality': 0.4}
+
+    def _score_relevance(self, query: str, videos: List[Dict]) -> Optional[List]:
+        """Adayları GPT ile skorla; bütçe aşılırsa None döndür"""
+        if not videos:
+            return []
+        started = threading.Event()
+
+        def score():
+            started.set()
+            return self.analyzer.score_batch(query, videos)
+
+        future = _relevance_executor.submit(score)
+        # Bütçe istek çalışmaya başladığında işler; havuz kuyruğunda beklenen süre sayılmaz
+        started.wait()
+        try:
+            return future.result(timeout=self.timeout)
+        except FutureTimeoutError:
+            print_warning(f"Alakalılık skorlaması {self.timeout:.0f} sn bütçesini aştı, ucuz skorlar kullanılıyor")
+            return None
+
+    def rank(self, query: str, videos: List[Dict]) -> List[Dict]:
+        """
+        Adayları sırala
+
+        Her adaya 'rank' bilgisi eklenir: {"score", "quality", "lexical", "relevance", "explanation", "stage"}
+
+        Args:
+            query (str): Sıralama sorgusu (Pexels metinleriyle aynı dilde, İngilizce)
+            videos (List[Dict]): Aday videolar
+
+        Returns:
+            List[Dict]: En iyiden kötüye sıralı adaylar
+        """
+        if not videos:
+            return []
+        started = time.monotonic()
+
+        # 1. Ucuz aşama
+        quality_scores, _ = self.analyzer.calculate_quality_scores(videos)
+        lexical_scores = self.analyzer.lexical_ranker.normalized_scores(query, videos)
+        for video, quality, lexical in zip(videos, quality_scores, lexical_scores):
+            video['rank'] = {
+                'quality': float(quality),
+                'lexical': lexical,
+                'relevance': None,
+                'explanation': "Sözcüksel ön sıralama",
+                'score': lexical * self.weights['relevance'] + float(quality) * self.weights['quality'],
+                'stage': 'cheap'
+            }
+        order = sorted(range(len(videos)), key=lambda i: (-videos[i]['rank']['score'], i))
+        survivors = [videos[i] for i in order[:self.survivors]]
+        rest = [videos[i] for i in order[self.survivors:]]
+
+        # 2. Pahalı aşama (yalnızca kalanlar için)
+        relevances = self._score_relevance(query, survivors)
+        if relevances is not None:
+            for video, (relevance, explanation) in zip(survivors, relevances):
+                video['rank'].update({
+                    'relevance': relevance,
+                    'explanation': explanation,
+                    'score': relevance * self.weights['relevance'] + video['rank']['quality'] * self.weights['quality'],
+                    'stage': 'relevance'
+                })
+            survivors.sort(key=lambda video: -video['rank']['score'])
+
+        ranked = survivors + rest
+        print_info(f"Sıralama: {len(videos)} aday, {len(survivors) if relevances is not None else 0} GPT skorlaması, "
+                   f"{(time.monotonic() - started) * 1000:.0f} ms")
+        return ranked
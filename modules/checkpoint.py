@@ -0,0 +1,85 @@
+import os
+import json
+import time
+import threading
+from typing import Any, Dict, List, Optional
+from config import print_info, print_warning
+from .file_utils import atomic_write_json, stable_hash
+
+CHECKPOINT_FILE = "checkpoint.json"
+
+class CheckpointManifest:
+    """
+    Proje klasöründeki tamamlanmış aşamaları girdi özetleriyle birlikte kaydeder
+
+    Yeniden çalıştırmada girdisi değişmemiş ve çıktı dosyaları hâlâ duran aşamalar atlanır.
+    Örn. FFmpeg adımı başarısız olduğunda içerik, TTS ve indirmeler tekrar yapılmaz.
+    """
+
+    def __init__(self, project_dir: str):
+        self.project_dir = project_dir
+        self.path = os.path.join(project_dir, CHECKPOINT_FILE)
+        self._lock = threading.Lock()
+        self.stages: Dict[str, Dict] = self._load()
+
+    def _load(self) -> Dict[str, Dict]:
+        """Mevcut manifesti oku"""
+        if not os.path.exists(self.path):
+            return {}
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                return json.load(f).get("stages", {})
+        except (json.JSONDecodeError, OSError) as e:
+            print_warning(f"Checkpoint dosyası okunamadı, baştan başlanacak: {str(e)}")
+            return {}
+
+    def _save(self) -> None:
+        atomic_write_json(self.path, {"stages": self.stages})
+
+    @staticmethod
+    def input_hash(*parts: Any) -> str:
+        """Aşama girdilerinin özetini hesapla"""
+        return stable_hash(*parts)
+
+    def is_complete(self, stage: str, input_hash: str) -> bool:
+        """
+        Aşama aynı girdilerle tamamlanmış mı?
+
+        Kayıtlı özet eşleşmeli ve tüm çıktı dosyaları boş olmadan yerinde olmalı.
+        """
+        with self._lock:
+            entry = self.stages.get(stage)
+        if not entry or entry.get("input_hash") != input_hash:
+            return False
+        for output in entry.get("outputs", []):
+            if not os.path.exists(output) or os.path.getsize(output) == 0:
+                return False
+        return True
+
+    def get_outputs(self, stage: str) -> List[str]:
+        """Aşamanın kayıtlı çıktı dosyalarını döndür"""
+        with self._lock:
+            return list(self.stages.get(stage, {}).get("outputs", []))
+
+    def mark_complete(self, stage: str, input_hash: str, outputs: List[str]) -> None:
+        """Aşamayı tamamlandı olarak kaydet"""
+        with self._lock:
+            self.stages[stage] = {
+                "input_hash": input_hash,
+                "outputs": list(outputs),
+                "completed_at": time.time()
+            }
+            self._save()
+
+    def invalidate(self, stage: Optional[str] = None) -> None:
+        """Tek bir aşamanın veya tüm manifestin kaydını sil"""
+        with self._lock:
+            if stage is None:
+                self.stages = {}
+            else:
+                self.stages.pop(stage, None)
+            self._save()
+
+    def report_skip(self, stage: str) -> None:
+        """Atlanan aşamayı bildir"""
+        print_info(f"♻️ Checkpoint: '{stage}' aşaması değişmemiş, atlanıyor")
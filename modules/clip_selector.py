@@ -0,0 +1,133 @@
+import os
+import math
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional, Set, Tuple
+from config import print_info, print_warning
+
+# Klip seçimi ayarları
+CLIP_MIN_SECONDS = float(os.getenv("CLIP_MIN_SECONDS", "3"))  # Bir klipten kullanılacak en kısa süre
+CLIP_SCORE_TOLERANCE = float(os.getenv("CLIP_SCORE_TOLERANCE", "0.15"))  # Sahnenin en iyi adayına göre kabul edilen skor farkı
+MAX_SELECTION_ROUNDS = 3  # İndirilemeyen klipler çıkarılarak seçimin tekrarlanacağı azami tur
+
+def candidate_score(video: Dict) -> float:
+    """Sıralayıcının verdiği skor (sıralama yoksa nötr)"""
+    return (video.get('rank') or {}).get('score', 0.5)
+
+def _scene_options(candidates: List[Dict], exclude: Set[int], taken: Set[int], min_seconds: float) -> List[Tuple[Dict, int]]:
+    """Sahne için kullanılabilir adaylar ve tam saniye cinsinden kullanılabilir süreleri"""
+    usable = [
+        video for video in candidates
+        if video.get('id') not in exclude and video.get('id') not in taken
+        and (video.get('duration') or 0) >= min_seconds
+    ]
+    if not usable:
+        return []
+    best = max(candidate_score(video) for video in usable)
+    return [
+        (video, int(video['duration']))
+        for video in usable
+        if candidate_score(video) >= best - CLIP_SCORE_TOLERANCE
+    ]
+
+def select_clips(scene_candidates: List[List[Dict]], target_duration: float, exclude: Optional[Set[int]] = None,
+                 min_seconds: float = CLIP_MIN_SECONDS) -> List[Dict]:
+    """
+    Hedef süreyi kapsayan en az sayıda klibi seç (grup sırt çantası)
+
+    Her sahneden en fazla bir klip alınır ve sahne sırası korunur. Öncelik sırasıyla:
+    süreyi kapsamak, en az klip, en yüksek toplam skor. Aynı video birden fazla sahnede
+    çıkarsa ilk sahneye bırakılır.
+
+    Args:
+        scene_candidates (List[List[Dict]]): Sahne sırasıyla sıralı aday listeleri
+        target_duration (float): Kapsanacak süre (seslendirme süresi, sn)
+        exclude (Set[int], optional): Kullanılmayacak video id'leri (örn. indirilemeyenler)
+        min_seconds (float): Bir klipten kullanılacak en kısa süre
+
+    Returns:
+        List[Dict]: Sahne sırasıyla {"scene", "video", "seconds"}; "seconds" toplamı hedef süreye eşittir
+            ve hiçbir klip kendi uzunluğundan fazla kullanılmaz (süre kapsanamıyorsa klipler tam kullanılır)
+    """
+    exclude = exclude or set()
+    target = max(int(math.ceil(target_duration)), 1)
+
+    # Durum: kapsanan süre (hedefte kırpılır) -> (klip sayısı, -toplam skor, seçimler)
+    states: Dict[int, Tuple[int, float, Tuple]] = {0: (0, 0.0, ())}
+    taken: Set[int] = set()
+    for scene_index, candidates in enumerate(scene_candidates):
+        options = _scene_options(candidates, exclude, taken, min_seconds)
+        taken.update(video.get('id') for video in candidates)
+        next_states = dict(states)
+        for covered, (count, negative_score, choices) in states.items():
+            for video, seconds in options:
+                key = min(covered + seconds, target)
+                candidate = (count + 1, negative_score - candidate_score(video), choices + ((scene_index, video),))
+                if key not in next_states or candidate[:2] < next_states[key][:2]:
+                    next_states[key] = candidate
+        states = next_states
+
+    if target in states:
+        choices = states[target][2]
+    else:
+        # Süre kapsanamıyor: en çok süreyi kapsayan seçimle devam et
+        covered = max(states)
+        choices = states[covered][2]
+        if choices:
+            print_warning(f"Adaylar {target_duration:.1f} sn'yi kapsamıyor, {covered} sn ile devam ediliyor")
+    if not choices:
+        return []
+
+    # Süreleri gerçek klip uzunluklarıyla orantılı dağıt (hiçbiri kendi uzunluğunu aşmaz)
+    total = sum(video['duration'] for _, video in choices)
+    scale = min(target_duration / total, 1.0)
+    return [
+        {"scene": scene_index, "video": video, "seconds": video['duration'] * scale}
+        for scene_index, video in choices
+    ]
+
+def fetch_selection(scene_candidates: List[List[Dict]], target_duration: float,
+                    download: Callable[[Dict, float], Optional[str]], max_workers: int = 1) -> List[Dict]:
+    """
+    Klipleri seç ve indir; indirilemeyen klip olursa onu çıkarıp seçimi tekrarla
+
+    Args:
+        download (Callable[[Dict, float], Optional[str]]): (video, kullanılacak süre) -> dosya yolu
+        max_workers (int): Aynı anda indirilecek klip sayısı
+
+    Returns:
+        List[Dict]: Sahne sırasıyla {"scene", "video", "seconds", "path"}
+
+    Raises:
+        Exception: Uygun klip seçilemezse
+    """
+    failed: Set[int] = set()
+    downloaded: Dict[int, Tuple[str, float]] = {}  # video id -> (dosya, indirilirken istenen süre)
+    for _ in range(MAX_SELECTION_ROUNDS):
+        selection = select_clips(scene_candidates, target_duration, exclude=failed)
+        if not selection:
+            break
+
+        durations = ', '.join(format(item['seconds'], '.1f') for item in selection)
+        print_info(f"Klip seçimi: {len(selection)} klip, {target_duration:.1f} sn ({durations})")
+        # Yeni turda klipten daha uzun süre istenirse (kısmi indirme yetmeyebilir) tekrar indir
+        pending = [
+            item for item in selection
+            if item['video']['id'] not in downloaded or downloaded[item['video']['id']][1] < item['seconds']
+        ]
+        with ThreadPoolExecutor(max_workers=max(min(max_workers, len(pending)), 1), thread_name_prefix="clip") as executor:
+            paths = list(executor.map(lambda item: download(item['video'], item['seconds']), pending))
+        for item, path in zip(pending, paths):
+            if path:
+                downloaded[item['video']['id']] = (path, item['seconds'])
+            else:
+                failed.add(item['video']['id'])
+
+        complete = all(item['video']['id'] not in failed for item in selection)
+        for item in selection:
+            if item['video']['id'] in downloaded:
+                item['path'] = downloaded[item['video']['id']][0]
+        if complete:
+            return selection
+        print_warning(f"{len(failed)} klip indirilemedi, seçim yenileniyor")
+
+    raise Exception("Seslendirme süresini kapsayacak klip seçilemedi")
@@ -0,0 +1,206 @@
+import os
+import time
+import shutil
+import sqlite3
+import threading
+from typing import Callable, Dict, Optional
+from config import print_info, print_success, print_warning
+
+# Klip deposu ayarları
+CLIP_STORE_DIR = os.getenv("CLIP_STORE_DIR", "cache/clips")
+CLIP_STORE_MAX_BYTES = int(float(os.getenv("CLIP_STORE_MAX_GB", "5")) * 1024 ** 3)
+
+class ClipStore:
+    """
+    Pexels klipleri için projeler arası paylaşılan yerel depo
+
+    Klipler (Pexels video id, rendition) anahtarıyla bir kez indirilir; projeler depodaki
+    dosyaya hardlink (olmazsa symlink, o da olmazsa kopya) ile bağlanır. SQLite indeksi boyut,
+    süre, çözünürlük ve son kullanım zamanını tutar; disk bütçesi aşılınca LRU ile temizlenir.
+    """
+
+    def __init__(self, root: str = CLIP_STORE_DIR, max_bytes: int = CLIP_STORE_MAX_BYTES):
+        self.root = root
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        os.makedirs(root, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._key_locks: Dict[tuple, threading.Lock] = {}
+        self._db = sqlite3.connect(os.path.join(root, "index.sqlite3"), timeout=30, check_same_thread=False)
+        with self._lock, self._db:
+            self._db.execute("""
+                CREATE TABLE IF NOT EXISTS clips (
+                    video_id INTEGER NOT NULL,
+                    rendition TEXT NOT NULL,
+                    path TEXT NOT NULL,
+                    size INTEGER NOT NULL,
+                    duration REAL,
+                    width INTEGER,
+                    height INTEGER,
+                    created_at REAL NOT NULL,
+                    last_used REAL NOT NULL,
+                    PRIMARY KEY (video_id, rendition)
+                )
+            """)
+
+    @staticmethod
+    def rendition_key(video: Dict) -> str:
+        """Videonun indirilen sürümünü tanımlayan anahtar (örn: 1080x1920)"""
+        return f"{video.get('width', 0)}x{video.get('height', 0)}"
+
+    def _key_lock(self, video_id: int, rendition: str) -> threading.Lock:
+        with self._lock:
+            key = (video_id, rendition)
+            if key not in self._key_locks:
+                self._key_locks[key] = threading.Lock()
+            return self._key_locks[key]
+
+    def _store_path(self, video_id: int, rendition: str) -> str:
+        return os.path.join(self.root, f"{video_id}_{rendition}.mp4")
+
+    def lookup(self, video_id: int, rendition: str) -> Optional[str]:
+        """Depodaki klibin yolunu döndür (yoksa veya bozuksa None)"""
+        with self._lock, self._db:
+            row = self._db.execute(
+                "SELECT path, size FROM clips WHERE video_id = ? AND rendition = ?",
+                (video_id, rendition)
+            ).fetchone()
+            if not row:
+                return None
+
+            path, size = row
+            if not os.path.exists(path) or os.path.getsize(path) != size:
+                self._db.execute("DELETE FROM clips WHERE video_id = ? AND rendition = ?", (video_id, rendition))
+                return None
+
+            self._db.execute(
+                "UPDATE clips SET last_used = ? WHERE video_id = ? AND rendition = ?",
+                (time.time(), video_id, rendition)
+            )
+            return path
+
+    def put(self, video: Dict, rendition: str, src_path: str) -> str:
+        """İndirilen dosyayı depoya taşı ve indekse ekle"""
+        path = self._store_path(video['id'], rendition)
+        os.replace(src_path, path)
+        now = time.time()
+        with self._lock, self._db:
+            self._db.execute(
+                "INSERT OR REPLACE INTO clips VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (video['id'], rendition, path, os.path.getsize(path), video.get('duration'),
+                 video.get('width'), video.get('height'), now, now)
+            )
+        # Yeni eklenen klip, çağıran ona bağlanmadan silinmemeli
+        self.evict(keep=(video['id'], rendition))
+        return path
+
+    @staticmethod
+    def link_into(store_path: str, dest_path: str) -> str:
+        """Depodaki klibi proje klasörüne bağla"""
+        os.makedirs(os.path.dirname(os.path.abspath(dest_path)), exist_ok=True)
+        if os.path.lexists(dest_path):
+            if os.path.exists(dest_path) and os.path.samefile(store_path, dest_path):
+                return dest_path
+            os.remove(dest_path)
+
+        try:
+            os.link(store_path, dest_path)
+        except OSError:
+            try:
+                os.symlink(os.path.abspath(store_path), dest_path)
+            except OSError:
+                shutil.copy2(store_path, dest_path)
+        return dest_path
+
+    def fetch(self, video: Dict, dest_path: str, download: Callable[[str], Optional[str]],
+              rendition: Optional[str] = None) -> Optional[str]:
+        """
+        Klibi depodan bağla, depoda yoksa indirip depoya ekle
+
+        Args:
+            video (Dict): Video bilgileri ("id" zorunlu)
+            dest_path (str): Proje içindeki hedef dosya yolu
+            download (Callable[[str], Optional[str]]): Verilen yola indiren fonksiyon
+            rendition (str, optional): Sürüm anahtarı (varsayılan: genişlik x yükseklik)
+
+        Returns:
+            Optional[str]: Hedef dosya yolu veya indirme başarısızsa None
+        """
+        rendition = rendition or self.rendition_key(video)
+        with self._key_lock(video['id'], rendition):
+            stored = self.lookup(video['id'], rendition)
+            if stored:
+                with self._lock:
+                    self.hits += 1
+                print_success(f"Klip depodan alındı: {video['id']} ({rendition})")
+                return self.link_into(stored, dest_path)
+
+            with self._lock:
+                self.misses += 1
+            tmp_path = os.path.join(self.root, f".download_{video['id']}_{rendition}.mp4")
+            if not download(tmp_path):
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+                return None
+            if os.path.getsize(tmp_path) > self.max_bytes:
+                # Tek başına bütçeyi aşan klip depoya alınmaz (diğer tüm klipleri sildirirdi)
+                print_warning(f"Klip depo bütçesinden büyük, depolanmadan kullanılıyor: {video['id']} ({rendition})")
+                os.makedirs(os.path.dirname(os.path.abspath(dest_path)), exist_ok=True)
+                shutil.move(tmp_path, dest_path)
+                return dest_path
+            stored = self.put(video, rendition, tmp_path)
+            return self.link_into(stored, dest_path)
+
+    def evict(self, keep: Optional[tuple] = None) -> None:
+        """
+        Disk bütçesi aşıldıysa en uzun süredir kullanılmayan klipleri sil
+
+        Args:
+            keep (tuple, optional): Silinmeyecek (video_id, rendition) anahtarı
+        """
+        with self._lock, self._db:
+            total = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM clips").fetchone()[0]
+            if total <= self.max_bytes:
+                return
+
+            rows = self._db.execute(
+                "SELECT video_id, rendition, path, size FROM clips ORDER BY last_used ASC"
+            ).fetchall()
+            for video_id, rendition, path, size in rows:
+                if total <= self.max_bytes:
+                    break
+                if (video_id, rendition) == keep:
+                    continue
+                try:
+                    if os.path.exists(path):
+                        os.remove(path)
+                except OSError as e:
+                    print_warning(f"Klip silinemedi: {path} ({str(e)})")
+                    continue
+                self._db.execute("DELETE FROM clips WHERE video_id = ? AND rendition = ?", (video_id, rendition))
+                total -= size
+
+    def stats(self) -> Dict:
+        """Depo istatistiklerini döndür"""
+        with self._lock:
+            count, total = self._db.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM clips").fetchone()
+            return {"clips": count, "bytes": total, "hits": self.hits, "misses": self.misses}
+
+    def log_stats(self) -> None:
+        """Depo istatistiklerini yazdır"""
+        stats = self.stats()
+        print_info(f"Klip deposu: {stats['clips']} klip, {stats['bytes'] / 1024 ** 2:.1f} MB, "
+                   f"{stats['hits']} hit, {stats['misses']} miss")
+
+_store = None
+_store_lock = threading.Lock()
+
+def get_clip_store() -> ClipStore:
+    """Süreç genelinde paylaşılan klip deposunu döndür"""
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = ClipStore()
+        return _store
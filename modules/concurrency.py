@@ -0,0 +1,41 @@
+import threading
+from contextlib import contextmanager
+from config import API_CONCURRENCY, FFMPEG_CONCURRENCY
+
+class ResourceLimiter:
+    """
+    Paylaşılan bir kaynağa (API, FFmpeg) aynı anda erişebilecek iş sayısını sınırlar
+
+    Aynı süreçteki tüm worker'lar aynı limiter'ı kullanır; böylece API çağrıları
+    ve FFmpeg kodlamaları için ayrı eşzamanlılık bütçeleri tanımlanabilir.
+    """
+
+    def __init__(self, name: str, limit: int):
+        self.name = name
+        self.configure(limit)
+
+    def configure(self, limit: int) -> None:
+        """Limiti değiştir (iş başlamadan önce çağrılmalı)"""
+        self.limit = max(int(limit), 1)
+        self._semaphore = threading.BoundedSemaphore(self.limit)
+
+    @contextmanager
+    def slot(self):
+        """Kaynak için bir slot al ve iş bitince bırak"""
+        semaphore = self._semaphore
+        semaphore.acquire()
+        try:
+            yield
+        finally:
+            semaphore.release()
+
+# Süreç genelinde paylaşılan limiter'lar
+api_limiter = ResourceLimiter("api", API_CONCURRENCY)
+ffmpeg_limiter = ResourceLimiter("ffmpeg", FFMPEG_CONCURRENCY)
+
+def configure_limits(api_limit: int = None, ffmpeg_limit: int = None) -> None:
+    """API ve FFmpeg eşzamanlılık bütçelerini ayarla"""
+    if api_limit:
+        api_limiter.configure(api_limit)
+    if ffmpeg_limit:
+        ffmpeg_limiter.configure(ffmpeg_limit)
@@ -1,12 +1,66 @@
+import os
 import openai
+import copy
 import json
 import re
-from typing import Dict, Any
-from config import OPENAI_API_KEY, print_error, print_success, print_warning
+import time
+import threading
+from typing import Callable, Dict, Any, List, Optional
+from config import OPENAI_API_KEY, print_error, print_success, print_warning, print_info
+from .json_stream import JSONArrayStream
+from .memo_cache import PersistentMemo, normalize_text
+from .file_utils import stable_hash
+from .search_planner import SEARCH_PLAN_TERMS
 
 # OpenAI istemcisini yapılandır
 client = openai.OpenAI(api_key=OPENAI_API_KEY)
 
+CONTENT_MODEL = "gpt-4o"
+
+# İçerik önbelleği (isteğe bağlı): aynı konu farklı en-boy oranı ya da ses hızıyla tekrar üretilirken GPT beklenmez
+CONTENT_CACHE_ENABLED = os.getenv("CONTENT_CACHE_ENABLED", "false").lower() in ("1", "true", "yes")
+CONTENT_CACHE_DIR = os.getenv("CONTENT_CACHE_DIR", "cache/content")
+CONTENT_CACHE_TTL = int(os.getenv("CONTENT_CACHE_TTL", str(7 * 24 * 60 * 60)))  # 7 gün
+
+# Doğrulanmış içerikler tüm işler arasında paylaşılır
+content_cache = PersistentMemo(CONTENT_CACHE_DIR, max_entries=64, ttl=CONTENT_CACHE_TTL)
+
+# Yanıtta eksik gelen video_style alanları için varsayılanlar (arayüzdeki varsayılanlarla aynı)
+DEFAULT_VIDEO_STYLE = {
+    "transitions": {
+        "type": "fade",
+        "duration": 0.5
+    },
+    "filters": {
+        "brightness": 50,
+        "contrast": 50,
+        "saturation": 50,
+        "sharpness": 50
+    },
+    "text": {
+        "font": "Arial",
+        "size": 24,
+        "color": "#FFFFFF",
+        "animation": "fade",
+        "position": "center"
+    },
+    "subtitle": {
+        "enabled": True,
+        "language": "tr",
+        "text": "",
+        "font": "Arial",
+        "size": 24,
+        "color": "#FFFFFF",
+        "background": "#000000",
+        "opacity": 0.8
+    },
+    "audio": {
+        "music_type": "none",
+        "volume": 100,
+        "fade": True
+    }
+}
+
 def fix_json_format(json_str: str) -> str:
     """
     OpenAI API'den gelen hatalı JSON formatını düzelt
@@ -50,65 +104,255 @@ def fix_json_format(json_str: str) -> str:
         print_warning(f"JSON düzeltme hatası: {str(e)}")
         return json_str
 
-def generate_youtube_content(topic: str, duration_seconds: int, content_language: str = "tr", subtitle_language: str = None) -> Dict[str, Any]:
+class SceneFeed:
     """
-    OpenAI API ile video içeriği üret
+    İçerik üretimi sürerken sahne listesini arama aşamasına aktaran kanal
     
-    Args:
-        topic (str): Video konusu
-        duration_seconds (int): Video süresi (saniye)
-        content_language (str): İçerik dili ("tr" veya "en")
-        subtitle_language (str, optional): Altyazı dili ("tr" veya "en"). None ise content_language kullanılır.
+    Üretici sahneleri geldikçe add() ile bildirir ve liste hazır olunca close() çağırır;
+    tüketici wait() ile listeyi bekler. İlk close() geçerlidir, sonrakiler yok sayılır.
+    """
+    
+    def __init__(self, on_scene: Optional[Callable[[int, Dict], None]] = None):
+        self.on_scene = on_scene  # (sahne numarası, sahne) ile her sahne geldiğinde çağrılır
+        self.received = 0
+        self.fields: Dict[str, Any] = {}  # Sahnelerle birlikte iletilen üst düzey alanlar (örn. "search")
+        self._event = threading.Event()
+        self._scenes: Optional[List[Dict]] = None
+        self._error: Optional[Exception] = None
         
+    @property
+    def closed(self) -> bool:
+        return self._event.is_set()
+        
+    def add(self, scene: Dict) -> None:
+        """Akıştan tamamlanan bir sahneyi bildir"""
+        self.received += 1
+        if self.on_scene:
+            self.on_scene(self.received, scene)
+            
+    def close(self, scenes: Optional[List[Dict]] = None, error: Optional[Exception] = None,
+              fields: Optional[Dict[str, Any]] = None) -> None:
+        """Sahne listesini (ya da hatayı) ve varsa üst düzey alanları tüketiciye ilet"""
+        if self._event.is_set():
+            return
+        self.fields.update(fields or {})
+        self._scenes = scenes
+        self._error = error
+        self._event.set()
+        
+    def wait(self, timeout: Optional[float] = None) -> List[Dict]:
+        """
+        Sahne listesini bekle
+        
+        Raises:
+            TimeoutError: Liste süresinde gelmezse
+            Exception: Üretim başarısız olduysa
+        """
+        if not self._event.wait(timeout):
+            raise TimeoutError("Sahne listesi beklenirken zaman aşımı")
+        if self._error:
+            raise self._error
+        return self._scenes
+        
+def _stream_completion(request: Dict, scene_feed: SceneFeed, scene_count: int, duration_seconds: int) -> str:
+    """
+    Yanıtı akış halinde al; pexels_prompts elemanlarını tamamlandıkça kanala aktar
+    
+    Liste kapanınca son doğrulamadaki yerel onarımdan geçirilerek iletilir; böylece arama
+    aşaması tam yanıttan üretilecek listeyle aynı (süreleri sayısal) sahneleri alır.
+    
     Returns:
-        Dict[str, Any]: Video içeriği
+        str: Tam yanıt metni
     """
-    try:
-        # Altyazı dili belirtilmemişse içerik dilini kullan
-        subtitle_language = subtitle_language or content_language
-        
-        # Her sahne için minimum 5, maksimum 15 saniye
-        scene_count = max(duration_seconds // 10, 2)  # En az 2 sahne olsun
+    started = time.monotonic()
+    parser = JSONArrayStream("pexels_prompts", fields=("search",))
+    parts = []
+    for chunk in client.chat.completions.create(stream=True, **request):
+        if not chunk.choices:
+            continue
+        delta = chunk.choices[0].delta.content or ""
+        parts.append(delta)
+        for scene in parser.feed(delta):
+            scene_feed.add(scene)
+        # Liste tamamlandı: diğer alanlar üretilirken arama başlayabilir
+        if parser.done and not scene_feed.closed:
+            scenes = _repair_scenes(copy.deepcopy(parser.items), scene_count, duration_seconds, [])
+            if scenes:
+                scene_feed.close(scenes, fields=parser.fields)
+                print_info(f"Sahne listesi {time.monotonic() - started:.1f} sn'de hazır, içeriğin kalanı üretiliyor")
+    print_info(f"İçerik akışı {time.monotonic() - started:.1f} sn'de tamamlandı")
+    return "".join(parts)
+
+def _repair_scenes(scenes, scene_count: int, duration_seconds: int, repairs: List[str]) -> List[Dict]:
+    """Sahne listesini yerel olarak onar: eksik alanları doldur, fazlasını kırp, eksiği tekrarla tamamla"""
+    scene_duration = max(duration_seconds // scene_count, 1)
+    scenes = scenes if isinstance(scenes, list) else []
+    valid = []
+    for scene in scenes:
+        if isinstance(scene, str):
+            scene = {"query": scene}
+        if not isinstance(scene, dict) or not str(scene.get("query") or "").strip():
+            continue
+        if not scene.get("description"):
+            scene["description"] = scene["query"]
+        # Süre sayı olarak gelmediyse (örn. yazıyla "five") eşit pay kullanılır
+        duration = scene.get("duration")
+        if isinstance(duration, bool) or not isinstance(duration, (int, float)) or duration <= 0:
+            scene["duration"] = scene_duration
+        valid.append(scene)
+    if len(valid) != len(scenes):
+        repairs.append(f"{len(scenes) - len(valid)} geçersiz sahne")
+    if not valid:
+        return []
         
-        # Dil ayarlarını belirle
-        lang_settings = {
-            "tr": {
-                "system_prompt": "Sen bir Türkçe video içerik uzmanısın. Verilen konu için "
-                               "video senaryosu ve basit arama terimleri üretiyorsun.",
-                "content_note": "Türkçe, anlaşılır metin",
-                "title_note": "Video başlığı (Türkçe)",
-                "desc_note": "Video açıklaması (Türkçe)",
-                "tags_note": "Türkçe etiketler"
-            },
-            "en": {
-                "system_prompt": "You are an English video content expert. You create "
-                               "video scripts and simple search terms for given topics.",
-                "content_note": "Clear English text",
-                "title_note": "Video title (English)",
-                "desc_note": "Video description (English)",
-                "tags_note": "English tags"
-            }
-        }
+    if len(valid) > scene_count:
+        repairs.append(f"sahne sayısı {len(valid)} -> {scene_count}")
+        valid = valid[:scene_count]
+    elif len(valid) < scene_count:
+        repairs.append(f"sahne sayısı {len(valid)} -> {scene_count}")
+        # Eksik sahneler mevcut sahnelerin kopyalarıyla tamamlanır (arama farklı adaylar döndürebilir)
+        valid = valid + [dict(valid[index % len(valid)]) for index in range(scene_count - len(valid))]
+    return valid
+    
+def _repair_video_style(video_style, subtitle_language: str, repairs: List[str]) -> Dict:
+    """Eksik video_style alanlarını varsayılanlarla doldur"""
+    video_style = video_style if isinstance(video_style, dict) else {}
+    for field, defaults in DEFAULT_VIDEO_STYLE.items():
+        value = video_style.get(field)
+        if not isinstance(value, dict):
+            repairs.append(f"video_style.{field}")
+            value = {}
+        merged = copy.deepcopy(defaults)
+        merged.update(value)
+        video_style[field] = merged
+    video_style["subtitle"].setdefault("language", subtitle_language)
+    return video_style
+    
+def _missing_fields(content: Dict) -> List[str]:
+    """Yerel olarak onarılamayan, yeniden istenmesi gereken alanlar"""
+    missing = []
+    for field in ("tts_text", "subtitle_text"):
+        if not isinstance(content.get(field), str) or not content[field].strip():
+            missing.append(field)
+    seo = content.get("seo")
+    if not isinstance(seo, dict) or not seo.get("title") or not seo.get("description"):
+        missing.append("seo")
+    if not content.get("pexels_prompts"):
+        missing.append("pexels_prompts")
+    return missing
+    
+def _request_missing_fields(topic: str, content: Dict, missing: List[str], scene_count: int, duration_seconds: int,
+                            content_language: str, subtitle_language: str, system_prompt: str) -> Dict:
+    """
+    Yalnızca eksik alanları yeniden iste (tüm içerik yeniden üretilmez)
+    
+    Returns:
+        Dict: Eksik alanlar -> yeni değerler (gelmeyenler bulunmaz)
+    """
+    field_notes = {
+        "tts_text": f"\"tts_text\": \"{content_language.upper()} dilinde, akıcı ve doğal bir anlatım (en az 4-5 cümle)\"",
+        "subtitle_text": f"\"subtitle_text\": \"tts_text'in {subtitle_language.upper()} çevirisi\"",
+        "seo": f"\"seo\": {{\"title\": \"...\", \"description\": \"...\", \"tags\": [\"...\"]}} ({content_language.upper()} dilinde)",
+        "pexels_prompts": f"\"pexels_prompts\": tam olarak {scene_count} adet {{\"query\": \"tek kelime İngilizce arama terimi\", "
+                          f"\"description\": \"sahne açıklaması\", \"duration\": rakamla saniye}}"
+    }
+    known = {key: content[key] for key in ("tts_text", "pexels_prompts") if content.get(key) and key not in missing}
+    prompt = f"""{topic} konusunda {duration_seconds} saniyelik bir video için içerik üretiliyor.
+Mevcut içerik: {json.dumps(known, ensure_ascii=False)}
+
+Mevcut içerikle uyumlu olacak şekilde SADECE şu alanları içeren bir JSON nesnesi döndür:
+{chr(10).join(field_notes[field] for field in missing)}"""
+    # Sayıları yazıyla yazma kuralı yalnızca anlatım metinleri içindir; "duration" sayı kalmalı
+    narration = [field for field in ("tts_text", "subtitle_text") if field in missing]
+    if narration:
+        prompt += f"\n{' ve '.join(narration)} içindeki sayıları rakam olarak değil, yazı olarak yaz."
+    
+    response = client.chat.completions.create(
+        model=CONTENT_MODEL,
+        messages=[{
+            "role": "system",
+            "content": system_prompt
+        }, {
+            "role": "user",
+            "content": prompt
+        }],
+        response_format={"type": "json_object"},
+        temperature=0.7
+    )
+    data = json.loads(response.choices[0].message.content)
+    return {field: data[field] for field in missing if field in data}
+    
+def _repair_content(content, topic: str, scene_count: int, duration_seconds: int, content_language: str,
+                    subtitle_language: str, system_prompt: str) -> Dict:
+    """
+    Yanıtı yerel olarak onar; yerelde onarılamayan alanlar için tek bir tamamlama isteği yap
+    
+    Sahne sayısı ve video_style yerelde düzeltilir; metin alanları ve SEO eksikse yalnızca
+    bunlar yeniden istenir. Böylece ücretli yanıt küçük bir kusur yüzünden çöpe gitmez.
+    """
+    if not isinstance(content, dict):
+        raise ValueError("Yanıt bir JSON nesnesi değil")
+    repairs: List[str] = []
+    
+    # Altyazı dili içerik diliyle aynıysa altyazı metni seslendirme metnidir
+    if not content.get("subtitle_text") and subtitle_language == content_language and content.get("tts_text"):
+        content["subtitle_text"] = content["tts_text"]
+        repairs.append("subtitle_text")
+    content["pexels_prompts"] = _repair_scenes(content.get("pexels_prompts"), scene_count, duration_seconds, repairs)
+    
+    missing = _missing_fields(content)
+    if missing:
+        print_warning(f"Eksik alanlar yeniden isteniyor: {', '.join(missing)}")
+        try:
+            fields = _request_missing_fields(topic, content, missing, scene_count, duration_seconds,
+                                             content_language, subtitle_language, system_prompt)
+        except Exception as e:
+            raise ValueError(f"Eksik alanlar tamamlanamadı ({', '.join(missing)}): {str(e)}")
+        if "seo" in fields and isinstance(fields["seo"], dict) and isinstance(content.get("seo"), dict):
+            # Gelen SEO, mevcut alanların üzerine yazılır; mevcut diğer alanlar korunur
+            fields["seo"] = {**content["seo"], **fields["seo"]}
+        content.update(fields)
+        if "pexels_prompts" in fields:
+            content["pexels_prompts"] = _repair_scenes(fields["pexels_prompts"], scene_count, duration_seconds, repairs)
+        repairs.extend(f"{field} (yeniden istendi)" for field in fields)
         
-        settings = lang_settings.get(content_language, lang_settings["tr"])
+    seo = content.get("seo")
+    if isinstance(seo, dict) and not isinstance(seo.get("tags"), list):
+        seo["tags"] = []
+        repairs.append("seo.tags")
+    content["video_style"] = _repair_video_style(content.get("video_style"), subtitle_language, repairs)
+    if content.get("duration") != duration_seconds:
+        content["duration"] = duration_seconds
         
-        # OpenAI API'ye gönderilecek istem
-        prompt = f"""
+    if repairs:
+        print_warning(f"İçerik onarıldı: {', '.join(repairs)}")
+    return content
+    
+def _build_prompt(topic: str, duration_seconds: int, content_language: str, subtitle_language: str,
+                  settings: Dict[str, str], scene_count: int) -> str:
+    """İçerik üretimi istemini oluştur"""
+    return f"""
         {topic} konusunda {duration_seconds} saniyelik bir video için içerik üret.
         İçerik dili: {content_language.upper()}
         Altyazı dili: {subtitle_language.upper()}
         
         SADECE aşağıdaki JSON formatında yanıt ver, başka hiçbir şey yazma:
         {{
-            "tts_text": "{settings['content_note']}",
-            "subtitle_text": "Altyazı metni ({subtitle_language.upper()})",
+            "search": {{
+                "main_subject": "Videonun ana konusu (İngilizce, 1-2 kelime)",
+                "subject_type": "food/animal/nature/other",
+                "shared_terms": ["Konuyu genel olarak temsil eden İngilizce yedek arama terimleri"]
+            }},
             "pexels_prompts": [
                 {{
                     "query": "Ana konu + eylem (örn: pasta cooking, pasta boiling)",
                     "description": "Bu sahne için açıklama ({content_language.upper()})",
+                    "terms": ["Sahne için en iyiden kötüye sıralı İngilizce arama terimleri"],
                     "duration": 10
                 }}
             ],
+            "tts_text": "{settings['content_note']}",
+            "subtitle_text": "Altyazı metni ({subtitle_language.upper()})",
             "video_style": {{
                 "transitions": {{
                     "type": "fade/dissolve/cut/slide",
@@ -158,7 +402,7 @@ def generate_youtube_content(topic: str, duration_seconds: int, content_language
            - En az 4-5 cümle içermeli
         2. subtitle_text: {subtitle_language.upper()} dilinde, tts_text'in çevirisi olmalı
         3. pexels_prompts: 
-           - En az {scene_count} adet sahne olmalı
+           - Tam olarak {scene_count} adet sahne olmalı
            - Her sahne 5-15 saniye arasında olmalı
            - Sahnelerin toplam süresi {duration_seconds} saniyeyi geçmemeli
            - Her sahnenin arama terimi (query) şu formatta olmalı:
@@ -175,23 +419,109 @@ def generate_youtube_content(topic: str, duration_seconds: int, content_language
         6. duration değeri tam olarak {duration_seconds} olmalı
         7. SADECE JSON yanıtı ver, başka hiçbir şey yazma
         8. Tüm sayıları rakam olarak değil, yazı olarak yaz. Örneğin "1881" yerine "bin sekiz yüz seksen bir" şeklinde.
+        9. Alanları yukarıdaki sırayla yaz; search ve pexels_prompts ilk alanlar olmalı
+        10. search ve terms: Pexels'te video aramak için kullanılacak
+           - Her sahnenin terms listesi en fazla {SEARCH_PLAN_TERMS} adet, 1-3 kelimelik, Pexels'te kolay bulunabilecek İngilizce ifade olmalı
+           - Terimler sahnenin açıklamasını yansıtmalı ve ana konudan sapmamalı (örn: "bird eating seeds", "bird feeder")
+           - shared_terms: Hiçbir sahne için video bulunamazsa kullanılacak 2-4 terim
         """
+
+def log_content_cache_stats() -> None:
+    """İçerik önbelleği istatistiklerini yazdır"""
+    stats = content_cache.stats()
+    print_info(f"İçerik önbelleği: {stats['hits']} hit, {stats['misses']} miss "
+               f"(isabet oranı: %{stats['hit_rate'] * 100:.0f})")
+    
+def generate_youtube_content(topic: str, duration_seconds: int, content_language: str = "tr", subtitle_language: str = None,
+                             scene_feed: Optional[SceneFeed] = None, use_cache: Optional[bool] = None,
+                             fresh: bool = False) -> Dict[str, Any]:
+    """
+    OpenAI API ile video içeriği üret
+    
+    Args:
+        topic (str): Video konusu
+        duration_seconds (int): Video süresi (saniye)
+        content_language (str): İçerik dili ("tr" veya "en")
+        subtitle_language (str, optional): Altyazı dili ("tr" veya "en"). None ise content_language kullanılır.
+        scene_feed (SceneFeed, optional): Verilirse yanıt akış halinde alınır ve sahne listesi
+            tamamlanır tamamlanmaz (tts_text, seo ve video_style beklenmeden) bu kanala aktarılır.
+            Kanal her durumda kapatılır; üretim başarısız olursa bekleyen taraf hata alır.
+        use_cache (bool, optional): Doğrulanmış içeriği önbellekten oku/önbelleğe yaz.
+            None ise CONTENT_CACHE_ENABLED kullanılır.
+        fresh (bool): Önbellekteki kaydı yok say ve yeniden üret (yeni sonuç önbelleğe yazılır)
+        
+    Returns:
+        Dict[str, Any]: Video içeriği
+    """
+    api_response = None
+    try:
+        # Altyazı dili belirtilmemişse içerik dilini kullan
+        subtitle_language = subtitle_language or content_language
+        
+        # Her sahne için minimum 5, maksimum 15 saniye
+        scene_count = max(duration_seconds // 10, 2)  # En az 2 sahne olsun
+        
+        # Dil ayarlarını belirle
+        lang_settings = {
+            "tr": {
+                "system_prompt": "Sen bir Türkçe video içerik uzmanısın. Verilen konu için "
+                               "video senaryosu ve basit arama terimleri üretiyorsun.",
+                "content_note": "Türkçe, anlaşılır metin",
+                "title_note": "Video başlığı (Türkçe)",
+                "desc_note": "Video açıklaması (Türkçe)",
+                "tags_note": "Türkçe etiketler"
+            },
+            "en": {
+                "system_prompt": "You are an English video content expert. You create "
+                               "video scripts and simple search terms for given topics.",
+                "content_note": "Clear English text",
+                "title_note": "Video title (English)",
+                "desc_note": "Video description (English)",
+                "tags_note": "English tags"
+            }
+        }
+        
+        settings = lang_settings.get(content_language, lang_settings["tr"])
+        
+        # OpenAI API'ye gönderilecek istem
+        prompt = _build_prompt(topic, duration_seconds, content_language, subtitle_language, settings, scene_count)
         
+        # Önbellek anahtarı: konu, süre, diller, model ve istem şablonunun özeti (şablon değişince anahtar da değişir)
+        use_cache = CONTENT_CACHE_ENABLED if use_cache is None else use_cache
+        template_hash = stable_hash(
+            settings["system_prompt"],
+            _build_prompt("{topic}", duration_seconds, content_language, subtitle_language, settings, scene_count)
+        )
+        cache_key = PersistentMemo.make_key(
+            normalize_text(topic), duration_seconds, content_language, subtitle_language, CONTENT_MODEL, template_hash
+        )
+        if use_cache and not fresh:
+            cached = content_cache.get(cache_key)
+            if cached is not None:
+                content = copy.deepcopy(cached)
+                if scene_feed:
+                    scene_feed.close(content["pexels_prompts"], fields={"search": content.get("search")})
+                print_success(f"İçerik önbellekten alındı: {content['seo']['title']}")
+                return content
+                
         # OpenAI API'yi çağır
-        response = client.chat.completions.create(
-            model="gpt-4o",
-            messages=[{
+        request = {
+            "model": CONTENT_MODEL,
+            "messages": [{
                 "role": "system",
                 "content": settings["system_prompt"]
             }, {
                 "role": "user",
                 "content": prompt
             }],
-            temperature=0.7
-        )
-        
-        # API yanıtını al
-        api_response = response.choices[0].message.content
+            "response_format": {"type": "json_object"},
+            "temperature": 0.7
+        }
+        if scene_feed:
+            api_response = _stream_completion(request, scene_feed, scene_count, duration_seconds)
+        else:
+            response = client.chat.completions.create(**request)
+            api_response = response.choices[0].message.content
         
         # JSON formatını düzelt
         fixed_json = fix_json_format(api_response)
@@ -199,6 +529,10 @@ def generate_youtube_content(topic: str, duration_seconds: int, content_language
         # JSON yanıtını parse et
         content = json.loads(fixed_json)
         
+        # Eksik ya da hatalı alanları onar (yalnızca onarılamayanlar yeniden istenir)
+        content = _repair_content(content, topic, scene_count, duration_seconds, content_language,
+                                  subtitle_language, settings["system_prompt"])
+        
         # Zorunlu alanları kontrol et
         required_fields = ["tts_text", "subtitle_text", "pexels_prompts", "video_style", "seo", "duration"]
         for field in required_fields:
@@ -233,13 +567,19 @@ def generate_youtube_content(topic: str, duration_seconds: int, content_language
         # Altyazı metnini video_style'a ekle
         content["video_style"]["subtitle"]["text"] = content["subtitle_text"]
                 
+        # Akışta liste erken kapanmadıysa doğrulanmış listeyi ilet
+        if scene_feed:
+            scene_feed.close(content["pexels_prompts"], fields={"search": content.get("search")})
+        if use_cache:
+            content_cache.set(cache_key, copy.deepcopy(content))
+            
         # Başarılı mesajı
         print_success(f"İçerik başarıyla oluşturuldu: {content['seo']['title']}")
         return content
         
     except json.JSONDecodeError as e:
         print_error(f"JSON parse hatası: {str(e)}")
-        print_error(f"API yanıtı: {response.choices[0].message.content if hasattr(response, 'choices') and response.choices else 'Yanıt yok'}")
+        print_error(f"API yanıtı: {api_response or 'Yanıt yok'}")
     except openai.APIError as e:
         print_error(f"OpenAI API hatası: {str(e)}")
     except openai.AuthenticationError as e:
@@ -251,6 +591,8 @@ def generate_youtube_content(topic: str, duration_seconds: int, content_language
         import traceback
         print_error(f"Hata ayrıntıları: {traceback.format_exc()}")
         
+    if scene_feed:
+        scene_feed.close(error=Exception("İçerik üretilemedi"))
     return None
 
 if __name__ == "__main__":
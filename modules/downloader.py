@@ -0,0 +1,342 @@
+import os
+import re
+import json
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional, Tuple
+import requests
+from config import print_info, print_warning
+from .http_client import get_session
+from .file_utils import atomic_write_json
+
+# İndirme ayarları
+DOWNLOAD_SEGMENTS = max(int(os.getenv("DOWNLOAD_SEGMENTS", "4")), 1)  # Dosya başına paralel bağlantı sayısı
+DOWNLOAD_MIN_SEGMENT_BYTES = int(float(os.getenv("DOWNLOAD_MIN_SEGMENT_MB", "2")) * 1024 * 1024)  # Bundan küçük parçalara bölme
+DOWNLOAD_CHUNK_SIZE = 64 * 1024
+DOWNLOAD_PROGRESS_INTERVAL = float(os.getenv("DOWNLOAD_PROGRESS_INTERVAL", "0.5"))  # İlerleme bildirimi aralığı (sn)
+PART_SUFFIX = ".part"
+STATE_SAVE_INTERVAL = 1.0  # Devam kaydının diske yazılma aralığı (sn)
+
+ProgressCallback = Callable[[int, Optional[int]], None]
+
+class DownloadError(Exception):
+    """İndirme tamamlanamadı"""
+
+class RangeNotHonoredError(DownloadError):
+    """Sunucu aralık isteğine 206 ile yanıt vermedi (Range desteği yok ya da kaynak değişti)"""
+
+class ProgressThrottle:
+    """İlerleme bildirimlerini sabit aralıkla sınırlayan thread-safe sayaç"""
+
+    def __init__(self, total: Optional[int], callback: Optional[ProgressCallback],
+                 interval: float = DOWNLOAD_PROGRESS_INTERVAL, initial: int = 0):
+        self.total = total
+        self.callback = callback
+        self.interval = interval
+        self.downloaded = initial
+        self._last = 0.0
+        self._lock = threading.Lock()
+
+    def add(self, count: int) -> None:
+        """İndirilen bayt sayısını ekle, aralık dolduysa bildir"""
+        with self._lock:
+            self.downloaded += count
+            now = time.monotonic()
+            if not self.callback or now - self._last < self.interval:
+                return
+            self._last = now
+            downloaded = self.downloaded
+        self.callback(downloaded, self.total)
+
+    def finish(self) -> None:
+        """Son durumu her durumda bildir"""
+        if self.callback:
+            self.callback(self.downloaded, self.total)
+
+class DownloadState:
+    """
+    .part dosyasının yanındaki devam kaydı (sidecar)
+
+    Kaynağın adresi, ETag/Last-Modified, toplam boyut ve her parçanın diske yazılmış
+    bayt sayısı tutulur. Kayıt yalnızca dosyaya flush edilmiş baytları içerir.
+    """
+
+    def __init__(self, path: str, data: Dict):
+        self.path = path
+        self.data = data
+        self._lock = threading.Lock()
+        self._saved_at = 0.0
+
+    @property
+    def segments(self) -> List[Dict]:
+        return self.data["segments"]
+
+    @property
+    def completed(self) -> int:
+        """Diske yazılmış toplam bayt"""
+        with self._lock:
+            return sum(segment["done"] for segment in self.segments)
+
+    def advance(self, segment: Dict, count: int) -> None:
+        """Parçanın yazılan bayt sayısını artır, aralık dolduysa kaydet"""
+        with self._lock:
+            segment["done"] += count
+            if time.monotonic() - self._saved_at < STATE_SAVE_INTERVAL:
+                return
+        self.save()
+
+    def save(self) -> None:
+        """Kaydı diske yaz"""
+        with self._lock:
+            self._saved_at = time.monotonic()
+            snapshot = json.loads(json.dumps(self.data))
+        try:
+            atomic_write_json(self.path, snapshot)
+        except OSError as e:
+            print_warning(f"İndirme kaydı yazılamadı: {str(e)}")
+
+    @classmethod
+    def load(cls, path: str, part_path: str, source: Dict) -> Optional["DownloadState"]:
+        """Kaynakla eşleşen geçerli bir kayıt varsa yükle"""
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return None
+
+        if any(data.get(key) != value for key, value in source.items()):
+            return None
+        if not source.get("etag") and not source.get("last_modified"):
+            # Kaynağın değişmediği doğrulanamıyor
+            return None
+        if not os.path.exists(part_path) or os.path.getsize(part_path) != data.get("total"):
+            return None
+        return cls(path, data)
+
+class SegmentedDownloader:
+    """
+    Büyük dosyaları paralel byte aralıklarıyla, kaldığı yerden devam edebilecek şekilde indiren motor
+
+    - Veriler önce <hedef>.part dosyasına yazılır; uzunluk doğrulandıktan sonra hedefe atomik taşınır
+    - Boyutu bilinen ve Range destekleyen dosyalar parçalara bölünür; her parça önceden
+      ayrılmış dosyada kendi konumuna yazılır ve ilerlemesi <hedef>.part.json kaydında tutulur
+    - Yarıda kalan indirme, ETag/Last-Modified ve boyut değişmediyse kalan aralıklardan devam eder
+    - Bağlantı koparsa kalan aralıklar bir kez daha denenir; yine olmazsa .part ve kaydı sonraki
+      deneme için bırakılır
+    - Sunucu Range desteklemiyorsa, aralık isteklerini yok sayıyorsa ya da boyut bilinmiyorsa
+      tek bağlantıyla baştan indirilir
+    - İlerleme bildirimleri DOWNLOAD_PROGRESS_INTERVAL aralığıyla sınırlandırılır
+    """
+
+    def __init__(self, session: requests.Session = None, segments: int = DOWNLOAD_SEGMENTS,
+                 min_segment_bytes: int = DOWNLOAD_MIN_SEGMENT_BYTES, chunk_size: int = DOWNLOAD_CHUNK_SIZE,
+                 timeout: float = 30):
+        self.session = session or get_session()
+        self.segments = max(int(segments), 1)
+        self.min_segment_bytes = max(int(min_segment_bytes), 1)
+        self.chunk_size = chunk_size
+        self.timeout = timeout
+
+    @staticmethod
+    def _content_range_total(response: requests.Response) -> Optional[int]:
+        """Content-Range başlığından toplam boyutu oku (örn: bytes 0-0/123456)"""
+        match = re.match(r"bytes\s+\d+-\d+/(\d+)", response.headers.get("Content-Range", ""))
+        return int(match.group(1)) if match else None
+
+    def _probe(self, url: str) -> Tuple[Optional[Dict], Optional[requests.Response]]:
+        """
+        Sunucunun Range desteğini, dosya boyutunu ve doğrulayıcılarını tek istekle öğren
+
+        Returns:
+            Tuple[Optional[Dict], Optional[requests.Response]]: (Range destekleniyorsa kaynak bilgisi
+                {"url", "total", "etag", "last_modified"}, Range desteklenmiyorsa tüm dosyayı taşıyan açık yanıt)
+        """
+        response = self.session.get(url, headers={"Range": "bytes=0-0"}, stream=True, timeout=self.timeout)
+        response.raise_for_status()
+        if response.status_code == 206:
+            source = {
+                "url": url,
+                "total": self._content_range_total(response),
+                "etag": response.headers.get("ETag"),
+                "last_modified": response.headers.get("Last-Modified")
+            }
+            response.close()
+            return source, None
+        # 200: Range desteklenmiyor, yanıt dosyanın tamamı
+        return None, response
+
+    def _plan_segments(self, total: int) -> List[Dict]:
+        """Dosyayı eşit byte aralıklarına böl (uçlar dahil)"""
+        count = max(min(self.segments, total // self.min_segment_bytes), 1)
+        size = -(-total // count)
+        return [{"start": start, "end": min(start + size, total) - 1, "done": 0} for start in range(0, total, size)]
+
+    def _fetch_segment(self, url: str, part_path: str, segment: Dict, state: DownloadState,
+                       progress: ProgressThrottle) -> None:
+        """Bir byte aralığının kalanını indirip dosyadaki yerine yaz"""
+        start = segment["start"] + segment["done"]
+        end = segment["end"]
+        if start > end:
+            return
+
+        headers = {"Range": f"bytes={start}-{end}"}
+        validator = state.data.get("etag") or state.data.get("last_modified")
+        if validator:
+            # Kaynak değiştiyse sunucu 200 ile tüm dosyayı döndürür, parça reddedilir
+            headers["If-Range"] = validator
+
+        response = self.session.get(url, headers=headers, stream=True, timeout=self.timeout)
+        with response:
+            response.raise_for_status()
+            if response.status_code != 206:
+                raise RangeNotHonoredError(f"Sunucu aralık isteğini yok saydı (HTTP {response.status_code})")
+
+            with open(part_path, "r+b") as f:
+                f.seek(start)
+                for chunk in response.iter_content(chunk_size=self.chunk_size):
+                    if not chunk:
+                        continue
+                    # Sunucu fazladan veri gönderirse parça sınırını aşma
+                    remaining = end - (segment["start"] + segment["done"]) + 1
+                    if remaining <= 0:
+                        break
+                    chunk = chunk[:remaining]
+                    f.write(chunk)
+                    f.flush()
+                    state.advance(segment, len(chunk))
+                    progress.add(len(chunk))
+
+        if segment["done"] != end - segment["start"] + 1:
+            raise DownloadError(f"Eksik parça: {segment['start']}-{end} ({segment['done']} bayt)")
+
+    def _download_segmented(self, url: str, part_path: str, state: DownloadState, progress: ProgressThrottle) -> None:
+        """Eksik parçaları paralel indir"""
+        pending = [segment for segment in state.segments if segment["start"] + segment["done"] <= segment["end"]]
+        if not pending:
+            return
+
+        try:
+            with ThreadPoolExecutor(max_workers=len(pending)) as executor:
+                futures = [executor.submit(self._fetch_segment, url, part_path, segment, state, progress) for segment in pending]
+                for future in futures:
+                    future.result()
+        finally:
+            # Yarıda kalırsa bir sonraki deneme buradan devam eder
+            state.save()
+
+    def _download_single(self, url: str, part_path: str, progress: ProgressThrottle,
+                         response: Optional[requests.Response] = None) -> None:
+        """Dosyayı tek bağlantıyla baştan indir"""
+        if response is None:
+            response = self.session.get(url, stream=True, timeout=self.timeout)
+            response.raise_for_status()
+
+        with response:
+            length = int(response.headers.get("content-length", 0)) or None
+            progress.total = progress.total or length
+            written = 0
+            with open(part_path, "wb") as f:
+                for chunk in response.iter_content(chunk_size=self.chunk_size):
+                    if chunk:
+                        f.write(chunk)
+                        written += len(chunk)
+                        progress.add(len(chunk))
+
+        if length and written != length:
+            raise DownloadError(f"Eksik indirme: {written}/{length} bayt")
+
+    @staticmethod
+    def _remove(path: str) -> None:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+    def download(self, url: str, output_path: str, progress: Optional[ProgressCallback] = None) -> Dict:
+        """
+        Dosyayı indir
+
+        Args:
+            url (str): İndirilecek adres
+            output_path (str): Çıktı dosyası yolu (yalnızca indirme doğrulanınca oluşur)
+            progress (Callable[[int, Optional[int]], None], optional): (indirilen, toplam) bildirimi
+
+        Returns:
+            Dict: {"path", "bytes", "transferred", "resumed", "seconds", "throughput", "segments"}
+
+        Raises:
+            requests.exceptions.RequestException, DownloadError: İndirme başarısız olursa
+                (.part dosyası ve kaydı devam için bırakılır)
+        """
+        os.makedirs(os.path.dirname(os.path.abspath(output_path)), exist_ok=True)
+        part_path = output_path + PART_SUFFIX
+        state_path = part_path + ".json"
+        started = time.monotonic()
+
+        source, response = self._probe(url)
+        resumed = 0
+        segments = 1
+
+        if source and source["total"]:
+            total = source["total"]
+            state = DownloadState.load(state_path, part_path, source)
+            if state:
+                resumed = state.completed
+                print_info(f"İndirme kaldığı yerden devam ediyor: %{resumed / total * 100:.0f} ({os.path.basename(output_path)})")
+            else:
+                # Dosyayı önceden ayır; parçalar kendi konumlarına yazılır
+                with open(part_path, "wb") as f:
+                    f.truncate(total)
+                state = DownloadState(state_path, dict(source, segments=self._plan_segments(total)))
+                state.save()
+
+            segments = len(state.segments)
+            tracker = ProgressThrottle(total, progress, initial=resumed)
+            try:
+                try:
+                    self._download_segmented(url, part_path, state, tracker)
+                except (requests.exceptions.RequestException, OSError) as e:
+                    print_warning(f"Parçalı indirme yarıda kaldı, kalan kısım tekrar deneniyor: {str(e)}")
+                    self._download_segmented(url, part_path, state, tracker)
+            except RangeNotHonoredError as e:
+                # Parçalar kullanılamaz; baştan tek bağlantıyla indir
+                print_warning(f"Parçalı indirme başarısız, tek bağlantıyla deneniyor: {str(e)}")
+                self._remove(state_path)
+                tracker = ProgressThrottle(total, progress)
+                segments = 1
+                resumed = 0
+                self._download_single(url, part_path, tracker)
+        else:
+            # Devam edilemeyen kaynak; eski kayıt varsa geçersizdir
+            self._remove(state_path)
+            tracker = ProgressThrottle(None, progress)
+            self._download_single(url, part_path, tracker, response)
+            total = tracker.total
+        tracker.finish()
+
+        # Uzunluğu doğrula, sonra yerine taşı
+        size = os.path.getsize(part_path)
+        if total and size != total:
+            raise DownloadError(f"Dosya boyutu uyuşmuyor: {size}/{total} bayt")
+        os.replace(part_path, output_path)
+        self._remove(state_path)
+
+        seconds = max(time.monotonic() - started, 1e-6)
+        transferred = size - resumed
+        return {
+            "path": output_path,
+            "bytes": size,
+            "transferred": transferred,
+            "resumed": resumed,
+            "seconds": seconds,
+            "throughput": transferred / seconds,
+            "segments": segments
+        }
+
+    @staticmethod
+    def log_result(result: Dict) -> None:
+        """İndirme hızını yazdır"""
+        resumed = f", {result['resumed'] / 1024 ** 2:.1f} MB önceki denemeden" if result.get("resumed") else ""
+        print_info(f"{result['bytes'] / 1024 ** 2:.1f} MB, {result['seconds']:.1f} sn, "
+                   f"{result['throughput'] / 1024 ** 2:.1f} MB/sn ({result['segments']} bağlantı{resumed})")
@@ -0,0 +1,29 @@
+import os
+import json
+import hashlib
+import tempfile
+from typing import Any
+
+def stable_hash(*parts: Any) -> str:
+    """Verilen değerlerden sıra ve biçimden bağımsız, kararlı bir SHA-256 özeti üret"""
+    payload = json.dumps(parts, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+def atomic_write_json(path: str, data: Any) -> None:
+    """
+    JSON verisini atomik olarak yaz
+
+    Önce aynı dizinde geçici bir dosyaya yazılır, sonra os.replace ile yerine taşınır.
+    Böylece yarıda kalan yazmalar okuyuculara bozuk dosya olarak görünmez.
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".tmp_", suffix=".json")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, path)
+    except Exception:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
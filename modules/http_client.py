@@ -0,0 +1,83 @@
+import os
+import threading
+from typing import Dict
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from config import print_info
+
+# Bağlantı havuzu ayarları
+HTTP_POOL_CONNECTIONS = int(os.getenv("HTTP_POOL_CONNECTIONS", "10"))  # Önbellekte tutulacak host havuzu sayısı
+HTTP_POOL_MAXSIZE = int(os.getenv("HTTP_POOL_MAXSIZE", "32"))  # Host başına açık tutulacak bağlantı sayısı
+HTTP_MAX_RETRIES = int(os.getenv("HTTP_MAX_RETRIES", "3"))
+
+_session = None
+_session_lock = threading.Lock()
+
+def _create_session() -> requests.Session:
+    """Keep-alive bağlantı havuzlu ve tekrar denemeli oturum oluştur"""
+    retry = Retry(
+        total=HTTP_MAX_RETRIES,
+        connect=HTTP_MAX_RETRIES,
+        read=HTTP_MAX_RETRIES,
+        backoff_factor=0.5,
+        status_forcelist=(500, 502, 503, 504),
+        allowed_methods=frozenset(["GET", "HEAD"]),
+        respect_retry_after_header=True,
+        raise_on_status=False
+    )
+    adapter = HTTPAdapter(
+        pool_connections=HTTP_POOL_CONNECTIONS,
+        pool_maxsize=HTTP_POOL_MAXSIZE,
+        max_retries=retry
+    )
+    session = requests.Session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+def get_session() -> requests.Session:
+    """
+    Süreç genelinde paylaşılan HTTP oturumunu döndür
+
+    Pexels aramaları, video indirmeleri ve görsel indirmeleri aynı oturumu kullanır;
+    böylece aynı host'a giden istekler TCP+TLS el sıkışmasını tekrar yapmaz.
+    """
+    global _session
+    with _session_lock:
+        if _session is None:
+            _session = _create_session()
+        return _session
+
+def get_connection_stats() -> Dict[str, Dict[str, int]]:
+    """
+    Host bazında bağlantı yeniden kullanım istatistiklerini döndür
+
+    Returns:
+        Dict[str, Dict[str, int]]: host -> {"requests", "connections", "reused"}
+    """
+    with _session_lock:
+        session = _session
+    if session is None:
+        return {}
+
+    stats = {}
+    for adapter in {id(a): a for a in session.adapters.values()}.values():
+        pools = adapter.poolmanager.pools
+        for key in list(pools.keys()):
+            try:
+                pool = pools[key]
+            except KeyError:
+                continue
+            host = f"{pool.scheme}://{pool.host}"
+            entry = stats.setdefault(host, {"requests": 0, "connections": 0, "reused": 0})
+            entry["requests"] += pool.num_requests
+            entry["connections"] += pool.num_connections
+            entry["reused"] = max(entry["requests"] - entry["connections"], 0)
+    return stats
+
+def log_connection_stats() -> None:
+    """Bağlantı yeniden kullanım istatistiklerini yazdır"""
+    for host, entry in get_connection_stats().items():
+        print_info(f"HTTP {host}: {entry['requests']} istek, {entry['connections']} yeni bağlantı, "
+                   f"{entry['reused']} yeniden kullanım")
@@ -8,6 +8,7 @@ from config import (
     print_success,
     DALLE_SETTINGS
 )
+from .http_client import get_session
 
 openai.api_key = OPENAI_API_KEY
 
@@ -83,7 +84,7 @@ def generate_image(
         
         # Görseli indir
         try:
-            response = requests.get(image_url, timeout=10)
+            response = get_session().get(image_url, timeout=10)
             response.raise_for_status()  # HTTP hatalarını kontrol et
             
             # Görseli kaydet
@@ -0,0 +1,110 @@
+from typing import Dict, List, Optional
+from config import print_info
+from .content_generator import generate_youtube_content, SceneFeed
+from .search_planner import SearchPlanner, clean_terms
+
+def _brief_search_plan(topic: str, scenes: List, search: Optional[Dict]) -> Optional[Dict]:
+    """
+    İş özetindeki arama bilgilerinden SearchPlanner biçiminde plan üret (GPT çağrısı yapmaz)
+
+    Args:
+        topic (str): Video konusu
+        scenes (List): content["pexels_prompts"] listesi ("terms" alanlarıyla)
+        search (Dict, optional): content["search"] alanı
+
+    Returns:
+        Optional[Dict]: Plan; özet arama bilgisi içermiyorsa None (çağıran SearchPlanner'a düşer)
+    """
+    if not scenes or not isinstance(search, dict):
+        return None
+    main_subject = ' '.join(str(search.get('main_subject') or '').split())
+    planned = [clean_terms(scene.get('terms')) if isinstance(scene, dict) else [] for scene in scenes]
+    if not main_subject or not any(planned):
+        return None
+
+    plan = SearchPlanner.fallback_plan(topic, scenes)
+    plan.update({
+        "main_subject": main_subject,
+        "subject_type": str(search.get('subject_type') or 'other'),
+        "shared_terms": clean_terms(search.get('shared_terms'))
+    })
+    # Terimi gelmeyen sahneler kendi sorgusuyla aranır
+    for scene_plan, terms in zip(plan["scenes"], planned):
+        if terms:
+            scene_plan["terms"] = terms
+    return plan
+
+class JobBrief:
+    """
+    Tek GPT yanıtından oluşan iş özeti
+
+    Senaryo (tts_text), altyazı, SEO ve her sahnenin İngilizce arama terimleri aynı yanıtta
+    gelir. Arama planı ve SEO bu özetten okunur; modüller aynı konu bağlamını tekrar
+    göndermek için ayrı istek yapmaz. Adayların alakalılık skorlaması arama sonuçlarına
+    ihtiyaç duyduğu için ayrı (toplu, önbellekli) istektir; sorgusu planın terimlerinden kurulur.
+    """
+
+    def __init__(self, topic: str, content: Dict):
+        self.topic = topic
+        self.content = content
+
+    @classmethod
+    def from_scene_feed(cls, topic: str, scene_feed: SceneFeed) -> "JobBrief":
+        """
+        Akışta erken iletilen sahne listesinden kısmi özet (içeriğin kalanı üretilirken)
+
+        Yalnızca scenes ve search_plan kullanılabilir; sahne listesi gelene kadar bekler.
+        """
+        scenes = scene_feed.wait()
+        return cls(topic, {"pexels_prompts": scenes, "search": scene_feed.fields.get("search")})
+
+    @property
+    def scenes(self) -> List[Dict]:
+        return self.content["pexels_prompts"]
+
+    @property
+    def seo(self) -> Dict:
+        return self.content["seo"]
+
+    @property
+    def tts_text(self) -> str:
+        return self.content["tts_text"]
+
+    @property
+    def subtitle_text(self) -> str:
+        return self.content["subtitle_text"]
+
+    def search_plan(self, planner: Optional[SearchPlanner] = None) -> Dict:
+        """
+        Sahnelerin arama planı
+
+        Özet arama bilgisi içermiyorsa (eski önbellek kaydı, eksik yanıt) planner ile tek
+        istekte plan üretilir; planner verilmezse sahne sorgularından yerel plan kullanılır.
+        """
+        plan = _brief_search_plan(self.topic, self.scenes, self.content.get("search"))
+        if plan:
+            return plan
+        if planner:
+            return planner.plan(self.topic, self.scenes)
+        return SearchPlanner.fallback_plan(self.topic, self.scenes)
+
+def generate_job_brief(topic: str, duration_seconds: int, content_language: str = "tr", subtitle_language: str = None,
+                       scene_feed: Optional[SceneFeed] = None, use_cache: Optional[bool] = None,
+                       fresh: bool = False) -> Optional[JobBrief]:
+    """
+    İş özetini tek GPT çağrısıyla üret
+
+    Parametreler generate_youtube_content ile aynıdır; sahne listesi ve özetin "search" alanı
+    akış sırasında scene_feed ile erken iletilir.
+
+    Returns:
+        Optional[JobBrief]: İş özeti veya None (hata durumunda)
+    """
+    content = generate_youtube_content(topic, duration_seconds, content_language, subtitle_language,
+                                       scene_feed=scene_feed, use_cache=use_cache, fresh=fresh)
+    if not content:
+        return None
+    brief = JobBrief(topic, content)
+    if _brief_search_plan(topic, brief.scenes, content.get("search")):
+        print_info("İş özeti hazır: senaryo, altyazı, SEO ve sahne arama terimleri tek yanıtta alındı")
+    return brief
@@ -0,0 +1,158 @@
+import json
+from typing import Any, Dict, Iterable, List, Optional
+from config import print_warning
+
+class JSONArrayStream:
+    """
+    Akış halinde gelen JSON metninden belirli bir dizinin elemanlarını çıkaran artımlı ayrıştırıcı
+
+    Metin parça parça feed() ile verilir; üst düzey nesnedeki `key` dizisinin her elemanı
+    tamamlanır tamamlanmaz döndürülür. `fields` ile adı verilen üst düzey alanların değerleri de
+    tamamlandıklarında `self.fields` içine yazılır. Metnin geri kalanı (diğer alanlar, Markdown
+    kod bloğu işaretleri) ayrıştırılmaz, yalnızca tırnak ve parantez derinliği izlenir.
+    Ayrıştırılamayan elemanlar atlanır; son doğrulama her zaman tam yanıt üzerinden yapılmalıdır.
+    """
+
+    def __init__(self, key: str, fields: Iterable[str] = ()):
+        self.key = key
+        self.capture = set(fields)
+        self.items: List[Any] = []
+        self.fields: Dict[str, Any] = {}
+        self.done = False  # Dizi kapandı mı
+        self._finished = False  # Dizi ve istenen tüm alanlar tamamlandı, kalan metin işlenmez
+        self.errors = 0  # Ayrıştırılamayan eleman sayısı
+
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._string: List[str] = []  # Üst düzeydeki son dizgi (anahtar adayı)
+        self._last_string: Optional[str] = None
+        self._expect_array = False  # Anahtar ve ':' görüldü, '[' bekleniyor
+        self._array_depth: Optional[int] = None  # Hedef dizinin içindeki derinlik
+        self._field: Optional[str] = None  # Değeri toplanan üst düzey alan
+        self._element: List[str] = []
+
+    def feed(self, text: str) -> List[Any]:
+        """
+        Yeni metin parçasını işle
+
+        Returns:
+            List[Any]: Bu parçayla tamamlanan dizi elemanları
+        """
+        found = []
+        for ch in text:
+            if self._finished:
+                break
+            capturing = self._array_depth is not None or self._field is not None
+
+            if self._in_string:
+                if capturing:
+                    self._element.append(ch)
+                if self._escape:
+                    self._escape = False
+                elif ch == '\\':
+                    self._escape = True
+                elif ch == '"':
+                    self._in_string = False
+                    if not capturing and self._depth == 1:
+                        self._last_string = self._decode_string()
+                    continue
+                if not capturing and self._depth == 1:
+                    self._string.append(ch)
+                continue
+
+            if self._array_depth is not None:
+                # Dizi seviyesindeki ayraçlar elemanları sonlandırır
+                if self._depth == self._array_depth and ch in ',]':
+                    self._flush(found)
+                    if ch == ']':
+                        self._depth -= 1
+                        self._array_depth = None
+                        self.done = True
+                        self._finished = not (self.capture - set(self.fields))
+                    continue
+                self._track(ch)
+                continue
+
+            if self._field is not None:
+                # Üst düzeydeki ayraçlar alan değerini sonlandırır
+                if self._depth == 1 and ch in ',}':
+                    self._flush_field()
+                    if ch == '}':
+                        self._depth -= 1
+                    continue
+                self._track(ch)
+                continue
+
+            if ch in ' \t\r\n':
+                continue
+            if ch == '"':
+                self._in_string = True
+                self._string = []
+                continue
+            if ch == ':' and self._depth == 1:
+                if self._last_string == self.key and not self.done:
+                    self._expect_array = True
+                    continue
+                if self._last_string in self.capture and self._last_string not in self.fields:
+                    self._field = self._last_string
+                    self._last_string = None
+                    continue
+            if ch == '[' and self._expect_array:
+                self._depth += 1
+                self._array_depth = self._depth
+                self._expect_array = False
+                continue
+
+            self._expect_array = False
+            self._last_string = None
+            if ch in '{[':
+                self._depth += 1
+            elif ch in '}]':
+                self._depth -= 1
+        return found
+
+    def _track(self, ch: str) -> None:
+        """Toplanan değerdeki karakteri ekle ve derinliği izle"""
+        if ch == '"':
+            self._in_string = True
+        elif ch in '{[':
+            self._depth += 1
+        elif ch in '}]':
+            self._depth -= 1
+        self._element.append(ch)
+
+    def _flush_field(self) -> None:
+        """Biriken alan değerini ayrıştır"""
+        field, self._field = self._field, None
+        text = ''.join(self._element).strip()
+        self._element = []
+        try:
+            self.fields[field] = json.loads(text)
+        except json.JSONDecodeError as e:
+            self.errors += 1
+            print_warning(f"Akıştaki {field} alanı ayrıştırılamadı: {str(e)}")
+            self.fields[field] = None
+        self._finished = self.done and not (self.capture - set(self.fields))
+
+    def _decode_string(self) -> str:
+        raw = ''.join(self._string)
+        try:
+            return json.loads(f'"{raw}"')
+        except json.JSONDecodeError:
+            return raw
+
+    def _flush(self, found: List[Any]) -> None:
+        """Biriken eleman metnini ayrıştır"""
+        text = ''.join(self._element).strip()
+        self._element = []
+        if not text:
+            return
+        try:
+            item = json.loads(text)
+        except json.JSONDecodeError as e:
+            self.errors += 1
+            print_warning(f"Akıştaki {self.key} elemanı ayrıştırılamadı: {str(e)}")
+            return
+        self.items.append(item)
+        found.append(item)
@@ -0,0 +1,150 @@
+import re
+import math
+from typing import Dict, List, Set
+
+# Ön sıralama ayarları
+SYNONYM_WEIGHT = 0.5  # Eş anlamlı eşleşmelerin doğrudan eşleşmeye göre ağırlığı
+
+# Alan ağırlıkları: URL başlığı ve etiketler Pexels'te içeriği en iyi anlatan alanlar
+FIELD_WEIGHTS = {
+    "url_title": 2.0,
+    "tags": 2.0,
+    "title": 1.5,
+    "description": 1.0,
+    "search_term": 1.0,
+    "user": 0.5
+}
+
+# Yaygın özneler için ilgili terimler
+SYNONYMS: Dict[str, List[str]] = {
+    "bird": ["birds", "avian", "fowl", "feather", "wing", "flock"],
+    "lion": ["lions", "feline", "predator", "cat", "mane"],
+    "elephant": ["elephants", "pachyderm", "trunk", "tusk"],
+    "fish": ["fishes", "marine", "aquatic", "underwater", "reef"],
+    "dog": ["dogs", "puppy", "canine", "pet"],
+    "cat": ["cats", "kitten", "feline", "pet"],
+    "ocean": ["sea", "wave", "waves", "beach", "coast", "marine"],
+    "forest": ["woods", "trees", "jungle", "woodland"],
+    "city": ["urban", "street", "downtown", "skyline", "traffic"],
+    "car": ["cars", "vehicle", "automobile", "driving", "road"],
+    "food": ["meal", "cooking", "dish", "kitchen", "eating"],
+    "computer": ["laptop", "keyboard", "screen", "technology", "coding"],
+    "space": ["galaxy", "stars", "planet", "universe", "cosmos"],
+    "mountain": ["mountains", "peak", "hill", "summit", "alps"],
+    "people": ["person", "man", "woman", "crowd", "human"],
+}
+
+STOPWORDS: Set[str] = {
+    "a", "an", "the", "and", "or", "of", "in", "on", "at", "to", "for", "with", "by",
+    "from", "is", "are", "video", "footage", "stock", "clip", "shot", "view"
+}
+
+def _stem(token: str) -> str:
+    """Basit çoğul eki temizleme (birds -> bird)"""
+    if len(token) > 3 and token.endswith("s") and not token.endswith("ss"):
+        return token[:-1]
+    return token
+
+def tokenize(text: str) -> List[str]:
+    """Metni küçük harfli, durak kelimesiz ve sadeleştirilmiş tokenlara ayır"""
+    return [_stem(token) for token in re.findall(r"[a-z0-9]+", str(text).lower()) if token not in STOPWORDS]
+
+def slug_title(url: str) -> str:
+    """Pexels URL'sindeki başlık kısmını çıkar (.../video/a-bird-flying-123/ -> a bird flying)"""
+    try:
+        last_part = url.rstrip('/').split('/')[-1]
+        return ' '.join(last_part.split('-')[:-1])
+    except (AttributeError, IndexError):
+        return ""
+
+def expand_query(query: str) -> Dict[str, float]:
+    """Sorgu tokenlarını eş anlamlılarla genişlet (token -> ağırlık)"""
+    terms: Dict[str, float] = {}
+    for token in tokenize(query):
+        terms[token] = 1.0
+        for synonym in SYNONYMS.get(token, []):
+            synonym = _stem(synonym)
+            terms[synonym] = max(terms.get(synonym, 0.0), SYNONYM_WEIGHT)
+    return terms
+
+def candidate_fields(video: Dict) -> Dict[str, str]:
+    """Adayın sıralamada kullanılan metin alanları"""
+    user = video.get('user') or {}
+    return {
+        "url_title": slug_title(video.get('url', '')),
+        "tags": ' '.join(video.get('tags') or []),
+        "title": video.get('title', ''),
+        "description": video.get('description', ''),
+        "search_term": video.get('search_term', ''),
+        "user": user.get('name', '') if isinstance(user, dict) else str(user)
+    }
+
+class LexicalRanker:
+    """
+    Adayları sorguyla sözcüksel benzerliğe göre sıralayan yerel BM25 sıralayıcı
+
+    Korpus, sıralanan aday kümesinin kendisidir; alanlar FIELD_WEIGHTS ile ağırlıklandırılır,
+    sorgu SYNONYMS tablosuyla genişletilir. Ağ çağrısı yapmaz.
+    """
+
+    def __init__(self, k1: float = 1.2, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+
+    @staticmethod
+    def _term_frequencies(video: Dict) -> Dict[str, float]:
+        frequencies: Dict[str, float] = {}
+        for field, text in candidate_fields(video).items():
+            weight = FIELD_WEIGHTS[field]
+            for token in tokenize(text):
+                frequencies[token] = frequencies.get(token, 0.0) + weight
+        return frequencies
+
+    def score(self, query: str, videos: List[Dict]) -> List[float]:
+        """
+        Adayların BM25 skorlarını hesapla
+
+        Returns:
+            List[float]: Videolarla aynı sırada ham skorlar
+        """
+        terms = expand_query(query)
+        if not videos or not terms:
+            return [0.0] * len(videos)
+
+        documents = [self._term_frequencies(video) for video in videos]
+        lengths = [sum(document.values()) for document in documents]
+        average_length = (sum(lengths) / len(lengths)) or 1.0
+        count = len(documents)
+
+        idf = {}
+        for term in terms:
+            containing = sum(1 for document in documents if term in document)
+            idf[term] = math.log(1 + (count - containing + 0.5) / (containing + 0.5))
+
+        scores = []
+        for document, length in zip(documents, lengths):
+            total = 0.0
+            norm = self.k1 * (1 - self.b + self.b * length / average_length)
+            for term, weight in terms.items():
+                tf = document.get(term)
+                if tf:
+                    total += weight * idf[term] * tf * (self.k1 + 1) / (tf + norm)
+            scores.append(total)
+        return scores
+
+    def normalized_scores(self, query: str, videos: List[Dict]) -> List[float]:
+        """Skorları en iyi adaya göre 0-1 aralığına ölçekle"""
+        scores = self.score(query, videos)
+        best = max(scores, default=0.0)
+        return [score / best if best > 0 else 0.0 for score in scores]
+
+    def top_k(self, query: str, videos: List[Dict], k: int = 0) -> List[int]:
+        """
+        En iyi k adayın indekslerini döndür (eşitlikte arama sırası korunur)
+
+        Args:
+            k (int): Aday sayısı (0 veya negatif ise tümü)
+        """
+        scores = self.score(query, videos)
+        order = sorted(range(len(videos)), key=lambda index: (-scores[index], index))
+        return order if k <= 0 else order[:k]
@@ -0,0 +1,205 @@
+import os
+import json
+import time
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, Optional
+from config import print_warning
+from .file_utils import atomic_write_json, stable_hash
+
+# Her memo dizininin diskteki azami boyutu; aşılınca en uzun süredir kullanılmayan kayıtlar silinir
+MEMO_CACHE_MAX_BYTES = int(os.getenv("MEMO_CACHE_MAX_SIZE_MB", "50")) * 1024 * 1024
+
+def normalize_text(text: str) -> str:
+    """Metni önbellek anahtarı için normalize et (küçük harf, tek boşluk)"""
+    return ' '.join(str(text).lower().split())
+
+class PersistentMemo:
+    """
+    Diskte kalıcı, bellekte LRU olarak tutulan memo önbelleği
+
+    - Önce bellekteki LRU'ya, sonra diskteki kayda bakılır
+    - Aynı anahtar için eşzamanlı çağrılar tek bir hesaplamayı paylaşır (in-flight dedupe)
+    - Hesaplama hata verirse sonuç önbelleğe yazılmaz, bekleyen herkes aynı hatayı alır
+    - Diskte süresi dolan kayıtlar silinir; toplam boyut sınırı aşılınca en uzun süredir
+      kullanılmayan kayıtlar silinir (LRU)
+    """
+
+    def __init__(self, cache_dir: str, max_entries: int = 512, ttl: Optional[int] = None,
+                 max_bytes: int = MEMO_CACHE_MAX_BYTES):
+        self.cache_dir = cache_dir
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._memory: "OrderedDict[str, Dict]" = OrderedDict()
+        self._inflight: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+        os.makedirs(cache_dir, exist_ok=True)
+
+    @staticmethod
+    def make_key(*parts: Any) -> str:
+        """Anahtar parçalarından kararlı bir anahtar üret"""
+        return stable_hash(*parts)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.json")
+
+    def _is_fresh(self, entry: Dict) -> bool:
+        return self.ttl is None or time.time() - entry.get("stored_at", 0) <= self.ttl
+
+    def _remember(self, key: str, entry: Dict) -> None:
+        """Kaydı bellekteki LRU'ya ekle (kilit altında çağrılmalı)"""
+        self._memory[key] = entry
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def _lookup(self, key: str) -> Optional[Dict]:
+        """Bellekte ve diskte kayıt ara (kilit altında çağrılmalı)"""
+        entry = self._memory.get(key)
+        if entry is not None:
+            if self._is_fresh(entry):
+                self._memory.move_to_end(key)
+                return entry
+            del self._memory[key]
+
+        try:
+            with open(self._path(key), "r", encoding="utf-8") as f:
+                entry = json.load(f)
+        except FileNotFoundError:
+            return None
+        except (json.JSONDecodeError, OSError) as e:
+            print_warning(f"Memo kaydı okunamadı: {str(e)}")
+            return None
+
+        if not self._is_fresh(entry):
+            self._remove(self._path(key))
+            return None
+        # LRU için son kullanım zamanını güncelle
+        try:
+            os.utime(self._path(key), None)
+        except OSError:
+            pass
+        self._remember(key, entry)
+        return entry
+
+    def get(self, key: str) -> Optional[Any]:
+        """Önbellekteki değeri döndür (yoksa None); sonuç isabet istatistiğine sayılır"""
+        with self._lock:
+            entry = self._lookup(key)
+            if entry is not None:
+                self.hits += 1
+            else:
+                self.misses += 1
+        return entry["value"] if entry else None
+
+    def set(self, key: str, value: Any) -> None:
+        """
+        Değeri diske ve belleğe yaz
+
+        Disk hatasında değer yalnızca bellekte tutulur; JSON'a çevrilemeyen değerler
+        (TypeError/ValueError) hiçbir katmana yazılmaz, hata çağırana yükseltilmez.
+        """
+        entry = {"stored_at": time.time(), "value": value}
+        try:
+            atomic_write_json(self._path(key), entry)
+            self.prune()
+        except (TypeError, ValueError) as e:
+            print_warning(f"Memo kaydı JSON'a çevrilemedi, önbelleğe alınmadı: {str(e)}")
+            return
+        except OSError as e:
+            print_warning(f"Memo kaydı yazılamadı: {str(e)}")
+        with self._lock:
+            self._remember(key, entry)
+
+    @staticmethod
+    def _remove(path: str) -> None:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+    def prune(self) -> None:
+        """Diskteki süresi dolmuş kayıtları ve boyut sınırını aşan en eski kullanılan kayıtları sil"""
+        with self._lock:
+            now = time.time()
+            entries = []
+            total = 0
+            for name in os.listdir(self.cache_dir):
+                if not name.endswith(".json") or name.startswith(".tmp_"):
+                    continue
+                path = os.path.join(self.cache_dir, name)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                # mtime son kullanım zamanıdır ve yazılma zamanından eski olamaz; TTL'den eskiyse kayıt kesin dolmuştur
+                if self.ttl is not None and now - stat.st_mtime > self.ttl:
+                    self._remove(path)
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, path))
+                total += stat.st_size
+
+            if total <= self.max_bytes:
+                return
+            entries.sort()
+            for _, size, path in entries:
+                if total <= self.max_bytes:
+                    break
+                self._remove(path)
+                total -= size
+
+    def get_or_compute(self, key: str, compute: Callable[[], Any]) -> Any:
+        """
+        Değeri önbellekten döndür, yoksa hesapla
+
+        Aynı anahtar için hesaplama sürerken gelen çağrılar onun sonucunu bekler.
+        """
+        with self._lock:
+            entry = self._lookup(key)
+            if entry is not None:
+                self.hits += 1
+                return entry["value"]
+
+            future = self._inflight.get(key)
+            owner = future is None
+            if owner:
+                self.misses += 1
+                future = Future()
+                self._inflight[key] = future
+            else:
+                # Süren hesaplamayı paylaşan çağrı da istek tasarrufu sayılır
+                self.hits += 1
+
+        if not owner:
+            return future.result()
+
+        value, error = None, None
+        try:
+            value = compute()
+            self.set(key, value)
+            return value
+        except BaseException as e:
+            error = e
+            raise
+        finally:
+            # Hesaplama ya da yazma ne şekilde biterse bitsin bekleyenler serbest kalır
+            with self._lock:
+                self._inflight.pop(key, None)
+            if error is None:
+                future.set_result(value)
+            else:
+                future.set_exception(error)
+
+    def stats(self) -> Dict[str, float]:
+        """Önbellek istatistiklerini döndür"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0
+            }
@@ -0,0 +1,150 @@
+import os
+import json
+import time
+import threading
+from typing import Dict, Optional
+from config import print_info, print_warning
+from .file_utils import atomic_write_json, stable_hash
+
+class PexelsSearchCache:
+    """
+    Pexels arama yanıtları için diskte tutulan TTL'li önbellek
+
+    Anahtar: (query, min_duration, max_duration, per_page)
+    - Yazmalar atomiktir (geçici dosya + os.replace)
+    - Toplam boyut sınırı aşılınca en uzun süredir kullanılmayan kayıtlar silinir (LRU)
+    - Her okuma için hit/miss sayaçları tutulur
+    """
+
+    def __init__(self, cache_dir: str, ttl: int, max_bytes: int):
+        self.cache_dir = cache_dir
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        os.makedirs(cache_dir, exist_ok=True)
+
+    @staticmethod
+    def make_key(query: str, min_duration: int, max_duration: int, per_page: int) -> str:
+        """Arama parametrelerinden önbellek anahtarı üret"""
+        return stable_hash(query.strip().lower(), int(min_duration), int(max_duration), int(per_page))
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.json")
+
+    def _count(self, hit: bool) -> None:
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def get(self, query: str, min_duration: int, max_duration: int, per_page: int) -> Optional[Dict]:
+        """
+        Önbellekteki yanıtı döndür
+
+        Returns:
+            Optional[Dict]: Pexels API yanıtı veya süresi dolmuş/yoksa None
+        """
+        path = self._path(self.make_key(query, min_duration, max_duration, per_page))
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                entry = json.load(f)
+        except FileNotFoundError:
+            self._count(False)
+            return None
+        except (json.JSONDecodeError, OSError) as e:
+            print_warning(f"Bozuk önbellek kaydı siliniyor: {str(e)}")
+            self._remove(path)
+            self._count(False)
+            return None
+
+        if time.time() - entry.get("stored_at", 0) > self.ttl:
+            self._remove(path)
+            self._count(False)
+            return None
+
+        # LRU için son kullanım zamanını güncelle
+        try:
+            os.utime(path, None)
+        except OSError:
+            pass
+        self._count(True)
+        return entry.get("data")
+
+    def set(self, query: str, min_duration: int, max_duration: int, per_page: int, data: Dict) -> None:
+        """Yanıtı önbelleğe yaz ve gerekirse boyut sınırına göre temizle"""
+        entry = {
+            "stored_at": time.time(),
+            "params": {
+                "query": query,
+                "min_duration": min_duration,
+                "max_duration": max_duration,
+                "per_page": per_page
+            },
+            "data": data
+        }
+        try:
+            atomic_write_json(self._path(self.make_key(query, min_duration, max_duration, per_page)), entry)
+            self._evict()
+        except OSError as e:
+            print_warning(f"Pexels önbelleğine yazılamadı: {str(e)}")
+
+    def _remove(self, path: str) -> None:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+    def _evict(self) -> None:
+        """Toplam boyut sınırı aşıldıysa en eski kullanılan kayıtları sil"""
+        with self._lock:
+            entries = []
+            total = 0
+            for name in os.listdir(self.cache_dir):
+                if not name.endswith(".json") or name.startswith(".tmp_"):
+                    continue
+                path = os.path.join(self.cache_dir, name)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, path))
+                total += stat.st_size
+
+            if total <= self.max_bytes:
+                return
+
+            entries.sort()
+            for _, size, path in entries:
+                if total <= self.max_bytes:
+                    break
+                self._remove(path)
+                total -= size
+
+    def stats(self) -> Dict[str, float]:
+        """Önbellek istatistiklerini döndür"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0
+            }
+
+    def log_stats(self) -> None:
+        """Önbellek istatistiklerini yazdır"""
+        stats = self.stats()
+        print_info(f"Pexels önbelleği: {stats['hits']} hit, {stats['misses']} miss "
+                   f"(isabet oranı: %{stats['hit_rate'] * 100:.0f})")
+
+_caches: Dict[str, PexelsSearchCache] = {}
+_caches_lock = threading.Lock()
+
+def get_search_cache(cache_dir: str, ttl: int, max_bytes: int) -> PexelsSearchCache:
+    """Aynı dizin için süreç genelinde tek bir önbellek örneği döndür"""
+    with _caches_lock:
+        if cache_dir not in _caches:
+            _caches[cache_dir] = PexelsSearchCache(cache_dir, ttl, max_bytes)
+        return _caches[cache_dir]
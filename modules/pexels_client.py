@@ -0,0 +1,210 @@
+import os
+import time
+import random
+import threading
+from typing import Dict, Optional
+import requests
+from config import print_info, print_warning
+from .http_client import get_session
+
+# Hız limiti ayarları
+PEXELS_RATE_PER_SECOND = float(os.getenv("PEXELS_RATE_PER_SECOND", "5"))  # Kova dolum hızı (istek/sn)
+PEXELS_BURST = int(os.getenv("PEXELS_BURST", "10"))  # Aynı anda harcanabilecek azami istek hakkı
+PEXELS_MAX_WAIT = float(os.getenv("PEXELS_MAX_WAIT", "300"))  # Bir isteğin kuyrukta bekleyebileceği azami süre (sn)
+MIN_RATE_PER_SECOND = 0.2
+
+class PexelsRateLimitError(Exception):
+    """Pexels kotası azami bekleme süresi içinde açılmadı"""
+
+class TokenBucket:
+    """Thread-safe token bucket; token yoksa çağıranı bekletir"""
+
+    def __init__(self, rate: float, capacity: int):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = float(capacity)
+        self.updated = time.monotonic()
+        self._cond = threading.Condition()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def set_rate(self, rate: float) -> None:
+        """Dolum hızını değiştir"""
+        with self._cond:
+            self._refill()
+            self.rate = max(rate, MIN_RATE_PER_SECOND)
+            self._cond.notify_all()
+
+    def pause_for(self, seconds: float) -> None:
+        """Kovayı boşaltarak tüm bekleyenleri en az verilen süre kadar durdur"""
+        with self._cond:
+            self._refill()
+            self.tokens = min(self.tokens, -seconds * self.rate)
+
+    def acquire(self, timeout: Optional[float] = None) -> bool:
+        """
+        Bir token al
+
+        Returns:
+            bool: Token alındıysa True, süre dolduysa False
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            while True:
+                self._refill()
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return True
+                wait = (1 - self.tokens) / self.rate
+                if deadline is not None:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        return False
+                    wait = min(wait, remaining)
+                self._cond.wait(wait)
+
+class PexelsClient:
+    """
+    Hız limitine duyarlı Pexels API istemcisi
+
+    - Tüm worker'lar tek bir token bucket'ı paylaşır
+    - X-Ratelimit-* başlıklarından kalan kota takip edilir; kota bitince istekler reset zamanına kadar bekletilir
+    - 429 yanıtlarında istek başarısız sayılmaz; Retry-After/üstel geri çekilme ile kuyrukta tekrar denenir
+    - Hız AIMD ile uyarlanır: 429'da yarıya iner, başarılı isteklerle yavaşça temel hıza döner
+    """
+
+    def __init__(self, api_key: str, session: requests.Session = None,
+                 rate: float = PEXELS_RATE_PER_SECOND, burst: int = PEXELS_BURST, max_wait: float = PEXELS_MAX_WAIT):
+        self.headers = {"Authorization": api_key}
+        self.session = session or get_session()
+        self.base_rate = rate
+        self.max_wait = max_wait
+        self.bucket = TokenBucket(rate, burst)
+
+        self._lock = threading.Lock()
+        self.limit: Optional[int] = None
+        self.remaining: Optional[int] = None
+        self.reset_at: Optional[float] = None
+        self.requests = 0
+        self.throttled = 0
+
+    @staticmethod
+    def _header_int(response: requests.Response, name: str) -> Optional[int]:
+        value = response.headers.get(name)
+        try:
+            return int(float(value)) if value is not None else None
+        except ValueError:
+            return None
+
+    def _update_quota(self, response: requests.Response) -> None:
+        """Yanıt başlıklarından kota bilgisini güncelle"""
+        limit = self._header_int(response, "X-Ratelimit-Limit")
+        remaining = self._header_int(response, "X-Ratelimit-Remaining")
+        reset_at = self._header_int(response, "X-Ratelimit-Reset")
+        with self._lock:
+            self.requests += 1
+            if limit is not None:
+                self.limit = limit
+            if remaining is not None:
+                self.remaining = remaining
+            if reset_at is not None:
+                self.reset_at = reset_at
+
+    def _retry_delay(self, response: requests.Response, attempt: int) -> float:
+        """429 sonrası bekleme süresini hesapla"""
+        retry_after = self._header_int(response, "Retry-After")
+        if retry_after is not None:
+            return max(retry_after, 1)
+        with self._lock:
+            remaining, reset_at = self.remaining, self.reset_at
+        if remaining == 0 and reset_at:
+            return max(reset_at - time.time(), 1)
+        return min(2 ** attempt, 60) + random.uniform(0, 1)
+
+    def _wait_for_quota(self, deadline: float) -> None:
+        """Kota bittiyse reset zamanına kadar bekle"""
+        with self._lock:
+            remaining, reset_at = self.remaining, self.reset_at
+        if remaining != 0 or not reset_at:
+            return
+        wait = reset_at - time.time()
+        if wait <= 0:
+            return
+        if time.monotonic() + wait > deadline:
+            raise PexelsRateLimitError(f"Pexels kotası doldu, {wait:.0f} sn sonra yenilenecek")
+        print_warning(f"Pexels kotası doldu, {wait:.0f} sn bekleniyor...")
+        self.bucket.pause_for(wait)
+
+    def get(self, url: str, params: Dict = None, timeout: float = 10) -> requests.Response:
+        """
+        Hız limitine uyarak GET isteği yap
+
+        Raises:
+            PexelsRateLimitError: İstek max_wait süresi içinde gönderilemediyse
+        """
+        deadline = time.monotonic() + self.max_wait
+        attempt = 0
+        while True:
+            self._wait_for_quota(deadline)
+            if not self.bucket.acquire(timeout=max(deadline - time.monotonic(), 0)):
+                raise PexelsRateLimitError(f"Pexels isteği {self.max_wait:.0f} sn içinde gönderilemedi")
+
+            response = self.session.get(url, headers=self.headers, params=params, timeout=timeout)
+            self._update_quota(response)
+
+            if response.status_code != 429:
+                # Başarılı istekle hızı kademeli olarak temel değere döndür
+                if self.bucket.rate < self.base_rate:
+                    self.bucket.set_rate(min(self.bucket.rate + 0.1, self.base_rate))
+                return response
+
+            attempt += 1
+            with self._lock:
+                self.throttled += 1
+            delay = self._retry_delay(response, attempt)
+            if time.monotonic() + delay > deadline:
+                raise PexelsRateLimitError(f"Pexels hız limiti {self.max_wait:.0f} sn içinde açılmadı")
+
+            print_warning(f"Pexels hız limiti aşıldı (429), {delay:.1f} sn sonra tekrar denenecek")
+            self.bucket.set_rate(self.bucket.rate / 2)
+            self.bucket.pause_for(delay)
+
+    @property
+    def remaining_quota(self) -> Optional[int]:
+        """Pexels'in bildirdiği kalan istek hakkı"""
+        with self._lock:
+            return self.remaining
+
+    def stats(self) -> Dict:
+        """Kota ve kısıtlama istatistiklerini döndür"""
+        with self._lock:
+            return {
+                "limit": self.limit,
+                "remaining": self.remaining,
+                "reset_at": self.reset_at,
+                "requests": self.requests,
+                "throttled": self.throttled,
+                "rate": self.bucket.rate
+            }
+
+    def log_stats(self) -> None:
+        """Kota istatistiklerini yazdır"""
+        stats = self.stats()
+        remaining = "?" if stats["remaining"] is None else stats["remaining"]
+        limit = "?" if stats["limit"] is None else stats["limit"]
+        print_info(f"Pexels kotası: {remaining}/{limit} kaldı, {stats['requests']} istek, "
+                   f"{stats['throttled']} kez 429, güncel hız {stats['rate']:.1f} istek/sn")
+
+_client = None
+_client_lock = threading.Lock()
+
+def get_pexels_client(api_key: str) -> PexelsClient:
+    """Tüm worker'ların paylaştığı Pexels istemcisini döndür"""
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = PexelsClient(api_key)
+        return _client
@@ -0,0 +1,152 @@
+import time
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+from config import print_error, print_info
+
+class Stage:
+    """Pipeline içindeki tek bir aşama"""
+
+    def __init__(self, name: str, func: Callable[[Dict[str, Any]], Any], deps: Iterable[str] = ()):
+        self.name = name
+        self.func = func
+        self.deps = list(deps)
+        self.result = None
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+
+    @property
+    def duration(self) -> float:
+        """Aşamanın çalışma süresi (saniye)"""
+        if self.started_at is None or self.finished_at is None:
+            return 0.0
+        return self.finished_at - self.started_at
+
+class StagePipeline:
+    """
+    Bağımlılık grafiğine göre aşamaları çalıştıran küçük DAG yürütücüsü
+
+    Birbirine bağımlı olmayan aşamalar (örn: TTS ve video arama) paralel çalışır.
+    Her aşama fonksiyonu, bağımlı olduğu aşamaların sonuçlarını içeren bir dict alır.
+    """
+
+    def __init__(self, name: str = "pipeline"):
+        self.name = name
+        self.stages: Dict[str, Stage] = {}
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+
+    def add_stage(self, name: str, func: Callable[[Dict[str, Any]], Any], deps: Iterable[str] = ()) -> "StagePipeline":
+        """Aşama ekle"""
+        if name in self.stages:
+            raise ValueError(f"Aşama zaten tanımlı: {name}")
+        self.stages[name] = Stage(name, func, deps)
+        return self
+
+    def _validate(self) -> None:
+        """Bilinmeyen bağımlılıkları ve döngüleri kontrol et"""
+        for stage in self.stages.values():
+            for dep in stage.deps:
+                if dep not in self.stages:
+                    raise ValueError(f"'{stage.name}' aşamasının bağımlılığı bulunamadı: {dep}")
+
+        # Kahn algoritması ile döngü kontrolü
+        remaining = {name: set(stage.deps) for name, stage in self.stages.items()}
+        while remaining:
+            ready = [name for name, deps in remaining.items() if not deps]
+            if not ready:
+                raise ValueError(f"Aşamalar arasında döngüsel bağımlılık var: {', '.join(remaining)}")
+            for name in ready:
+                del remaining[name]
+            for deps in remaining.values():
+                deps.difference_update(ready)
+
+    def _run_stage(self, stage: Stage, inputs: Dict[str, Any]) -> Any:
+        stage.started_at = time.perf_counter()
+        try:
+            return stage.func(inputs)
+        finally:
+            stage.finished_at = time.perf_counter()
+
+    def run(self, max_workers: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Tüm aşamaları bağımlılık sırasına göre çalıştır
+
+        Args:
+            max_workers (int, optional): Aynı anda çalışabilecek aşama sayısı
+
+        Returns:
+            Dict[str, Any]: Aşama adı -> aşama sonucu
+        """
+        self._validate()
+        results: Dict[str, Any] = {}
+        pending = dict(self.stages)
+        running = {}
+        self.started_at = time.perf_counter()
+
+        with ThreadPoolExecutor(max_workers=max_workers or len(self.stages) or 1, thread_name_prefix=self.name) as executor:
+            try:
+                while pending or running:
+                    # Bağımlılıkları tamamlanan aşamaları başlat
+                    for name in list(pending):
+                        stage = pending[name]
+                        if all(dep in results for dep in stage.deps):
+                            inputs = {dep: results[dep] for dep in stage.deps}
+                            running[executor.submit(self._run_stage, stage, inputs)] = stage
+                            del pending[name]
+
+                    done, _ = wait(running, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        stage = running.pop(future)
+                        try:
+                            stage.result = future.result()
+                        except Exception as e:
+                            print_error(f"'{stage.name}' aşaması başarısız oldu: {str(e)}")
+                            raise
+                        results[stage.name] = stage.result
+            finally:
+                for future in running:
+                    future.cancel()
+                self.finished_at = time.perf_counter()
+
+        return results
+
+    def critical_path(self) -> Tuple[List[str], float]:
+        """
+        Toplam süreyi belirleyen kritik yolu hesapla
+
+        Her aşama için en son biten bağımlılık geriye doğru takip edilir.
+
+        Returns:
+            Tuple[List[str], float]: (Kritik yol üzerindeki aşamalar, Yolun toplam süresi)
+        """
+        finished = [stage for stage in self.stages.values() if stage.finished_at is not None]
+        if not finished:
+            return [], 0.0
+
+        path = []
+        stage = max(finished, key=lambda s: s.finished_at)
+        while stage is not None:
+            path.append(stage.name)
+            deps = [self.stages[dep] for dep in stage.deps if self.stages[dep].finished_at is not None]
+            stage = max(deps, key=lambda s: s.finished_at) if deps else None
+        path.reverse()
+
+        return path, sum(self.stages[name].duration for name in path)
+
+    def report(self, log: Callable[[str], None] = print_info) -> None:
+        """Aşama sürelerini ve kritik yolu yazdır"""
+        if self.started_at is None:
+            return
+
+        total = (self.finished_at or time.perf_counter()) - self.started_at
+        log(f"⏱️ {self.name} süresi: {total:.2f} sn")
+        for stage in self.stages.values():
+            if stage.started_at is None:
+                log(f"  - {stage.name}: çalışmadı")
+            else:
+                offset = stage.started_at - self.started_at
+                log(f"  - {stage.name}: {stage.duration:.2f} sn (başlangıç +{offset:.2f} sn)")
+
+        path, path_duration = self.critical_path()
+        if path:
+            log(f"Kritik yol: {' → '.join(path)} ({path_duration:.2f} sn)")
@@ -0,0 +1,142 @@
+import os
+import time
+import sqlite3
+import threading
+from typing import Dict, Iterable, Optional, Tuple
+from config import print_info
+from .memo_cache import normalize_text
+
+# Alakalılık önbelleği ayarları
+RELEVANCE_CACHE_PATH = os.getenv("RELEVANCE_CACHE_PATH", "cache/relevance.sqlite3")
+RELEVANCE_CACHE_TTL = int(os.getenv("RELEVANCE_CACHE_TTL", str(30 * 24 * 60 * 60)))  # 30 gün
+
+class RelevanceCache:
+    """
+    GPT alakalılık skorları için SQLite tabanlı kalıcı önbellek
+
+    Anahtar: (normalize edilmiş sorgu, Pexels video id, prompt sürümü)
+    - Prompt ya da model değişince sürüm değiştirilir; eski kayıtlar kendiliğinden kullanılmaz
+    - TTL'i dolan kayıtlar okunmaz ve purge() ile silinir
+    - invalidate() ile sorgu, video ya da sürüm bazında kayıtlar silinebilir
+    """
+
+    def __init__(self, path: str = RELEVANCE_CACHE_PATH, ttl: int = RELEVANCE_CACHE_TTL):
+        self.path = path
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self._db = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        with self._lock, self._db:
+            self._db.execute("""
+                CREATE TABLE IF NOT EXISTS relevance (
+                    query TEXT NOT NULL,
+                    video_id INTEGER NOT NULL,
+                    prompt_version TEXT NOT NULL,
+                    score REAL NOT NULL,
+                    explanation TEXT,
+                    stored_at REAL NOT NULL,
+                    PRIMARY KEY (query, video_id, prompt_version)
+                )
+            """)
+
+    def get_many(self, query: str, video_ids: Iterable[int], prompt_version: str) -> Dict[int, Tuple[float, str]]:
+        """
+        Önbellekteki skorları döndür
+
+        Returns:
+            Dict[int, Tuple[float, str]]: Bulunan video id -> (Skor, Açıklama)
+        """
+        video_ids = list(dict.fromkeys(video_ids))
+        if not video_ids:
+            return {}
+
+        placeholders = ", ".join("?" for _ in video_ids)
+        with self._lock:
+            rows = self._db.execute(
+                f"SELECT video_id, score, explanation FROM relevance "
+                f"WHERE query = ? AND prompt_version = ? AND stored_at >= ? AND video_id IN ({placeholders})",
+                (normalize_text(query), prompt_version, time.time() - self.ttl, *video_ids)
+            ).fetchall()
+            found = {video_id: (score, explanation or "") for video_id, score, explanation in rows}
+            self.hits += len(found)
+            self.misses += len(video_ids) - len(found)
+        return found
+
+    def get(self, query: str, video_id: int, prompt_version: str) -> Optional[Tuple[float, str]]:
+        """Tek bir videonun skorunu döndür (yoksa None)"""
+        return self.get_many(query, [video_id], prompt_version).get(video_id)
+
+    def set_many(self, query: str, scores: Dict[int, Tuple[float, str]], prompt_version: str) -> None:
+        """Skorları önbelleğe yaz"""
+        now = time.time()
+        rows = [
+            (normalize_text(query), video_id, prompt_version, score, explanation, now)
+            for video_id, (score, explanation) in scores.items()
+        ]
+        if not rows:
+            return
+        with self._lock, self._db:
+            self._db.executemany("INSERT OR REPLACE INTO relevance VALUES (?, ?, ?, ?, ?, ?)", rows)
+
+    def set(self, query: str, video_id: int, prompt_version: str, score: float, explanation: str) -> None:
+        """Tek bir skoru önbelleğe yaz"""
+        self.set_many(query, {video_id: (score, explanation)}, prompt_version)
+
+    def invalidate(self, query: Optional[str] = None, video_id: Optional[int] = None,
+                   prompt_version: Optional[str] = None) -> int:
+        """
+        Kayıtları sil (parametre verilmezse tümü)
+
+        Returns:
+            int: Silinen kayıt sayısı
+        """
+        conditions, params = [], []
+        if query is not None:
+            conditions.append("query = ?")
+            params.append(normalize_text(query))
+        if video_id is not None:
+            conditions.append("video_id = ?")
+            params.append(video_id)
+        if prompt_version is not None:
+            conditions.append("prompt_version = ?")
+            params.append(prompt_version)
+        where = f" WHERE {' AND '.join(conditions)}" if conditions else ""
+        with self._lock, self._db:
+            return self._db.execute(f"DELETE FROM relevance{where}", params).rowcount
+
+    def purge(self) -> int:
+        """Süresi dolmuş kayıtları sil"""
+        with self._lock, self._db:
+            return self._db.execute("DELETE FROM relevance WHERE stored_at < ?", (time.time() - self.ttl,)).rowcount
+
+    def stats(self) -> Dict[str, float]:
+        """Önbellek istatistiklerini döndür"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0
+            }
+
+    def log_stats(self) -> None:
+        """Önbellek istatistiklerini yazdır"""
+        stats = self.stats()
+        print_info(f"Alakalılık önbelleği: {stats['hits']} hit, {stats['misses']} miss "
+                   f"(isabet oranı: %{stats['hit_rate'] * 100:.0f})")
+
+_cache = None
+_cache_lock = threading.Lock()
+
+def get_relevance_cache() -> RelevanceCache:
+    """Süreç genelinde paylaşılan alakalılık önbelleğini döndür"""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = RelevanceCache()
+            _cache.purge()
+        return _cache
@@ -0,0 +1,191 @@
+import os
+import copy
+import json
+import openai
+from typing import Dict, List, Optional
+from config import print_info, print_success, print_warning, OPENAI_API_KEY
+from .memo_cache import PersistentMemo, normalize_text
+
+# Arama planı ayarları
+SEARCH_PLAN_MODEL = "gpt-4o"
+SEARCH_PLAN_PROMPT_VERSION = f"{SEARCH_PLAN_MODEL}-v1"  # Prompt veya model değişince artırılmalı (önbellek anahtarı)
+SEARCH_PLAN_TERMS = max(int(os.getenv("SEARCH_PLAN_TERMS", "4")), 1)  # Sahne başına İngilizce arama terimi sayısı
+SEARCH_PLAN_CACHE_DIR = os.getenv("SEARCH_PLAN_CACHE_DIR", "cache/search_plans")
+SEARCH_PLAN_CACHE_TTL = int(os.getenv("SEARCH_PLAN_CACHE_TTL", str(30 * 24 * 60 * 60)))  # 30 gün
+SEARCH_PLAN_SYSTEM_PROMPT = ("Sen bir doğa belgeseli ve video içerik uzmanısın. Bir videonun tüm sahnelerini birlikte "
+                             "analiz edip Pexels'te stok video bulmak için İngilizce arama terimleri üretiyorsun.")
+
+# Arama planları tüm planlayıcı örnekleri arasında paylaşılır
+search_plan_memo = PersistentMemo(SEARCH_PLAN_CACHE_DIR, max_entries=128, ttl=SEARCH_PLAN_CACHE_TTL)
+
+def clean_terms(terms, limit: int = SEARCH_PLAN_TERMS) -> List[str]:
+    """Terim listesini temizle (boş ve tekrar eden terimler çıkarılır)"""
+    cleaned = []
+    seen = set()
+    for term in terms if isinstance(terms, list) else []:
+        term = ' '.join(str(term).split())
+        if term and term.lower() not in seen:
+            seen.add(term.lower())
+            cleaned.append(term)
+    return cleaned[:limit]
+
+def scene_query(scene) -> str:
+    """Sahnenin arama sorgusu (sahne dict'i ya da düz metin olabilir)"""
+    return scene.get('query', '') if isinstance(scene, dict) else str(scene)
+
+class SearchPlanner:
+    """
+    İş başına tek GPT çağrısıyla tüm sahneler için arama planı üreten planlayıcı
+
+    Konu ve tüm sahneler tek istekte gönderilir; yanıt ortak ana konu, ortak yedek
+    terimler ve her sahne için öncelik sırasıyla İngilizce arama terimleridir. Sahne
+    aramaları bu planla yapılır ve ek GPT çağrısı gerektirmez. Planlar önbelleğe alınır;
+    istek başarısız olursa sahne sorgularından yerel bir plan üretilir (önbelleğe yazılmaz).
+    """
+
+    def __init__(self, client: Optional[openai.OpenAI] = None):
+        self.client = client or openai.OpenAI(api_key=OPENAI_API_KEY)
+        self.memo = search_plan_memo
+
+    def plan(self, topic: str, scenes: List) -> Dict:
+        """
+        Arama planı üret
+
+        Args:
+            topic (str): Video konusu
+            scenes (List): content["pexels_prompts"] listesi (dict ya da düz sorgu)
+
+        Returns:
+            Dict: {"main_subject", "subject_type", "shared_terms", "scenes": [{"query", "terms"}]};
+                "scenes" sahne sırasıyla ve sahne sayısı kadardır
+        """
+        if not scenes:
+            return self.fallback_plan(topic, scenes)
+
+        key = PersistentMemo.make_key(
+            normalize_text(topic),
+            [[normalize_text(scene_query(scene)), normalize_text(scene.get('description', '') if isinstance(scene, dict) else '')]
+             for scene in scenes],
+            SEARCH_PLAN_PROMPT_VERSION
+        )
+        try:
+            plan = self.memo.get_or_compute(key, lambda: self._request_plan(topic, scenes))
+            # Önbellekteki kaydın çağıran tarafından değiştirilmemesi için kopya döndür
+            return copy.deepcopy(plan)
+        except Exception as e:
+            print_warning(f"Arama planı oluşturulamadı, sahne sorguları kullanılıyor: {str(e)}")
+            return self.fallback_plan(topic, scenes)
+
+    @staticmethod
+    def fallback_plan(topic: str, scenes: List) -> Dict:
+        """GPT kullanmadan sahne sorgularından plan üret"""
+        return {
+            "main_subject": topic,
+            "subject_type": "other",
+            "shared_terms": [],
+            "scenes": [
+                {"query": scene_query(scene), "terms": clean_terms([scene_query(scene)])}
+                for scene in scenes
+            ]
+        }
+
+    @staticmethod
+    def scene_plan(plan: Dict, index: int) -> Dict:
+        """
+        Bir sahnenin search_videos(plan=...) için arama planı
+
+        Returns:
+            Dict: {"main_subject", "subject_type", "terms", "backup_terms"}
+        """
+        scene = plan["scenes"][index]
+        return {
+            "main_subject": plan["main_subject"],
+            "subject_type": plan["subject_type"],
+            "terms": list(scene["terms"]),
+            "backup_terms": list(plan["shared_terms"])
+        }
+
+    def _request_plan(self, topic: str, scenes: List) -> Dict:
+        """
+        GPT'den arama planını iste
+
+        Hata durumunda exception fırlatır; böylece yedek plan önbelleğe yazılmaz.
+        """
+        scene_lines = []
+        for index, scene in enumerate(scenes, 1):
+            description = scene.get('description', '') if isinstance(scene, dict) else ''
+            scene_lines.append(f"{index}. Sorgu: {scene_query(scene)} | Açıklama: {description}")
+
+        prompt = f"""Konu: "{topic}"
+
+Sahneler:
+{chr(10).join(scene_lines)}
+
+Tüm sahneleri birlikte analiz et ve Pexels'te video aramak için İngilizce arama terimleri üret.
+
+Önemli kurallar:
+1. Önce videonun ana konusunu (main_subject, İngilizce, 1-2 kelime) belirle
+2. Her sahne için en iyiden kötüye sıralı en fazla {SEARCH_PLAN_TERMS} arama terimi üret
+3. Her terim 1-3 kelimelik, Pexels'te kolay bulunabilecek İngilizce bir ifade olmalı
+4. Terimler sahnenin açıklamasını yansıtmalı ve ana konudan sapmamalı (örn: "bird eating seeds", "bird feeder")
+5. shared_terms: Hiçbir sahne için video bulunamazsa kullanılacak, konuyu genel olarak temsil eden 2-4 terim
+6. Her sahne için "index" değerini yukarıdaki sahne numarasıyla aynı ver
+
+Yanıtı JSON formatında ver:
+{{
+    "main_subject": "Ana konu",
+    "subject_type": "food/animal/nature/other",
+    "shared_terms": ["terim1", "terim2"],
+    "scenes": [
+        {{"index": 1, "terms": ["terim1", "terim2", "terim3"]}}
+    ]
+}}"""
+
+        response = self.client.chat.completions.create(
+            model=SEARCH_PLAN_MODEL,
+            messages=[{
+                "role": "system",
+                "content": SEARCH_PLAN_SYSTEM_PROMPT
+            }, {
+                "role": "user",
+                "content": prompt
+            }],
+            response_format={"type": "json_object"},
+            temperature=0.7
+        )
+        data = json.loads(response.choices[0].message.content)
+
+        main_subject = ' '.join(str(data.get('main_subject') or '').split())
+        if not main_subject:
+            raise ValueError("Ana konu bulunamadı")
+
+        # Sahneleri numarasına göre eşle; eksik ya da boş sahneler kendi sorgusuyla aranır
+        planned = {}
+        for entry in data.get('scenes') or []:
+            if isinstance(entry, dict) and isinstance(entry.get('index'), int):
+                planned[entry['index']] = clean_terms(entry.get('terms'))
+        missing = 0
+        plan_scenes = []
+        for index, scene in enumerate(scenes, 1):
+            terms = planned.get(index)
+            if not terms:
+                missing += 1
+                terms = clean_terms([scene_query(scene)])
+            plan_scenes.append({"query": scene_query(scene), "terms": terms})
+        if missing == len(scenes):
+            raise ValueError("Sahne terimleri bulunamadı")
+
+        plan = {
+            "main_subject": main_subject,
+            "subject_type": str(data.get('subject_type') or 'other'),
+            "shared_terms": clean_terms(data.get('shared_terms')),
+            "scenes": plan_scenes
+        }
+
+        # Planı logla
+        print_success(f"Arama planı: {main_subject} ({plan['subject_type']}), {len(scenes)} sahne")
+        for index, scene in enumerate(plan_scenes, 1):
+            print_info(f"- Sahne {index}: {', '.join(scene['terms'])}")
+        if missing:
+            print_warning(f"{missing} sahne için terim gelmedi, sahne sorgusu kullanılacak")
+        return plan
@@ -1,56 +1,156 @@
+import os
+import json
+import time
+import random
+import numbers
+import numpy as np
 import openai
 from typing import Dict, List, Tuple
 from config import print_error, print_warning, print_success, OPENAI_API_KEY
+from .lexical_ranker import LexicalRanker, slug_title
+from .relevance_cache import get_relevance_cache
 
 # OpenAI istemcisini yapılandır
 openai.api_key = OPENAI_API_KEY
 
+# Toplu skorlama ayarları
+RELEVANCE_MODEL = "gpt-4o"
+RELEVANCE_BATCH_TOKEN_BUDGET = int(os.getenv("RELEVANCE_BATCH_TOKEN_BUDGET", "3000"))  # Bir istekteki aday bilgilerinin yaklaşık token sınırı
+RELEVANCE_PROMPT_VERSION = f"{RELEVANCE_MODEL}-v1"  # Prompt veya model değişince artırılmalı (önbellek anahtarı)
+RELEVANCE_SYSTEM_PROMPT = "Sen bir video içerik analisti ve alakalılık uzmanısın. Verilen video içeriğinin arama sorgusuyla ne kadar alakalı olduğunu değerlendiriyorsun."
+
+# Kalite skorlama tabloları (skaler ve vektörel hesaplama aynı değerleri kullanır)
+QUALITY_MAP = {
+    'hd': 1.0,
+    'sd': 0.7,
+    'low': 0.3
+}
+QUALITY_WEIGHTS = {
+    'resolution': 0.3,
+    'fps': 0.1,
+    'duration': 0.2,
+    'quality': 0.2,
+    'popularity': 0.1,
+    'engagement': 0.1
+}
+
+def _is_number(value) -> bool:
+    return isinstance(value, numbers.Real)
+
+def build_quality_columns(videos: List[Dict]) -> Dict[str, np.ndarray]:
+    """
+    Aday listesini kalite skorlaması için sütunlu (dizi) temsile çevir
+    
+    Skaler hesaplamanın hata vereceği kayıtlar (eksik alan, sayı olmayan değer) "valid"
+    sütununda False olarak işaretlenir; bu kayıtların skoru 0.5 olur.
+    
+    Returns:
+        Dict[str, np.ndarray]: width, height, fps, duration, quality, views, likes, dislikes,
+            has_views, has_reactions, valid
+    """
+    count = len(videos)
+    width = [video.get('width') for video in videos]
+    height = [video.get('height') for video in videos]
+    duration = [video.get('duration') for video in videos]
+    fps = [video.get('fps', 30) for video in videos]
+    quality = [video.get('quality') for video in videos]
+    has_views = ['views' in video for video in videos]
+    has_reactions = ['likes' in video and 'dislikes' in video for video in videos]
+    
+    fast = (int, float)
+    valid = [
+        (type(w) in fast and type(h) in fast and type(d) in fast and type(f) in fast
+         or _is_number(w) and _is_number(h) and _is_number(d) and _is_number(f))
+        and (not q or type(q) is str)
+        for w, h, d, f, q in zip(width, height, duration, fps, quality)
+    ]
+    # Seyrek alanlar yalnızca bulundukları kayıtlarda doğrulanır
+    for i, video in enumerate(videos):
+        if has_views[i] and not _is_number(video['views']):
+            valid[i] = False
+        if has_reactions[i] and not (_is_number(video['likes']) and _is_number(video['dislikes'])):
+            valid[i] = False
+    all_valid = all(valid)
+            
+    def column(values: List) -> np.ndarray:
+        if all_valid:
+            return np.array(values, dtype=float)
+        return np.array([value if ok else 0.0 for value, ok in zip(values, valid)], dtype=float)
+        
+    def optional_column(key: str, present: List[bool]) -> np.ndarray:
+        result = np.zeros(count)
+        for i, video in enumerate(videos):
+            if present[i] and valid[i]:
+                result[i] = video[key]
+        return result
+        
+    quality_scores = [QUALITY_MAP.get(q.lower() if q else 'sd', 0.5) if ok else 0.0 for q, ok in zip(quality, valid)]
+    
+    return {
+        'width': column(width),
+        'height': column(height),
+        'fps': column(fps),
+        'duration': column(duration),
+        'quality': np.array(quality_scores, dtype=float),
+        'views': optional_column('views', has_views),
+        'likes': optional_column('likes', has_reactions),
+        'dislikes': optional_column('dislikes', has_reactions),
+        'has_views': np.array(has_views, dtype=bool),
+        'has_reactions': np.array(has_reactions, dtype=bool),
+        'valid': np.array(valid, dtype=bool)
+    }
+
 class VideoAnalyzer:
     """Video içerik analizi ve kalite değerlendirmesi için sınıf"""
     
     def __init__(self):
         self.openai_client = openai.OpenAI(api_key=OPENAI_API_KEY)
+        self.lexical_ranker = LexicalRanker()
+        self.relevance_cache = get_relevance_cache()
         
     def _extract_title_from_url(self, url: str) -> str:
         """URL'den video başlığını çıkar"""
-        try:
-            # URL'yi parçala ve son kısmı al
-            parts = url.rstrip('/').split('/')
-            last_part = parts[-1]
-            
-            # ID'yi kaldır
-            title = '-'.join(last_part.split('-')[:-1])
-            
-            # Tire işaretlerini boşluğa çevir
-            return ' '.join(title.split('-'))
-        except:
-            return ""
-            
+        return slug_title(url)
+        
+    def _video_content(self, video_data: Dict) -> Dict:
+        """Alakalılık analizi için video bilgilerini birleştir"""
+        # URL'den başlığı çıkar
+        url_title = self._extract_title_from_url(video_data.get('url', ''))
+        
+        # Video bilgilerini birleştir (daha detaylı format)
+        return {
+            "url_title": url_title,
+            "title": video_data.get('title', ''),
+            "description": video_data.get('description', ''),
+            "tags": ', '.join(video_data.get('tags', [])),
+            "user_info": {
+                "name": video_data.get('user', {}).get('name', ''),
+                "url": video_data.get('user', {}).get('url', '')
+            }
+        }
+        
     def analyze_content_relevance(self, query: str, video_data: Dict) -> Tuple[float, str]:
         """
         Video içeriğinin arama sorgusuyla alakasını analiz et
         
+        Aynı sorgu ve video için daha önce alınmış skor varsa önbellekten döndürülür.
+        
         Returns:
             Tuple[float, str]: (Alakalılık skoru (0-1), Açıklama)
         """
+        if video_data.get('id') is not None:
+            cached = self.relevance_cache.get(query, video_data['id'], RELEVANCE_PROMPT_VERSION)
+            if cached:
+                return cached
+        return self._analyze_relevance(query, video_data)
+        
+    def _analyze_relevance(self, query: str, video_data: Dict) -> Tuple[float, str]:
+        """Tek bir videoyu GPT ile skorla ve başarılı sonucu önbelleğe yaz"""
         try:
-            # URL'den başlığı çıkar
-            url_title = self._extract_title_from_url(video_data.get('url', ''))
-            
-            # Video bilgilerini birleştir (daha detaylı format)
-            video_content = {
-                "url_title": url_title,
-                "title": video_data.get('title', ''),
-                "description": video_data.get('description', ''),
-                "tags": ', '.join(video_data.get('tags', [])),
-                "user_info": {
-                    "name": video_data.get('user', {}).get('name', ''),
-                    "url": video_data.get('user', {}).get('url', '')
-                }
-            }
+            video_content = self._video_content(video_data)
             
             # System prompt tanımla
-            system_prompt = "Sen bir video içerik analisti ve alakalılık uzmanısın. Verilen video içeriğinin arama sorgusuyla ne kadar alakalı olduğunu değerlendiriyorsun."
+            system_prompt = RELEVANCE_SYSTEM_PROMPT
             
             # Daha detaylı prompt
             prompt = f"""Video içeriğini arama sorgusuyla karşılaştır ve alakalılık skoru ver.
@@ -70,7 +170,7 @@ Neden:[Kısa açıklama]"""
             
             # OpenAI API'yi çağır
             response = self.openai_client.chat.completions.create(
-                model="gpt-4o",
+                model=RELEVANCE_MODEL,
                 messages=[
                     {
                         "role": "system", 
@@ -96,13 +196,153 @@ Neden:[Kısa açıklama]"""
             score = float(score_text)
             
             explanation = explanation_line.split(':')[1].strip()
+            score = min(max(score, 0), 1)
             
-            return min(max(score, 0), 1), explanation
+            if video_data.get('id') is not None:
+                self.relevance_cache.set(query, video_data['id'], RELEVANCE_PROMPT_VERSION, score, explanation)
+            return score, explanation
             
         except Exception as e:
             print_warning(f"İçerik analizi hatası: {str(e)}")
             return 0.5, "Analiz sırasında hata oluştu"
             
+    @staticmethod
+    def _estimate_tokens(text: str) -> int:
+        """Metnin yaklaşık token sayısı (~4 karakter/token)"""
+        return len(text) // 4 + 1
+        
+    def _chunk_candidates(self, candidates: List[Dict]) -> List[List[Dict]]:
+        """Adayları token bütçesini aşmayacak gruplara böl"""
+        chunks, current, used = [], [], 0
+        for candidate in candidates:
+            tokens = self._estimate_tokens(json.dumps(candidate, ensure_ascii=False))
+            if current and used + tokens > RELEVANCE_BATCH_TOKEN_BUDGET:
+                chunks.append(current)
+                current, used = [], 0
+            current.append(candidate)
+            used += tokens
+        if current:
+            chunks.append(current)
+        return chunks
+        
+    def _score_chunk(self, query: str, candidates: List[Dict]) -> Dict[int, Tuple[float, str]]:
+        """
+        Bir grup adayı tek istekte skorla
+        
+        Returns:
+            Dict[int, Tuple[float, str]]: Aday id -> (Alakalılık skoru (0-1), Açıklama)
+        """
+        prompt = f"""Her video içeriğini arama sorgusuyla karşılaştır ve her biri için alakalılık skoru ver.
+
+Arama Sorgusu: '{query}'
+
+Videolar (JSON):
+{json.dumps(candidates, ensure_ascii=False, indent=2)}
+
+Yanıtı yalnızca şu JSON formatında ver, her video id'si için bir kayıt olsun:
+{{"scores": [{{"id": 0, "score": 0.0-1.0, "reason": "Kısa açıklama"}}]}}"""
+        
+        response = self.openai_client.chat.completions.create(
+            model=RELEVANCE_MODEL,
+            messages=[
+                {
+                    "role": "system",
+                    "content": RELEVANCE_SYSTEM_PROMPT
+                },
+                {
+                    "role": "user",
+                    "content": prompt
+                }
+            ],
+            response_format={"type": "json_object"},
+            temperature=0.7
+        )
+        
+        data = json.loads(response.choices[0].message.content)
+        results = {}
+        for item in data.get("scores", []):
+            try:
+                score = min(max(float(item["score"]), 0), 1)
+                results[int(item["id"])] = (score, str(item.get("reason", "")))
+            except (KeyError, TypeError, ValueError):
+                continue
+        # Yalnızca bu gruptaki id'leri kabul et
+        ids = {candidate["id"] for candidate in candidates}
+        return {index: relevance for index, relevance in results.items() if index in ids}
+        
+    def score_batch(self, query: str, videos: List[Dict]) -> List[Tuple[float, str]]:
+        """
+        Birden fazla videonun arama sorgusuyla alakasını tek istekte analiz et
+        
+        Önbellekte skoru olan videolar atlanır. Kalanlar RELEVANCE_BATCH_TOKEN_BUDGET'a göre
+        gruplara bölünür; her grup tek bir JSON yanıtlı istekle skorlanır. Yanıtta eksik kalan
+        videolar tek tek analiz edilir.
+        
+        Args:
+            query (str): Arama sorgusu
+            videos (List[Dict]): Video bilgileri
+            
+        Returns:
+            List[Tuple[float, str]]: Videolarla aynı sırada (Alakalılık skoru (0-1), Açıklama)
+        """
+        # Önbellekte olanlar için GPT'ye gitme
+        cached = self.relevance_cache.get_many(
+            query, [video['id'] for video in videos if video.get('id') is not None], RELEVANCE_PROMPT_VERSION
+        )
+        results: Dict[int, Tuple[float, str]] = {
+            index: cached[video['id']] for index, video in enumerate(videos) if video.get('id') in cached
+        }
+        
+        candidates = []
+        for index, video in enumerate(videos):
+            if index in results:
+                continue
+            content = self._video_content(video)
+            candidates.append({
+                "id": index,
+                "url_title": content["url_title"],
+                "title": content["title"],
+                "description": content["description"],
+                "tags": content["tags"],
+                "user": content["user_info"]["name"]
+            })
+            
+        for chunk in self._chunk_candidates(candidates):
+            try:
+                scored = self._score_chunk(query, chunk)
+                results.update(scored)
+                self.relevance_cache.set_many(query, {
+                    videos[index]['id']: relevance for index, relevance in scored.items()
+                    if videos[index].get('id') is not None
+                }, RELEVANCE_PROMPT_VERSION)
+            except Exception as e:
+                print_warning(f"Toplu içerik analizi hatası: {str(e)}")
+                for candidate in chunk:
+                    results[candidate["id"]] = (0.5, "Analiz sırasında hata oluştu")
+                    
+        scores = []
+        for index, video in enumerate(videos):
+            if index not in results:
+                # Model bu videoyu atladıysa tek başına skorla
+                results[index] = self._analyze_relevance(query, video)
+            scores.append(results[index])
+        return scores
+        
+    def invalidate_relevance(self, query: str = None, video_id: int = None, all_versions: bool = False) -> int:
+        """
+        Önbellekteki alakalılık skorlarını sil
+        
+        Args:
+            query (str, optional): Yalnızca bu sorgunun skorları
+            video_id (int, optional): Yalnızca bu videonun skorları
+            all_versions (bool): Eski prompt sürümlerinin kayıtlarını da sil
+            
+        Returns:
+            int: Silinen kayıt sayısı
+        """
+        prompt_version = None if all_versions else RELEVANCE_PROMPT_VERSION
+        return self.relevance_cache.invalidate(query, video_id, prompt_version)
+        
     def calculate_quality_score(self, video: Dict) -> Tuple[float, Dict[str, float]]:
         """
         Video kalitesini değerlendir
@@ -131,13 +371,8 @@ Neden:[Kısa açıklama]"""
                 scores['duration'] = max(1 - (duration - 30) / 30, 0)
             
             # 4. Görüntü Kalitesi
-            quality_map = {
-                'hd': 1.0,
-                'sd': 0.7,
-                'low': 0.3
-            }
             video_quality = video.get('quality', 'sd').lower() if video.get('quality') else 'sd'
-            scores['quality'] = quality_map.get(video_quality, 0.5)
+            scores['quality'] = QUALITY_MAP.get(video_quality, 0.5)
             
             # 5. Popülerlik ve Etkileşim (eğer varsa)
             if 'views' in video:
@@ -146,23 +381,13 @@ Neden:[Kısa açıklama]"""
                 total_reactions = video['likes'] + video['dislikes']
                 scores['engagement'] = video['likes'] / total_reactions if total_reactions > 0 else 0.5
             
-            # Ağırlıklı ortalama
-            weights = {
-                'resolution': 0.3,
-                'fps': 0.1,
-                'duration': 0.2,
-                'quality': 0.2,
-                'popularity': 0.1,
-                'engagement': 0.1
-            }
-            
-            # Sadece mevcut skorları kullan
+            # Ağırlıklı ortalama, sadece mevcut skorları kullan
             total_score = 0
             total_weight = 0
             for key, score in scores.items():
-                if key in weights:
-                    total_score += score * weights[key]
-                    total_weight += weights[key]
+                if key in QUALITY_WEIGHTS:
+                    total_score += score * QUALITY_WEIGHTS[key]
+                    total_weight += QUALITY_WEIGHTS[key]
             
             final_score = total_score / total_weight if total_weight > 0 else 0.5
             return final_score, scores
@@ -171,6 +396,64 @@ Neden:[Kısa açıklama]"""
             print_warning(f"Kalite hesaplama hatası: {str(e)}")
             return 0.5, {'error': str(e)}
             
+    def calculate_quality_scores(self, videos) -> Tuple[np.ndarray, Dict[str, np.ndarray]]:
+        """
+        Tüm adayların kalite skorunu tek geçişte (vektörel) hesapla
+        
+        Sonuçlar calculate_quality_score ile birebir aynıdır; büyük aday havuzları için kullanılır.
+        
+        Args:
+            videos: Video listesi ya da build_quality_columns ile önceden oluşturulmuş sütunlar
+            
+        Returns:
+            Tuple[np.ndarray, Dict[str, np.ndarray]]: (Toplam kalite skorları, Alt skor dizileri)
+        """
+        columns = videos if isinstance(videos, dict) else build_quality_columns(videos)
+        valid = columns['valid']
+        count = len(valid)
+        scores = {}
+        
+        # 1. Çözünürlük Skoru (1080p = 1.0)
+        scores['resolution'] = np.minimum(columns['width'] * columns['height'] / (1920 * 1080), 1.0)
+        
+        # 2. FPS Skoru (30fps = 1.0)
+        scores['fps'] = np.minimum(columns['fps'] / 30, 1.0)
+        
+        # 3. Süre Uygunluğu (10-30 sn arası ideal)
+        duration = columns['duration']
+        scores['duration'] = np.where(
+            (duration >= 10) & (duration <= 30), 1.0,
+            np.where(duration < 10, duration / 10, np.maximum(1 - (duration - 30) / 30, 0))
+        )
+        
+        # 4. Görüntü Kalitesi
+        scores['quality'] = columns['quality']
+        
+        # 5. Popülerlik ve Etkileşim (eğer varsa)
+        scores['popularity'] = np.minimum(columns['views'] / 10000, 1.0)
+        reactions = columns['likes'] + columns['dislikes']
+        with np.errstate(divide='ignore', invalid='ignore'):
+            scores['engagement'] = np.where(reactions > 0, columns['likes'] / reactions, 0.5)
+            
+        # Ağırlıklı ortalama (skaler sürümle aynı toplama sırası)
+        present = {
+            'resolution': valid,
+            'fps': valid,
+            'duration': valid,
+            'quality': valid,
+            'popularity': valid & columns['has_views'],
+            'engagement': valid & columns['has_reactions']
+        }
+        total_score = np.zeros(count)
+        total_weight = np.zeros(count)
+        for key, weight in QUALITY_WEIGHTS.items():
+            total_score = total_score + np.where(present[key], scores[key] * weight, 0.0)
+            total_weight = total_weight + np.where(present[key], weight, 0.0)
+            
+        with np.errstate(divide='ignore', invalid='ignore'):
+            final_scores = np.where(total_weight > 0, total_score / total_weight, 0.5)
+        return final_scores, scores
+        
     def get_video_score(self, query: str, video: Dict, weights: Dict[str, float] = None) -> Dict:
         """
         Video için toplam skor hesapla
@@ -189,7 +472,35 @@ Neden:[Kısa açıklama]"""
             
         # İçerik alakalılığını analiz et
         relevance_score, relevance_explanation = self.analyze_content_relevance(query, video)
+        return self._combine_scores(video, relevance_score, relevance_explanation, weights)
         
+    def get_video_scores(self, query: str, videos: List[Dict], weights: Dict[str, float] = None) -> List[Dict]:
+        """
+        Birden fazla video için toplam skor hesapla (alakalılık tek istekte)
+        
+        Args:
+            query (str): Arama sorgusu
+            videos (List[Dict]): Video bilgileri
+            weights (Dict[str, float]): Skorların ağırlıkları
+                {'relevance': 0.6, 'quality': 0.4} varsayılan
+                
+        Returns:
+            List[Dict]: Videolarla aynı sırada detaylı skor bilgileri (get_video_score formatında)
+        """
+        if weights is None:
+            weights = {'relevance': 0.6, 'quality': 0.4}
+        if not videos:
+            return []
+            
+        relevances = self.score_batch(query, videos)
+        return [
+            self._combine_scores(video, relevance_score, relevance_explanation, weights)
+            for video, (relevance_score, relevance_explanation) in zip(videos, relevances)
+        ]
+        
+    def _combine_scores(self, video: Dict, relevance_score: float, relevance_explanation: str,
+                        weights: Dict[str, float]) -> Dict:
+        """Alakalılık ve kalite skorlarını birleştir"""
         # Kalite skorunu hesapla
         quality_score, quality_details = self.calculate_quality_score(video)
         
@@ -210,3 +521,50 @@ Neden:[Kısa açıklama]"""
                 'details': quality_details
             }
         }
+
+if __name__ == "__main__":
+    # Kalite skorlama mikro ölçümü: skaler ve vektörel sürüm
+    analyzer = VideoAnalyzer.__new__(VideoAnalyzer)
+    rng = random.Random(42)
+    
+    def random_video() -> Dict:
+        width, height = rng.choice([(1280, 720), (1920, 1080), (3840, 2160), (1080, 1920), (640, 360)])
+        video = {
+            'width': width,
+            'height': height,
+            'duration': rng.randint(3, 90),
+            'quality': rng.choice(['hd', 'sd', 'low', 'HD', None, 'uhd'])
+        }
+        if rng.random() < 0.5:
+            video['fps'] = rng.choice([24, 25, 29.97, 30, 50, 60])
+        if rng.random() < 0.3:
+            video['views'] = rng.randint(0, 50000)
+        if rng.random() < 0.3:
+            video['likes'], video['dislikes'] = rng.randint(0, 500), rng.randint(0, 50)
+        return video
+        
+    for pool_size in (10, 100, 1000):
+        videos = [random_video() for _ in range(pool_size)]
+        repeats = max(10000 // pool_size, 5)
+        
+        start = time.perf_counter()
+        for _ in range(repeats):
+            scalar = [analyzer.calculate_quality_score(video)[0] for video in videos]
+        scalar_time = (time.perf_counter() - start) / repeats
+        
+        start = time.perf_counter()
+        for _ in range(repeats):
+            vector, _ = analyzer.calculate_quality_scores(videos)
+        vector_time = (time.perf_counter() - start) / repeats
+        
+        # Sütunlar havuz oluşturulurken bir kez çıkarılırsa yalnızca skorlama maliyeti kalır
+        columns = build_quality_columns(videos)
+        start = time.perf_counter()
+        for _ in range(repeats):
+            analyzer.calculate_quality_scores(columns)
+        columnar_time = (time.perf_counter() - start) / repeats
+        
+        identical = np.array_equal(np.array(scalar), vector)
+        print(f"{pool_size:>5} aday: skaler {scalar_time * 1e3:.3f} ms, vektörel {vector_time * 1e3:.3f} ms "
+              f"({scalar_time / vector_time:.1f}x), hazır sütunlarla {columnar_time * 1e3:.3f} ms "
+              f"({scalar_time / columnar_time:.1f}x), sonuçlar aynı: {identical}")
@@ -2,7 +2,7 @@ import os
 import subprocess
 import re
 from typing import List, Optional, Dict
-from config import print_error, print_success, print_warning, FFMPEG_PATH
+from config import print_error, print_success, print_warning, print_info, FFMPEG_PATH, ASPECT_RATIO_RESOLUTIONS
 import logging
 
 # FFmpeg yolunu kontrol et
@@ -116,7 +116,8 @@ def create_subtitle_filter(text: str, audio_duration: float, aspect_ratio: str =
     # Filtreleri virgülle birleştir
     return ','.join(filters)
 
-def create_video(video_files: List[str], audio_file: str, output_file: str, video_style: Dict = None, duration: float = None, aspect_ratio: str = "9:16") -> bool:
+def create_video(video_files: List[str], audio_file: str, output_file: str, video_style: Dict = None, duration: float = None, aspect_ratio: str = "9:16",
+                 clip_durations: Optional[List[float]] = None) -> bool:
     """
     Videoları ve ses dosyasını birleştir
     
@@ -127,6 +128,7 @@ def create_video(video_files: List[str], audio_file: str, output_file: str, vide
         video_style (Dict, optional): Video stili
         duration (float, optional): Manuel video süresi (saniye)
         aspect_ratio (str, optional): Video en-boy oranı ("16:9" veya "9:16")
+        clip_durations (List[float], optional): Her klipten kullanılacak süre; verilmezse süre kliplere eşit bölünür
         
     Returns:
         bool: Başarılı ise True, değilse False
@@ -157,14 +159,13 @@ def create_video(video_files: List[str], audio_file: str, output_file: str, vide
         # Her video için gereken süreyi hesapla
         video_count = len(video_files)
         duration_per_video = audio_duration / video_count if not duration else duration / video_count
+        if clip_durations and len(clip_durations) == video_count:
+            print_info(f"Klip süreleri: {', '.join(f'{d:.2f}' for d in clip_durations)}")
+        else:
+            clip_durations = [duration_per_video] * video_count
         
         # İstenen en-boy oranı için boyutları belirle
-        if aspect_ratio == "16:9":
-            target_width = 1920
-            target_height = 1080
-        else:  # 9:16
-            target_width = 1080
-            target_height = 1920
+        target_width, target_height = ASPECT_RATIO_RESOLUTIONS.get(aspect_ratio, ASPECT_RATIO_RESOLUTIONS["9:16"])
         
         # Çıktı dizinini oluştur
         output_dir = os.path.dirname(output_file)
@@ -181,7 +182,7 @@ def create_video(video_files: List[str], audio_file: str, output_file: str, vide
                 # Her video için scale, trim ve setsar
                 for i in range(len(video_files)):
                     filter_chains.append(
-                        f'[{i}:v]trim=0:{duration_per_video},setpts=PTS-STARTPTS,'
+                        f'[{i}:v]trim=0:{clip_durations[i]},setpts=PTS-STARTPTS,'
                         f'scale={target_width}:{target_height}:force_original_aspect_ratio=increase,'
                         f'crop={target_width}:{target_height},setsar=1:1[v{i}]'
                     )
@@ -200,10 +201,10 @@ def create_video(video_files: List[str], audio_file: str, output_file: str, vide
                 filter_complex = ';'.join(filter_chains)
             else:
                 # Altyazı yoksa sadece videoları birleştir
-                filter_complex = simple_concat_filter(video_files, audio_file, duration_per_video, target_width, target_height)
+                filter_complex = simple_concat_filter(video_files, audio_file, duration_per_video, target_width, target_height, clip_durations)
         else:
             # Altyazı devre dışıysa sadece videoları birleştir
-            filter_complex = simple_concat_filter(video_files, audio_file, duration_per_video, target_width, target_height)
+            filter_complex = simple_concat_filter(video_files, audio_file, duration_per_video, target_width, target_height, clip_durations)
         
         # FFmpeg komutunu oluştur
         input_args = []
@@ -274,7 +275,8 @@ def create_video(video_files: List[str], audio_file: str, output_file: str, vide
         print_error(f"Hata ayrıntıları: {traceback.format_exc()}")
         return False
 
-def simple_concat_filter(video_files: List[str], audio_file: str, duration_per_video: float, target_width: int, target_height: int) -> str:
+def simple_concat_filter(video_files: List[str], audio_file: str, duration_per_video: float, target_width: int, target_height: int,
+                         clip_durations: Optional[List[float]] = None) -> str:
     """
     Basit birleştirme filtresi oluştur
     
@@ -284,13 +286,15 @@ def simple_concat_filter(video_files: List[str], audio_file: str, duration_per_v
         duration_per_video (float): Her video için süre
         target_width (int): Hedef video genişliği
         target_height (int): Hedef video yüksekliği
+        clip_durations (List[float], optional): Klip bazında süreler (verilirse duration_per_video yerine)
     """
     filter_chains = []
     
     # Her video için scale, trim ve setsar
     for i in range(len(video_files)):
+        clip_duration = clip_durations[i] if clip_durations else duration_per_video
         filter_chains.append(
-            f'[{i}:v]trim=0:{duration_per_video},setpts=PTS-STARTPTS,'
+            f'[{i}:v]trim=0:{clip_duration},setpts=PTS-STARTPTS,'
             f'scale={target_width}:{target_height}:force_original_aspect_ratio=increase,'
             f'crop={target_width}:{target_height},setsar=1:1[v{i}]'
         )
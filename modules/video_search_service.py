@@ -1,10 +1,25 @@
 import os
+import copy
+import math
+import sqlite3
+import subprocess
+import threading
 import requests
 import json
 import time
-from typing import List, Dict, Optional, Tuple
-from config import print_error, print_success, print_warning, print_info
+from contextlib import closing
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterator, List, Dict, Optional, Tuple
+from config import print_error, print_success, print_warning, print_info, FFMPEG_PATH
 from .video_analyzer import VideoAnalyzer
+from .search_planner import SearchPlanner
+from .candidate_ranker import CandidateRanker, RANKING_ENABLED, RANK_POOL_SIZE
+from .pexels_cache import get_search_cache
+from .memo_cache import PersistentMemo, normalize_text
+from .http_client import get_session
+from .pexels_client import get_pexels_client, PexelsRateLimitError
+from .clip_store import ClipStore, get_clip_store
+from .downloader import SegmentedDownloader, DownloadError, PART_SUFFIX
 import openai
 from dotenv import load_dotenv
 
@@ -16,8 +31,20 @@ PEXELS_API_KEY = os.getenv("PEXELS_API_KEY")
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
 
 # Sabitleri tanımla
-CACHE_DIR = "cache/pexels"
-CACHE_DURATION = 6 * 60 * 60  # 6 saat (saniye cinsinden)
+CACHE_DIR = os.getenv("CACHE_DIR", "cache/pexels")
+CACHE_DURATION = int(os.getenv("CACHE_DURATION", str(6 * 60 * 60)))  # 6 saat (saniye cinsinden)
+CACHE_MAX_BYTES = int(os.getenv("CACHE_MAX_SIZE_MB", "100")) * 1024 * 1024
+CLIP_STORE_ENABLED = os.getenv("CLIP_STORE_ENABLED", "true").lower() in ("1", "true", "yes")
+PARTIAL_FETCH_ENABLED = os.getenv("PARTIAL_FETCH_ENABLED", "true").lower() in ("1", "true", "yes")
+PARTIAL_FETCH_HEADROOM = float(os.getenv("PARTIAL_FETCH_HEADROOM", "1.25"))  # Seslendirme hedeften uzun sürebilir
+PARTIAL_FETCH_MARGIN = float(os.getenv("PARTIAL_FETCH_MARGIN", "1"))  # Kısmi indirmede eklenen güvenlik payı (sn)
+SEARCH_FANOUT = max(int(os.getenv("PEXELS_SEARCH_FANOUT", "4")), 1)  # Aynı anda aranan terim sayısı
+SEARCH_TERM_MODEL = "gpt-4o"
+SEARCH_TERM_CACHE_DIR = os.getenv("SEARCH_TERM_CACHE_DIR", "cache/search_terms")
+SEARCH_TERM_CACHE_TTL = int(os.getenv("SEARCH_TERM_CACHE_TTL", str(30 * 24 * 60 * 60)))  # 30 gün
+
+# Arama terimi çevirileri tüm servis örnekleri arasında paylaşılır
+search_term_memo = PersistentMemo(SEARCH_TERM_CACHE_DIR, max_entries=512, ttl=SEARCH_TERM_CACHE_TTL)
 
 class VideoSearchService:
     """Pexels API ile akıllı video arama servisi"""
@@ -32,21 +59,80 @@ class VideoSearchService:
             "Authorization": PEXELS_API_KEY
         }
         
+        # Paylaşılan keep-alive HTTP oturumu ve hız limitine duyarlı Pexels istemcisi
+        self.http = get_session()
+        self.pexels = get_pexels_client(PEXELS_API_KEY)
+        
+        # Sürüm seçimi istatistikleri (bu servis örneğinin indirmeleri)
+        self.transfer_stats = {'downloaded_bytes': 0, 'baseline_bytes': 0}
+        self._stats_lock = threading.Lock()
+        
+        # Projeler arası paylaşılan klip deposu
+        self.clip_store = get_clip_store() if CLIP_STORE_ENABLED else None
+        
         # OpenAI istemcisi
         if not OPENAI_API_KEY:
             raise ValueError("OPENAI_API_KEY bulunamadı!")
         self.openai_client = openai.OpenAI(api_key=OPENAI_API_KEY)
         
+        # İş başına tek çağrıyla tüm sahnelerin arama terimlerini üreten planlayıcı
+        self.planner = SearchPlanner(self.openai_client)
+        
         # Video analiz servisi
         self.analyzer = VideoAnalyzer()
+        self.ranker = CandidateRanker(self.analyzer) if RANKING_ENABLED else None
+        
+        # GPT arama terimi çevirileri için memo önbelleği
+        self.search_term_memo = search_term_memo
         
-        # Cache dizinini oluştur
-        os.makedirs(CACHE_DIR, exist_ok=True)
+        # Arama yanıtı önbelleği (tüm servis örnekleri arasında paylaşılır)
+        self.search_cache = get_search_cache(CACHE_DIR, CACHE_DURATION, CACHE_MAX_BYTES)
         
     def _get_english_search_term(self, query: str) -> str:
-        """GPT ile Türkçe sorguyu İngilizce arama terimine çevir"""
+        """GPT ile Türkçe sorguyu İngilizce arama terimine çevir (sonuç önbelleğe alınır)"""
         try:
-            prompt = f"""Verilen Türkçe konuyu analiz et ve Pexels'te video aramak için en uygun İngilizce arama terimlerini üret.
+            key = PersistentMemo.make_key(normalize_text(query), SEARCH_TERM_MODEL)
+            search_data = self.search_term_memo.get_or_compute(key, lambda: self._request_search_terms(query))
+            # Önbellekteki kaydın çağıran tarafından değiştirilmemesi için kopya döndür
+            return copy.deepcopy(search_data)
+            
+        except (json.JSONDecodeError, ValueError) as e:
+            print_warning(f"JSON parse hatası: {str(e)}")
+            # Basit bir arama verisi oluştur
+            return {
+                "analysis": {
+                    "main_subject": query,
+                    "subject_type": query.split()[0],
+                    "context": query
+                },
+                "search_terms": {
+                    "primary": ["bird eating seeds", "bird catching insects", "bird pecking food"],
+                    "secondary": ["bird feeding nature", "bird foraging", "bird hunting"],
+                    "context": ["birds habitat", "bird natural", "birds wildlife"]
+                }
+            }
+        except Exception as e:
+            print_warning(f"Arama terimi oluşturma hatası: {str(e)}")
+            return {
+                "analysis": {
+                    "main_subject": query,
+                    "subject_type": query.split()[0],
+                    "context": query
+                },
+                "search_terms": {
+                    "primary": ["bird eating"],
+                    "secondary": ["bird nature"],
+                    "context": ["bird wildlife"]
+                }
+            }
+            
+    def _request_search_terms(self, query: str) -> Dict:
+        """
+        GPT'den arama terimlerini iste
+        
+        Hata durumunda exception fırlatır; böylece yedek veriler önbelleğe yazılmaz.
+        """
+        prompt = f"""Verilen Türkçe konuyu analiz et ve Pexels'te video aramak için en uygun İngilizce arama terimlerini üret.
 
 Önemli kurallar:
 1. Önce konuyu analiz et ve ana konuyu (main_subject) belirle
@@ -84,90 +170,151 @@ Bağlam terimleri:
 Türkçe konu: "{query}"
 Yanıtı JSON formatında ver:
 {{
-    "analysis": {{
-        "main_subject": "Ana konu/yemek/canlı adı",
-        "subject_type": "food/animal/nature/other",
-        "context": "Bağlam açıklaması"
-    }},
-    "search_terms": {{
-        "primary": ["terim1", "terim2", "terim3"],
-        "secondary": ["terim1", "terim2", "terim3"],
-        "context": ["terim1", "terim2", "terim3"]
-    }}
+"analysis": {{
+    "main_subject": "Ana konu/yemek/canlı adı",
+    "subject_type": "food/animal/nature/other",
+    "context": "Bağlam açıklaması"
+}},
+"search_terms": {{
+    "primary": ["terim1", "terim2", "terim3"],
+    "secondary": ["terim1", "terim2", "terim3"],
+    "context": ["terim1", "terim2", "terim3"]
+}}
 }}"""
 
-            response = self.openai_client.chat.completions.create(
-                model="gpt-4o",  # Güncel model adı
-                messages=[{
-                    "role": "system",
-                    "content": "Sen bir doğa belgeseli ve video içerik uzmanısın. Konuları derinlemesine analiz edip, "
-                              "en uygun ve doğal video sahnelerini bulmak için arama terimleri üretiyorsun."
-                }, {
-                    "role": "user",
-                    "content": prompt
-                }],
-                temperature=0.7,
-                max_tokens=200
-            )
+        response = self.openai_client.chat.completions.create(
+            model=SEARCH_TERM_MODEL,
+            messages=[{
+                "role": "system",
+                "content": "Sen bir doğa belgeseli ve video içerik uzmanısın. Konuları derinlemesine analiz edip, "
+                          "en uygun ve doğal video sahnelerini bulmak için arama terimleri üretiyorsun."
+            }, {
+                "role": "user",
+                "content": prompt
+            }],
+            temperature=0.7,
+            max_tokens=200
+        )
+        
+        # Yanıtı parse et
+        content = response.choices[0].message.content.strip()
+        # JSON başlangıç ve bitiş noktalarını bul
+        start = content.find('{')
+        end = content.rfind('}') + 1
+        if start >= 0 and end > start:
+            json_str = content[start:end]
+            search_data = json.loads(json_str)
+        else:
+            raise ValueError("JSON verisi bulunamadı")
             
-            # Yanıtı parse et
-            try:
-                content = response.choices[0].message.content.strip()
-                # JSON başlangıç ve bitiş noktalarını bul
-                start = content.find('{')
-                end = content.rfind('}') + 1
-                if start >= 0 and end > start:
-                    json_str = content[start:end]
-                    search_data = json.loads(json_str)
+        # Analizi logla
+        print_success(f"Konu Analizi:")
+        print_success(f"- Ana Konu: {search_data['analysis']['main_subject']}")
+        print_success(f"- Konu Tipi: {search_data['analysis']['subject_type']}")
+        print_success(f"- Bağlam: {search_data['analysis']['context']}")
+        
+        # Arama terimlerini logla
+        print_success(f"\nBirincil Terimler: {', '.join(search_data['search_terms']['primary'])}")
+        print_success(f"İkincil Terimler: {', '.join(search_data['search_terms']['secondary'])}")
+        print_success(f"Bağlam Terimleri: {', '.join(search_data['search_terms']['context'])}")
+        
+        return search_data
+
+    def _analyze_query(self, query: str) -> Tuple[str, List[str], List[str]]:
+        """
+        Plan verilmeyen aramalar için sorguyu GPT ile analiz edip arama terimlerini hazırla
+        
+        Returns:
+            Tuple[str, List[str], List[str]]: (Ana konu, birincil terimler, öncelik sırasıyla arama terimleri)
+        """
+        # Ana konuyu belirle
+        search_data = self._get_english_search_term(query)
+        main_subject = search_data['analysis']['main_subject']
+        subject_type = search_data['analysis']['subject_type']
+        
+        # Yedek arama terimleri
+        backup_terms = [
+            "cooking food",
+            "kitchen cooking",
+            "food preparation",
+            "cooking ingredients",
+            "food serving",
+            "kitchen preparation"
+        ]
+        
+        # Arama terimlerini hazırla
+        search_terms = []
+        # Birincil terimleri ekle
+        search_terms.extend(search_data['search_terms']['primary'][:2])
+        # İkincil terimleri ekle
+        search_terms.extend(search_data['search_terms']['secondary'][:2])
+        # Bağlam terimlerini ekle
+        search_terms.extend(search_data['search_terms']['context'][:2])
+        # Yedek terimleri ekle
+        search_terms.extend(backup_terms)
+        
+        # Ana konuyu içeren spesifik arama terimlerini öncelik sırasıyla oluştur
+        specific_terms = []
+        for term in search_terms:
+            if subject_type == 'food':
+                # Yemek konuları için sadece tek kelime yeterli
+                search_term = term
+            else:
+                # Diğer konular için ana konuyu ekle (örn: "Istanbul bridge")
+                # Ana konu tek kelime ise ve terim de aynıysa tekrar ekleme
+                if ' ' not in main_subject and term.lower() == main_subject.lower():
+                    search_term = term
                 else:
-                    raise ValueError("JSON verisi bulunamadı")
-                    
-            except (json.JSONDecodeError, ValueError) as e:
-                print_warning(f"JSON parse hatası: {str(e)}")
-                # Basit bir arama verisi oluştur
-                search_data = {
-                    "analysis": {
-                        "main_subject": query,
-                        "subject_type": query.split()[0],
-                        "context": query
-                    },
-                    "search_terms": {
-                        "primary": ["bird eating seeds", "bird catching insects", "bird pecking food"],
-                        "secondary": ["bird feeding nature", "bird foraging", "bird hunting"],
-                        "context": ["birds habitat", "bird natural", "birds wildlife"]
-                    }
-                }
-            
-            # Analizi logla
-            print_success(f"Konu Analizi:")
-            print_success(f"- Ana Konu: {search_data['analysis']['main_subject']}")
-            print_success(f"- Konu Tipi: {search_data['analysis']['subject_type']}")
-            print_success(f"- Bağlam: {search_data['analysis']['context']}")
-            
-            # Arama terimlerini logla
-            print_success(f"\nBirincil Terimler: {', '.join(search_data['search_terms']['primary'])}")
-            print_success(f"İkincil Terimler: {', '.join(search_data['search_terms']['secondary'])}")
-            print_success(f"Bağlam Terimleri: {', '.join(search_data['search_terms']['context'])}")
-            
-            return search_data
+                    search_term = f"{main_subject} {term}"
+            specific_terms.append(search_term)
+        return main_subject, search_data['search_terms']['primary'], specific_terms
+
+    def _iter_term_results(self, search_terms: List[str], min_duration: int, max_duration: int, fanout: int,
+                           target_size: Optional[Tuple[int, int]] = None) -> Iterator[List[dict]]:
+        """
+        Arama terimlerinin sonuçlarını öncelik sırasıyla üret
+        
+        fanout > 1 ise en fazla fanout kadar istek aynı anda yapılır. Üretici kapatıldığında
+        (kota dolduğunda) henüz başlamamış istekler iptal edilir, süren istekler beklenmez.
+        """
+        if fanout <= 1:
+            for term in search_terms:
+                yield self._search_pexels_videos(query=term, min_duration=min_duration, max_duration=max_duration, target_size=target_size)
+            return
             
-        except Exception as e:
-            print_warning(f"Arama terimi oluşturma hatası: {str(e)}")
-            return {
-                "analysis": {
-                    "main_subject": query,
-                    "subject_type": query.split()[0],
-                    "context": query
-                },
-                "search_terms": {
-                    "primary": ["bird eating"],
-                    "secondary": ["bird nature"],
-                    "context": ["bird wildlife"]
-                }
-            }
+        executor = ThreadPoolExecutor(max_workers=fanout, thread_name_prefix="pexels_search")
+        futures = [
+            executor.submit(self._search_pexels_videos, term, min_duration, max_duration, target_size=target_size)
+            for term in search_terms
+        ]
+        try:
+            for future in futures:
+                yield future.result()
+        finally:
+            for future in futures:
+                future.cancel()
+            executor.shutdown(wait=False)
 
-    def search_videos(self, query: str, min_duration: int = 5, max_duration: int = 15, per_page: int = 10) -> List[dict]:
-        """Pexels'te video ara"""
+    def search_videos(self, query: str, min_duration: int = 5, max_duration: int = 15, per_page: int = 10,
+                      fanout: Optional[int] = None, target_size: Optional[Tuple[int, int]] = None,
+                      plan: Optional[Dict] = None) -> List[dict]:
+        """
+        Pexels'te video ara
+        
+        Args:
+            query (str): Arama sorgusu (veya "query" alanı olan sahne dict'i)
+            min_duration (int): Minimum video süresi
+            max_duration (int): Maksimum video süresi
+            per_page (int): Sayfa başına sonuç
+            fanout (int, optional): Aynı anda yapılacak terim araması sayısı (1 = sıralı).
+                None ise PEXELS_SEARCH_FANOUT kullanılır.
+            target_size (Tuple[int, int], optional): Çıktı boyutu; sürüm seçimi buna göre yapılır
+            plan (Dict, optional): SearchPlanner.scene_plan() sonucu; verilirse sorgu için ayrıca
+                GPT analizi yapılmaz, planın terimleri kullanılır
+            
+        Returns:
+            List[dict]: En fazla 6 aday; sıralama açıksa en iyi aday ilk sırada, diğerleri yedek
+        """
         try:
             videos = []
             used_video_ids = set()  # Kullanılan video ID'lerini takip et
@@ -176,197 +323,306 @@ Yanıtı JSON formatında ver:
             if isinstance(query, dict):
                 query = query.get('query', '')
             
-            # Ana konuyu belirle
-            search_data = self._get_english_search_term(query)
-            main_subject = search_data['analysis']['main_subject']
-            subject_type = search_data['analysis']['subject_type']
-            
-            # Yedek arama terimleri
-            backup_terms = [
-                "cooking food",
-                "kitchen cooking",
-                "food preparation",
-                "cooking ingredients",
-                "food serving",
-                "kitchen preparation"
-            ]
+            if plan:
+                # İş planındaki terimler zaten ana konuyu içeren İngilizce ifadelerdir
+                main_subject = plan['main_subject']
+                primary_terms = plan['terms']
+                specific_terms = list(dict.fromkeys(plan['terms'] + plan.get('backup_terms', [])))
+            else:
+                main_subject, primary_terms, specific_terms = self._analyze_query(query)
             
-            # Arama terimlerini hazırla
-            search_terms = []
-            # Birincil terimleri ekle
-            search_terms.extend(search_data['search_terms']['primary'][:2])
-            # İkincil terimleri ekle
-            search_terms.extend(search_data['search_terms']['secondary'][:2])
-            # Bağlam terimlerini ekle
-            search_terms.extend(search_data['search_terms']['context'][:2])
-            # Yedek terimleri ekle
-            search_terms.extend(backup_terms)
+            # Sıralama açıksa daha geniş bir aday havuzu topla
+            pool_size = max(RANK_POOL_SIZE, 6) if self.ranker else 6
             
-            # Her terim için arama yap
-            for term in search_terms:
-                if len(videos) >= 6:  # 6 video bulduysak dur
-                    break
-                    
-                print_info(f"Arama: {term}")
-                
-                # Ana konuyu içeren spesifik arama terimi oluştur
-                if subject_type == 'food':
-                    # Yemek konuları için sadece tek kelime yeterli
-                    search_term = term
-                else:
-                    # Diğer konular için ana konuyu ekle (örn: "Istanbul bridge")
-                    # Ana konu tek kelime ise ve terim de aynıysa tekrar ekleme
-                    if ' ' not in main_subject and term.lower() == main_subject.lower():
-                        search_term = term
-                    else:
-                        search_term = f"{main_subject} {term}"
-                
-                print_info(f"Spesifik arama: {search_term}")
-                
-                # Arama yap
-                results = self._search_pexels_videos(
-                    query=search_term,
-                    min_duration=min_duration,
-                    max_duration=max_duration
-                )
-                
-                # Sonuçları filtrele ve ekle
-                for video in results:
-                    if video['id'] not in used_video_ids:
-                        used_video_ids.add(video['id'])
-                        # Her videodan 10 saniye alacağız
-                        video['target_duration'] = 10
-                        videos.append(video)
-                        if len(videos) >= 6:
-                            break
-                
-                if len(videos) > 0 and videos[-1]['id'] not in used_video_ids:
-                    break  # Bu terim için video bulduk
+            # Sonuçları öncelik sırasıyla birleştir, kota dolunca kalan istekleri iptal et
+            fanout = SEARCH_FANOUT if fanout is None else fanout
+            with closing(self._iter_term_results(specific_terms, min_duration, max_duration, fanout, target_size)) as term_results:
+                for results in term_results:
+                    # Sonuçları filtrele ve ekle
+                    for video in results:
+                        if video['id'] not in used_video_ids:
+                            used_video_ids.add(video['id'])
+                            # Her videodan 10 saniye alacağız
+                            video['target_duration'] = 10
+                            videos.append(video)
+                            if len(videos) >= pool_size:
+                                break
+                                
+                    if len(videos) >= pool_size:  # Havuz dolduysa dur
+                        break
             
             # En az 1 video olsun
             if not videos:
                 raise Exception(f"Hiç video bulunamadı!")
                 
+            # En iyi aday önce gelecek şekilde sırala; diğerleri yedek olarak kalır
+            if self.ranker:
+                rank_query = ' '.join([main_subject] + primary_terms[:2])
+                videos = self.ranker.rank(rank_query, videos)
+                
             return videos[:6]  # En fazla 6 video döndür
             
         except Exception as e:
             print_error(f"Video arama hatası: {str(e)}")
             raise
 
-    def _check_subject_relevance(self, video: Dict, main_subject: str) -> bool:
-        """Video içeriğinin ana özneyle alakalı olup olmadığını kontrol et"""
-        try:
-            # Video başlığı, açıklaması ve etiketlerinde ana özneyi ara
-            content = f"{video.get('title', '')} {video.get('description', '')} {' '.join(video.get('tags', []))}"
-            content = content.lower()
-            
-            # Ana özneyi ve ilgili terimleri kontrol et
-            subject_terms = {
-                'bird': ['bird', 'birds', 'avian', 'fowl', 'feather'],
-                'lion': ['lion', 'lions', 'feline', 'predator', 'cat'],
-                'elephant': ['elephant', 'elephants', 'pachyderm', 'trunk'],
-                'fish': ['fish', 'fishes', 'marine', 'aquatic', 'underwater'],
-                # Diğer yaygın özneler için benzer eşleşmeler eklenebilir
-            }
-            
-            # Ana özneyi normalize et
-            main_subject = main_subject.lower()
-            
-            # Direkt eşleşme kontrolü
-            if main_subject in content:
-                return True
-                
-            # İlgili terimler kontrolü
-            for subject, terms in subject_terms.items():
-                if subject in main_subject:
-                    return any(term in content for term in terms)
-            
-            return False
-            
-        except Exception as e:
-            print_warning(f"Özne kontrolü hatası: {str(e)}")
-            return True  # Hata durumunda videoyu eleme
-
-    def _process_video_results(self, videos: List[Dict], search_term: str, min_duration: int, max_duration: int) -> List[Dict]:
-        """Video sonuçlarını işle ve filtrele"""
-        processed_videos = []
-        for video in videos:
-            duration = video['duration']
-            if duration < min_duration or duration > max_duration:
-                continue
-                
-            video['search_term'] = search_term
-            processed_videos.append(video)
-            
-        return processed_videos
-
-    def download_video(self, video: Dict, output_path: str, chunk_size: int = 8192) -> Optional[str]:
+    def download_video(self, video: Dict, output_path: str, chunk_size: int = 65536,
+                       max_seconds: Optional[float] = None) -> Optional[str]:
         """
         Videoyu indir
         
+        Klip deposu açıksa aynı Pexels klibi (id + rendition) projeler arasında bir kez indirilir
+        ve proje klasörüne bağlanır. max_seconds verilirse ve klip daha uzunsa yalnızca ilk
+        max_seconds saniye FFmpeg ile uzak dosyadan kopyalanır (kısmi indirme). Seçilen sürüm
+        indirilemezse (bağlantı hatası, uzunluk doğrulaması) yedek sürümler ('alternatives')
+        tercih sırasıyla denenir.
+        
         Args:
             video (Dict): Video bilgileri
             output_path (str): Çıktı dosyası yolu
             chunk_size (int): İndirme parça boyutu
+            max_seconds (float, optional): Zaman çizelgesinde kullanılacak azami süre
             
         Returns:
             Optional[str]: İndirilen dosyanın yolu veya None
         """
+        path = self._download_rendition(video, output_path, chunk_size, max_seconds)
+        for alternative in video.get('alternatives') or []:
+            if path:
+                break
+            print_warning(f"Video {video.get('id')} {ClipStore.rendition_key(video)} sürümü indirilemedi, "
+                          f"yedek sürüm deneniyor: {ClipStore.rendition_key(alternative)}")
+            fallback = {**video, **alternative, 'alternatives': []}
+            path = self._download_rendition(fallback, output_path, chunk_size, max_seconds)
+        return path
+        
+    def _download_rendition(self, video: Dict, output_path: str, chunk_size: int,
+                            max_seconds: Optional[float]) -> Optional[str]:
+        """
+        Videonun seçili sürümünü (depo üzerinden) indir
+        
+        Kısmi klip depoya "{rendition}@{span}s" anahtarıyla ve gerçek süresiyle (span) yazılır.
+        Kısmi indirme başarısız olursa tam klip indirilir ve tam sürüm anahtarıyla depolanır.
+        """
+        span = self._partial_span(video, max_seconds)
+        download_full = lambda path: self._download_file(video, path, chunk_size)
+        download_partial = lambda path: self._download_partial(video, path, span)
+            
+        if self.clip_store and 'id' in video:
+            try:
+                rendition = ClipStore.rendition_key(video)
+                if span:
+                    # Depoda tam klip varsa kısmi indirmeye gerek yok
+                    stored = self.clip_store.lookup(video['id'], rendition)
+                    if stored:
+                        print_success(f"Klip depodan alındı: {video['id']} (tam klip)")
+                        return self.clip_store.link_into(stored, output_path)
+                    # Kısmi klip indekste gerçek süresiyle tutulur
+                    path = self.clip_store.fetch({**video, 'duration': span}, output_path, download_partial,
+                                                 f"{rendition}@{span}s")
+                    if path:
+                        return path
+                # Tam klip (kısmi indirme başarısız olsa da) tam sürüm anahtarıyla depolanır
+                return self.clip_store.fetch(video, output_path, download_full, rendition)
+            except (OSError, sqlite3.Error) as e:
+                print_warning(f"Klip deposu kullanılamadı, doğrudan indiriliyor: {str(e)}")
+        if span:
+            path = download_partial(output_path)
+            if path:
+                return path
+        return download_full(output_path)
+        
+    @staticmethod
+    def _partial_span(video: Dict, max_seconds: Optional[float]) -> Optional[int]:
+        """Kısmi indirme yapılacaksa indirilecek süreyi (tam saniye) döndür"""
+        if not PARTIAL_FETCH_ENABLED or not FFMPEG_PATH or not max_seconds or max_seconds <= 0:
+            return None
+        # Depo anahtarlarının tekrar kullanılabilmesi için yukarı yuvarla
+        span = math.ceil(max_seconds * PARTIAL_FETCH_HEADROOM + PARTIAL_FETCH_MARGIN)
+        if video.get('duration') and span >= video['duration']:
+            return None
+        return span
+        
+    def _download_partial(self, video: Dict, output_path: str, seconds: int) -> Optional[str]:
+        """
+        Uzak klibin yalnızca ilk saniyelerini yerel dosyaya kopyala
+        
+        FFmpeg girişte -t ile sınırlandırıldığı için uzak dosyadan (HTTP range istekleriyle)
+        yalnızca gereken kısım okunur; yeniden kodlama yapılmaz.
+        """
+        part_path = output_path + PART_SUFFIX
         try:
-            # Klasörü oluştur
-            os.makedirs(os.path.dirname(output_path), exist_ok=True)
+            os.makedirs(os.path.dirname(os.path.abspath(output_path)), exist_ok=True)
+            cmd = [
+                FFMPEG_PATH,
+                '-y',
+                '-v', 'error',
+                '-rw_timeout', '30000000',
+                '-t', str(seconds),
+                '-i', video["download_url"],
+                '-map', '0:v:0',
+                '-c', 'copy',
+                '-movflags', '+faststart',
+                '-f', 'mp4',
+                part_path
+            ]
+            result = subprocess.run(cmd, capture_output=True, text=True, encoding='utf-8', errors='replace', timeout=120)
+            if result.returncode != 0 or not os.path.exists(part_path) or os.path.getsize(part_path) == 0:
+                print_warning(f"Kısmi indirme başarısız, tam klip indirilecek: {result.stderr.strip()[-200:]}")
+                if os.path.exists(part_path):
+                    os.remove(part_path)
+                return None
+                
+            # FFmpeg başarıyla bitmeden hedef dosya oluşmaz
+            os.replace(part_path, output_path)
+            fraction = seconds / video['duration'] if video.get('duration') else 1.0
+            self._record_transfer(video, output_path, fraction)
+            print_success(f"Video kısmi indirildi (ilk {seconds} sn): {output_path}")
+            return output_path
             
-            # Videoyu indir
-            response = requests.get(video["download_url"], stream=True, timeout=30)
-            response.raise_for_status()
+        except (OSError, subprocess.TimeoutExpired) as e:
+            print_warning(f"Kısmi indirme başarısız, tam klip indirilecek: {str(e)}")
+            if os.path.exists(part_path):
+                os.remove(part_path)
+            return None
             
-            # Toplam boyutu al
-            total_size = int(response.headers.get('content-length', 0))
+    def _download_file(self, video: Dict, output_path: str, chunk_size: int = 65536) -> Optional[str]:
+        """
+        Videoyu verilen yola indir
+        
+        Boyutu bilinen dosyalar paralel parçalarla indirilir; yarıda kalan indirme .part dosyasında
+        bekler ve bir sonraki denemede kaldığı yerden devam eder. Hedef dosya yalnızca uzunluğu
+        doğrulanınca oluşur.
+        """
+        try:
+            downloader = SegmentedDownloader(self.http, chunk_size=chunk_size)
+            result = downloader.download(video["download_url"], output_path, progress=self._print_progress)
             
-            # Dosyaya kaydet
-            with open(output_path, 'wb') as f:
-                if total_size == 0:
-                    # Boyut bilinmiyorsa direkt kaydet
-                    for chunk in response.iter_content(chunk_size=chunk_size):
-                        if chunk:
-                            f.write(chunk)
-                else:
-                    # İlerleme göster
-                    downloaded = 0
-                    for chunk in response.iter_content(chunk_size=chunk_size):
-                        if chunk:
-                            f.write(chunk)
-                            downloaded += len(chunk)
-                            progress = (downloaded / total_size) * 100
-                            print(f"\rİndiriliyor: %{progress:.1f}", end="")
-                    print()  # Yeni satır
-                        
+            self._record_transfer(video, output_path)
             print_success(f"Video indirildi: {output_path}")
+            SegmentedDownloader.log_result(result)
             return output_path
             
-        except requests.exceptions.RequestException as e:
+        except (requests.exceptions.RequestException, DownloadError) as e:
             print_error(f"Video indirme hatası: {str(e)}")
         except Exception as e:
             print_error(f"Beklenmeyen hata: {str(e)}")
-            return None
+        return None
+        
+    @staticmethod
+    def _print_progress(downloaded: int, total: Optional[int]) -> None:
+        """İndirme ilerlemesini göster"""
+        if total:
+            print(f"\rİndiriliyor: %{(downloaded / total) * 100:.1f}", end="" if downloaded < total else "\n")
+
+    @staticmethod
+    def _select_rendition(video_files: List[Dict], target_size: Optional[Tuple[int, int]] = None) -> Tuple[Optional[Dict], List[Dict], Optional[Dict]]:
+        """
+        Video dosyaları arasından indirilecek sürümü seç
+        
+        Yalnızca HD (720p ve üzeri) sürümler değerlendirilir. Hedef boyut verilirse
+        (scale=increase + crop ile) hedefi büyütmeden dolduran en küçük sürüm seçilir;
+        hiçbiri dolduramıyorsa en az büyütme gerektiren sürüm seçilir.
+        
+        Args:
+            video_files (List[Dict]): Pexels video_files listesi
+            target_size (Tuple[int, int], optional): Çıktı boyutu (genişlik, yükseklik)
+            
+        Returns:
+            Tuple[Optional[Dict], List[Dict], Optional[Dict]]: (Seçilen sürüm, Yedek sürümler, Eski kuralın seçeceği en yüksek sürüm)
+        """
+        renditions = []
+        for vf in video_files:
+            width = vf.get('width') or 0
+            height = vf.get('height') or 0
+            # HD kalitede video seç (720p ve üzeri)
+            if vf.get('link') and width > 0 and height > 0 and (width >= 1280 or height >= 720):
+                renditions.append({
+                    'width': width,
+                    'height': height,
+                    'download_url': vf['link'],
+                    'file_size': vf.get('size')
+                })
+                
+        if not renditions:
+            return None, [], None
+            
+        # Eski davranış: en yüksek sürüm
+        baseline = max(renditions, key=lambda r: r['height'])
+        
+        if target_size:
+            target_width, target_height = target_size
+            
+            def preference(rendition: Dict) -> Tuple:
+                # Hedefi doldurmak için gereken ölçek (<= 1 ise büyütme yok)
+                scale = max(target_width / rendition['width'], target_height / rendition['height'])
+                pixels = rendition['width'] * rendition['height']
+                return (0, pixels) if scale <= 1 else (1, scale, pixels)
+                
+            ordered = sorted(renditions, key=preference)
+        else:
+            ordered = sorted(renditions, key=lambda r: -r['height'])
+            
+        return ordered[0], ordered[1:], baseline
 
-    def _search_pexels_videos(self, query: str, min_duration: int = 5, max_duration: int = 15) -> List[dict]:
+    def _record_transfer(self, video: Dict, output_path: str, fraction: float = 1.0) -> None:
+        """
+        Seçilen sürüm/kısmi indirme ile en yüksek sürümün tamamı arasındaki indirme farkını kaydet
+        
+        Args:
+            fraction (float): İndirilen kısmın klip süresine oranı (tam indirmede 1)
+        """
+        try:
+            downloaded = os.path.getsize(output_path)
+        except OSError:
+            return
+            
+        baseline = video.get('baseline') or {}
+        baseline_bytes = baseline.get('file_size')
+        if not baseline_bytes:
+            # Pexels boyut bildirmediyse süre ve piksel oranından tahmin et
+            full_bytes = downloaded / fraction if fraction > 0 else downloaded
+            pixels = (video.get('width') or 0) * (video.get('height') or 0)
+            baseline_pixels = (baseline.get('width') or 0) * (baseline.get('height') or 0)
+            baseline_bytes = full_bytes * baseline_pixels / pixels if pixels and baseline_pixels else full_bytes
+            
+        with self._stats_lock:
+            self.transfer_stats['downloaded_bytes'] += downloaded
+            self.transfer_stats['baseline_bytes'] += baseline_bytes
+            
+    def log_transfer_stats(self) -> None:
+        """Sürüm seçimi ve kısmi indirmeyle kazanılan indirme miktarını yazdır"""
+        with self._stats_lock:
+            downloaded = self.transfer_stats['downloaded_bytes']
+            saved = max(self.transfer_stats['baseline_bytes'] - downloaded, 0)
+        if downloaded:
+            print_info(f"İndirilen: {downloaded / 1024 ** 2:.1f} MB, sürüm seçimi ve kısmi indirmeyle tasarruf: ~{saved / 1024 ** 2:.1f} MB")
+
+    def _search_pexels_videos(self, query: str, min_duration: int = 5, max_duration: int = 15, per_page: int = 10,
+                              target_size: Optional[Tuple[int, int]] = None) -> List[dict]:
         """Pexels API ile video ara"""
         try:
-            # API'ye istek at
-            response = requests.get(
-                self.api_url,
-                headers=self.headers,
-                params={
-                    "query": query,
-                    "per_page": 10,
-                    "min_duration": min_duration,
-                    "max_duration": max_duration
-                },
-                timeout=10
-            )
-            response.raise_for_status()
-            data = response.json()
+            print_info(f"Spesifik arama: {query}")
+            
+            # Önce önbelleğe bak
+            data = self.search_cache.get(query, min_duration, max_duration, per_page)
+            if data is None:
+                # API'ye istek at (hız limitine takılırsa istek kuyrukta bekler)
+                response = self.pexels.get(
+                    self.api_url,
+                    params={
+                        "query": query,
+                        "per_page": per_page,
+                        "min_duration": min_duration,
+                        "max_duration": max_duration
+                    },
+                    timeout=10
+                )
+                response.raise_for_status()
+                data = response.json()
+                self.search_cache.set(query, min_duration, max_duration, per_page, data)
+            else:
+                print_info(f"Önbellekten: {query}")
             
             if data and 'videos' in data and data['videos']:
                 # Videoları filtrele
@@ -381,32 +637,33 @@ Yanıtı JSON formatında ver:
                     if not video.get('video_files'):
                         continue
                         
-                    # Video dosyalarını kaliteye göre sırala
-                    best_quality = None
-                    for vf in video['video_files']:
-                        width = vf.get('width', 0)
-                        height = vf.get('height', 0)
-                        
-                        # HD kalitede video seç (720p ve üzeri)
-                        if width >= 1280 or height >= 720:
-                            if not best_quality or (vf.get('height', 0) > best_quality.get('height', 0)):
-                                best_quality = vf
-                                best_quality['quality'] = 'hd'
-                    
-                    if best_quality:
+                    # Hedef çözünürlüğe göre en uygun sürümü seç
+                    best, alternatives, baseline = self._select_rendition(video['video_files'], target_size)
+                    if best:
                         filtered_videos.append({
                             'id': video['id'],
                             'duration': duration,
-                            'width': best_quality.get('width', 0),
-                            'height': best_quality.get('height', 0),
-                            'download_url': best_quality['link'],
-                            'quality': best_quality.get('quality', 'sd')
+                            'width': best['width'],
+                            'height': best['height'],
+                            'download_url': best['download_url'],
+                            'file_size': best['file_size'],
+                            'quality': 'hd',
+                            'alternatives': alternatives,
+                            'baseline': baseline,
+                            # Sözcüksel ön sıralama ve alakalılık analizi için
+                            'url': video.get('url', ''),
+                            'user': video.get('user') or {},
+                            'tags': video.get('tags') or []
                         })
                 
                 return filtered_videos
             
             return []
             
+        except PexelsRateLimitError as e:
+            # Sessizce [] dönüp yedek terimlere (yanlış görüntülere) düşmek yerine hatayı yükselt
+            print_error(f"Pexels hız limiti: {str(e)}")
+            raise
         except Exception as e:
             print_error(f"Pexels API hatası: {str(e)}")
             return []
@@ -419,7 +676,7 @@ if __name__ == "__main__":
         """API'den gelen ham video verisini incele"""
         try:
             # API'ye direkt istek at
-            response = requests.get(
+            response = service.http.get(
                 service.api_url,
                 headers=service.headers,
                 params={"query": query, "per_page": 1},
@@ -0,0 +1,12 @@
+import os
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+# config .env olmadan da yüklenebilsin; önbellek, log ve çıktı dizinleri (göreli yollar)
+# depo yerine geçici dizinde oluşsun
+os.environ.setdefault("OPENAI_API_KEY", "test-key")
+os.environ.setdefault("PEXELS_API_KEY", "test-key")
+os.chdir(tempfile.mkdtemp(prefix="yoto-tests-"))
@@ -0,0 +1,95 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from modules import candidate_ranker
+from modules.candidate_ranker import CandidateRanker
+from modules.lexical_ranker import LexicalRanker
+from modules.video_analyzer import VideoAnalyzer
+
+
+def _video(video_id, title, width=1920, height=1080):
+    return {
+        "id": video_id,
+        "url": f"https://www.pexels.com/video/{title.replace(' ', '-')}-{video_id}/",
+        "width": width,
+        "height": height,
+        "duration": 15,
+        "quality": "hd"
+    }
+
+
+def _analyzer(score_batch):
+    analyzer = VideoAnalyzer.__new__(VideoAnalyzer)
+    analyzer.lexical_ranker = LexicalRanker()
+    analyzer.score_batch = score_batch
+    return analyzer
+
+
+def test_only_survivors_are_scored_and_ranked_first():
+    videos = [
+        _video(1, "city traffic at night"),
+        _video(2, "bird on a branch"),
+        _video(3, "bird flying over the lake"),
+        _video(4, "empty road")
+    ]
+    scored = []
+
+    def score_batch(query, candidates):
+        scored.extend(video["id"] for video in candidates)
+        # GPT, sözcüksel sıralamada ikinci olanı daha alakalı bulur
+        return [(0.9 if video["id"] == 2 else 0.5, "test") for video in candidates]
+
+    ranked = CandidateRanker(_analyzer(score_batch), survivors=2, timeout=5).rank("bird", videos)
+
+    assert sorted(scored) == [2, 3]
+    assert [video["id"] for video in ranked[:2]] == [2, 3]
+    assert [video["rank"]["stage"] for video in ranked] == ["relevance", "relevance", "cheap", "cheap"]
+    assert ranked[0]["rank"]["relevance"] == 0.9
+    assert {video["id"] for video in ranked[2:]} == {1, 4}
+
+
+def test_relevance_timeout_keeps_the_cheap_order():
+    release = threading.Event()
+    videos = [_video(1, "empty road"), _video(2, "bird flying"), _video(3, "bird on a branch")]
+
+    def slow_score_batch(query, candidates):
+        release.wait(timeout=5)
+        return [(1.0, "late") for _ in candidates]
+
+    try:
+        ranked = CandidateRanker(_analyzer(slow_score_batch), survivors=2, timeout=0.05).rank("bird", videos)
+    finally:
+        release.set()
+
+    assert all(video["rank"]["stage"] == "cheap" for video in ranked)
+    assert all(video["rank"]["relevance"] is None for video in ranked)
+    scores = [video["rank"]["score"] for video in ranked]
+    assert scores == sorted(scores, reverse=True)
+    assert ranked[-1]["id"] == 1
+
+
+def test_time_waiting_for_a_busy_pool_does_not_count_against_the_budget(monkeypatch):
+    executor = ThreadPoolExecutor(max_workers=1)
+    monkeypatch.setattr(candidate_ranker, "_relevance_executor", executor)
+    # Havuzu başka bir sahnenin skorlaması bütçeden uzun süre meşgul eder
+    executor.submit(time.sleep, 0.3)
+    videos = [_video(1, "empty road"), _video(2, "bird flying")]
+
+    try:
+        ranked = CandidateRanker(_analyzer(lambda query, candidates: [(0.9, "test") for _ in candidates]),
+                                 survivors=1, timeout=0.2).rank("bird", videos)
+    finally:
+        executor.shutdown(wait=True)
+
+    assert ranked[0]["id"] == 2
+    assert ranked[0]["rank"]["stage"] == "relevance"
+
+
+def test_empty_pool_is_not_scored():
+    def score_batch(query, candidates):
+        pytest.fail("boş havuz skorlanmamalı")
+
+    assert CandidateRanker(_analyzer(score_batch)).rank("bird", []) == []
@@ -0,0 +1,83 @@
+import pytest
+
+from modules.clip_selector import fetch_selection, select_clips
+
+
+def _video(video_id, duration, score):
+    return {"id": video_id, "duration": duration, "rank": {"score": score}}
+
+
+def test_fewest_clips_that_cover_the_target_are_selected():
+    scenes = [
+        [_video(1, 6, 0.9)],
+        [_video(2, 20, 0.8)],
+        [_video(3, 6, 0.9)],
+        [_video(4, 6, 0.9)]
+    ]
+
+    selection = select_clips(scenes, 18)
+
+    assert [item["video"]["id"] for item in selection] == [2]
+    assert selection[0]["seconds"] == pytest.approx(18)
+
+
+def test_higher_score_wins_between_equally_small_selections():
+    scenes = [
+        [_video(1, 12, 0.6), _video(2, 12, 0.7)],
+        [_video(3, 12, 0.9)]
+    ]
+
+    selection = select_clips(scenes, 20)
+
+    assert [item["video"]["id"] for item in selection] == [2, 3]
+    assert sum(item["seconds"] for item in selection) == pytest.approx(20)
+    assert all(item["seconds"] <= item["video"]["duration"] for item in selection)
+
+
+def test_scene_order_is_kept_and_duplicates_stay_with_the_first_scene():
+    shared = _video(1, 10, 0.9)
+    scenes = [
+        [shared],
+        [dict(shared), _video(2, 10, 0.85)],
+        [_video(3, 10, 0.9)]
+    ]
+
+    selection = select_clips(scenes, 30)
+
+    assert [(item["scene"], item["video"]["id"]) for item in selection] == [(0, 1), (1, 2), (2, 3)]
+
+
+def test_short_and_low_scoring_candidates_are_not_used():
+    scenes = [[_video(1, 2, 0.9), _video(2, 30, 0.5), _video(3, 10, 0.95)]]
+
+    selection = select_clips(scenes, 8, min_seconds=3)
+
+    # 1 çok kısa, 2 en iyi adaya göre tolerans dışında
+    assert [item["video"]["id"] for item in selection] == [3]
+
+
+def test_uncoverable_target_uses_every_clip_in_full():
+    scenes = [[_video(1, 5, 0.9)], [_video(2, 4, 0.9)]]
+
+    selection = select_clips(scenes, 30)
+
+    assert [item["seconds"] for item in selection] == [5, 4]
+
+
+def test_failed_download_is_excluded_and_selection_retried():
+    scenes = [[_video(1, 20, 0.9), _video(2, 20, 0.85)]]
+    attempts = []
+
+    def download(video, seconds):
+        attempts.append(video["id"])
+        return None if video["id"] == 1 else f"video_{video['id']}.mp4"
+
+    selection = fetch_selection(scenes, 15, download)
+
+    assert attempts == [1, 2]
+    assert [(item["video"]["id"], item["path"]) for item in selection] == [(2, "video_2.mp4")]
+
+
+def test_fetch_selection_raises_when_nothing_can_be_downloaded():
+    with pytest.raises(Exception):
+        fetch_selection([[_video(1, 20, 0.9)]], 15, lambda video, seconds: None)
@@ -0,0 +1,39 @@
+import os
+
+from modules.clip_store import ClipStore
+
+
+def _writer(size):
+    def download(path):
+        with open(path, "wb") as f:
+            f.write(b"\0" * size)
+        return path
+    return download
+
+
+def _video(video_id):
+    return {"id": video_id, "width": 1080, "height": 1920, "duration": 10}
+
+
+def test_put_never_evicts_the_clip_it_just_stored(tmp_path):
+    store = ClipStore(str(tmp_path / "store"), max_bytes=150)
+    store.fetch(_video(1), str(tmp_path / "p1" / "a.mp4"), _writer(100))
+    src = _writer(200)(str(tmp_path / "big.mp4"))
+
+    stored = store.put(_video(2), "1080x1920", src)
+
+    assert os.path.exists(stored)
+    assert store.lookup(2, "1080x1920") == stored
+    assert store.lookup(1, "1080x1920") is None
+
+
+def test_clip_larger_than_budget_bypasses_the_store(tmp_path):
+    store = ClipStore(str(tmp_path / "store"), max_bytes=150)
+    store.fetch(_video(1), str(tmp_path / "p1" / "a.mp4"), _writer(100))
+
+    dest = store.fetch(_video(2), str(tmp_path / "p2" / "b.mp4"), _writer(500))
+
+    assert os.path.getsize(dest) == 500
+    assert store.lookup(2, "1080x1920") is None
+    # Büyük klip yüzünden depodaki diğer klipler silinmez
+    assert store.lookup(1, "1080x1920") is not None
@@ -0,0 +1,103 @@
+import json
+from types import SimpleNamespace
+
+from modules import content_generator
+from modules.content_generator import SceneFeed, generate_youtube_content
+
+
+def _chunk(text):
+    return SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=text))])
+
+
+class StreamingClient:
+    """Yanıtı küçük parçalar halinde akıtan sahte OpenAI istemcisi"""
+
+    def __init__(self, text, size=7):
+        self.text = text
+        self.size = size
+        self.requests = []
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self.create))
+
+    def create(self, stream=False, **request):
+        self.requests.append(request)
+        assert stream, "Eksik alan isteği beklenmiyordu"
+        return iter(_chunk(self.text[i:i + self.size]) for i in range(0, len(self.text), self.size))
+
+
+def _content(scenes):
+    return {
+        "search": {"main_subject": "cat", "subject_type": "animal", "shared_terms": ["cat"]},
+        "pexels_prompts": scenes,
+        "tts_text": "Kediler çok uyur.",
+        "subtitle_text": "Kediler çok uyur.",
+        "video_style": {},
+        "seo": {"title": "Kediler", "description": "Kediler hakkında", "tags": ["kedi"]},
+        "duration": 20
+    }
+
+
+def test_streamed_scenes_are_repaired_before_feed_closes(monkeypatch):
+    scenes = [
+        {"query": "cat", "description": "Uyuyan kedi", "duration": "five"},
+        {"query": "kitten", "description": "Oynayan yavru", "duration": 8}
+    ]
+    client = StreamingClient(json.dumps(_content(scenes), ensure_ascii=False))
+    monkeypatch.setattr(content_generator, "client", client)
+
+    closed = []
+    feed = SceneFeed()
+    original_close = feed.close
+    feed.close = lambda *args, **kwargs: (closed.append(args[0] if args else kwargs.get("scenes")),
+                                          original_close(*args, **kwargs))
+
+    content = generate_youtube_content("Kediler", 20, scene_feed=feed, use_cache=False)
+
+    assert content is not None
+    streamed = feed.wait(timeout=1)
+    # Kanal sahne listesi kapanır kapanmaz (tam yanıttan önce) ve onarılmış olarak kapanmalı
+    assert closed and closed[0] is streamed
+    assert [scene["duration"] for scene in streamed] == [10, 8]
+    assert all(int(scene["duration"]) > 0 for scene in streamed)
+    assert [scene["duration"] for scene in content["pexels_prompts"]] == [10, 8]
+    assert feed.fields["search"]["main_subject"] == "cat"
+    assert len(client.requests) == 1
+
+
+def test_streamed_scene_count_is_padded_like_final_repair(monkeypatch):
+    scenes = [{"query": "cat", "description": "Kedi", "duration": 0}]
+    client = StreamingClient(json.dumps(_content(scenes), ensure_ascii=False))
+    monkeypatch.setattr(content_generator, "client", client)
+
+    feed = SceneFeed()
+    content = generate_youtube_content("Kediler", 20, scene_feed=feed, use_cache=False)
+
+    streamed = feed.wait(timeout=1)
+    assert [scene["query"] for scene in streamed] == ["cat", "cat"]
+    assert [scene["duration"] for scene in streamed] == [10, 10]
+    assert streamed == content["pexels_prompts"]
+
+
+class RecordingClient:
+    """İstemleri kaydedip sabit bir JSON yanıtı döndüren sahte OpenAI istemcisi"""
+
+    def __init__(self, data):
+        self.data = data
+        self.prompts = []
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self.create))
+
+    def create(self, messages, **request):
+        self.prompts.append(messages[-1]["content"])
+        content = json.dumps(self.data, ensure_ascii=False)
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=content))])
+
+
+def test_numbers_as_words_rule_only_applies_to_narration(monkeypatch):
+    client = RecordingClient({"pexels_prompts": [], "tts_text": "Kediler on altı saat uyur."})
+    monkeypatch.setattr(content_generator, "client", client)
+    content = _content([{"query": "cat", "description": "Kedi", "duration": 10}])
+
+    content_generator._request_missing_fields("Kediler", content, ["pexels_prompts"], 2, 20, "tr", "tr", "")
+    content_generator._request_missing_fields("Kediler", content, ["tts_text", "seo"], 2, 20, "tr", "tr", "")
+
+    assert "yazı olarak yaz" not in client.prompts[0]
+    assert "tts_text içindeki sayıları rakam olarak değil, yazı olarak yaz" in client.prompts[1]
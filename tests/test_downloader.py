@@ -0,0 +1,148 @@
+import os
+import re
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+import requests
+
+from modules.downloader import SegmentedDownloader, PART_SUFFIX
+
+PAYLOAD = bytes(range(256)) * 64  # 16 KiB
+
+
+class RangeHandler(BaseHTTPRequestHandler):
+    """Range, If-Range ve ETag destekleyen; istenirse bağlantıyı yarıda kesen sahte sunucu"""
+
+    def do_GET(self):
+        server = self.server
+        server.requests.append({"range": self.headers.get("Range"), "if_range": self.headers.get("If-Range")})
+        data = server.payload
+        match = re.match(r"bytes=(\d+)-(\d+)", self.headers.get("Range") or "")
+        if_range = self.headers.get("If-Range")
+        if match and server.ranges and (if_range is None or if_range == server.etag):
+            start, end = int(match.group(1)), min(int(match.group(2)), len(data) - 1)
+            body = data[start:end + 1]
+            self.send_response(206)
+            self.send_header("Content-Range", f"bytes {start}-{end}/{len(data)}")
+        else:
+            body = data
+            self.send_response(200)
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("ETag", server.etag)
+        self.end_headers()
+        if server.fail_after is not None and len(body) > server.fail_after:
+            # Bildirilen uzunluktan az veri gönderip bağlantıyı kapat
+            self.wfile.write(body[:server.fail_after])
+            return
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), RangeHandler)
+    httpd.payload = PAYLOAD
+    httpd.etag = '"v1"'
+    httpd.ranges = True
+    httpd.fail_after = None
+    httpd.requests = []
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    httpd.url = f"http://127.0.0.1:{httpd.server_address[1]}/clip.mp4"
+    yield httpd
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def _downloader():
+    return SegmentedDownloader(requests.Session(), segments=4, min_segment_bytes=1024, chunk_size=512, timeout=5)
+
+
+def test_segmented_download_writes_verified_file(server, tmp_path):
+    output = str(tmp_path / "clip.mp4")
+
+    result = _downloader().download(server.url, output)
+
+    with open(output, "rb") as f:
+        assert f.read() == PAYLOAD
+    assert result["segments"] == 4
+    assert result["bytes"] == len(PAYLOAD)
+    ranges = {request["range"] for request in server.requests[1:]}
+    assert ranges == {"bytes=0-4095", "bytes=4096-8191", "bytes=8192-12287", "bytes=12288-16383"}
+    assert all(request["if_range"] == '"v1"' for request in server.requests[1:])
+    assert not os.path.exists(output + PART_SUFFIX)
+    assert not os.path.exists(output + PART_SUFFIX + ".json")
+
+
+def test_server_without_range_support_downloads_in_one_request(server, tmp_path):
+    server.ranges = False
+    output = str(tmp_path / "clip.mp4")
+
+    result = _downloader().download(server.url, output)
+
+    with open(output, "rb") as f:
+        assert f.read() == PAYLOAD
+    assert result["segments"] == 1
+    assert len(server.requests) == 1
+
+
+def test_changed_source_during_download_falls_back_to_single_request(server, tmp_path):
+    output = str(tmp_path / "clip.mp4")
+    downloader = _downloader()
+    probe = downloader._probe
+
+    def probe_then_change(url):
+        source, response = probe(url)
+        # Parça istekleri başlamadan kaynak değişir: If-Range eşleşmez, sunucu 200 döner
+        server.etag = '"v2"'
+        return source, response
+
+    downloader._probe = probe_then_change
+    result = downloader.download(server.url, output)
+
+    with open(output, "rb") as f:
+        assert f.read() == PAYLOAD
+    assert result["segments"] == 1
+
+
+def test_interrupted_download_resumes_from_part_file(server, tmp_path):
+    output = str(tmp_path / "clip.mp4")
+    server.fail_after = 1500
+
+    with pytest.raises((requests.exceptions.RequestException, OSError)):
+        _downloader().download(server.url, output)
+    assert not os.path.exists(output)
+    assert os.path.exists(output + PART_SUFFIX)
+    assert os.path.exists(output + PART_SUFFIX + ".json")
+
+    server.fail_after = None
+    server.requests.clear()
+    result = _downloader().download(server.url, output)
+
+    with open(output, "rb") as f:
+        assert f.read() == PAYLOAD
+    assert result["resumed"] > 0
+    assert result["transferred"] == len(PAYLOAD) - result["resumed"]
+    # Her parça kaldığı yerden istenir
+    starts = sorted(int(re.match(r"bytes=(\d+)-", request["range"]).group(1)) for request in server.requests[1:])
+    assert all(start % 4096 != 0 for start in starts)
+    assert not os.path.exists(output + PART_SUFFIX + ".json")
+
+
+def test_changed_source_discards_part_file(server, tmp_path):
+    output = str(tmp_path / "clip.mp4")
+    server.fail_after = 1500
+    with pytest.raises((requests.exceptions.RequestException, OSError)):
+        _downloader().download(server.url, output)
+
+    server.fail_after = None
+    server.etag = '"v2"'
+    server.payload = PAYLOAD[::-1]
+    result = _downloader().download(server.url, output)
+
+    with open(output, "rb") as f:
+        assert f.read() == PAYLOAD[::-1]
+    assert result["resumed"] == 0
@@ -0,0 +1,45 @@
+from modules.content_generator import SceneFeed
+from modules.job_brief import JobBrief
+
+
+class RecordingPlanner:
+    def __init__(self):
+        self.calls = 0
+
+    def plan(self, topic, scenes):
+        self.calls += 1
+        return {"main_subject": "planned", "subject_type": "other", "shared_terms": [],
+                "scenes": [{"query": scene["query"], "terms": ["planned"]} for scene in scenes]}
+
+
+SCENES = [
+    {"query": "cat", "description": "Uyuyan kedi", "duration": 10, "terms": ["sleeping cat", "cat nap"]},
+    {"query": "kitten", "description": "Oynayan yavru", "duration": 10}
+]
+
+
+def test_search_plan_is_read_from_streamed_brief():
+    feed = SceneFeed()
+    feed.close([dict(scene) for scene in SCENES],
+               fields={"search": {"main_subject": "cat", "subject_type": "animal", "shared_terms": ["cats"]}})
+    planner = RecordingPlanner()
+
+    brief = JobBrief.from_scene_feed("Kediler", feed)
+    plan = brief.search_plan(planner)
+
+    assert planner.calls == 0
+    assert plan["main_subject"] == "cat"
+    assert plan["shared_terms"] == ["cats"]
+    # Terimi gelmeyen sahne kendi sorgusuyla aranır
+    assert [scene["terms"] for scene in plan["scenes"]] == [["sleeping cat", "cat nap"], ["kitten"]]
+
+
+def test_search_plan_falls_back_to_planner_without_search_block():
+    planner = RecordingPlanner()
+    brief = JobBrief("Kediler", {"pexels_prompts": [dict(scene) for scene in SCENES]})
+
+    plan = brief.search_plan(planner)
+
+    assert planner.calls == 1
+    assert plan["main_subject"] == "planned"
+    assert JobBrief("Kediler", {"pexels_prompts": SCENES}).search_plan()["main_subject"] == "Kediler"
@@ -0,0 +1,76 @@
+import json
+import random
+
+import pytest
+
+from modules.json_stream import JSONArrayStream
+
+CONTENT = {
+    "search": {"main_subject": "cat", "shared_terms": ["cat", "kitten"]},
+    "pexels_prompts": [
+        {"query": "cat", "description": "Kedi \"uyuyor\" {süslü} [köşeli], virgül", "duration": 10},
+        {"query": "kitten", "description": "Yavru\\kedi\nsatır", "duration": 8, "terms": ["a", "b"]},
+        {"query": "yarn", "description": "Yün yumağı", "duration": 7}
+    ],
+    "tts_text": "Kediler çok uyur. \"pexels_prompts\": [] gibi bir metin de olabilir.",
+    "seo": {"title": "Kediler", "tags": ["kedi"]}
+}
+
+
+def _feed_in_chunks(parser, text, rng):
+    found = []
+    index = 0
+    while index < len(text):
+        size = rng.randint(1, 12)
+        found.extend(parser.feed(text[index:index + size]))
+        index += size
+    return found
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_items_and_fields_survive_any_chunking(seed):
+    rng = random.Random(seed)
+    text = json.dumps(CONTENT, ensure_ascii=False, indent=rng.choice([None, 2]))
+    parser = JSONArrayStream("pexels_prompts", fields=("search",))
+
+    found = _feed_in_chunks(parser, text, rng)
+
+    assert found == CONTENT["pexels_prompts"]
+    assert parser.items == CONTENT["pexels_prompts"]
+    assert parser.fields == {"search": CONTENT["search"]}
+    assert parser.done
+    assert parser.errors == 0
+
+
+def test_items_are_returned_as_soon_as_they_close():
+    parser = JSONArrayStream("pexels_prompts")
+    assert parser.feed('```json\n{"pexels_prompts": [{"query": "cat"}, {"query"') == [{"query": "cat"}]
+    assert not parser.done
+    assert parser.feed(': "dog"}]') == [{"query": "dog"}]
+    assert parser.done
+
+
+def test_fields_after_the_array_are_still_captured():
+    text = json.dumps({"pexels_prompts": [{"query": "cat"}], "tts_text": "x", "search": {"main_subject": "cat"}})
+    parser = JSONArrayStream("pexels_prompts", fields=("search",))
+
+    parser.feed(text)
+
+    assert parser.items == [{"query": "cat"}]
+    assert parser.fields["search"] == {"main_subject": "cat"}
+
+
+def test_nested_key_with_the_same_name_is_ignored():
+    text = json.dumps({"seo": {"pexels_prompts": ["wrong"]}, "pexels_prompts": [{"query": "cat"}]})
+    parser = JSONArrayStream("pexels_prompts")
+
+    assert parser.feed(text) == [{"query": "cat"}]
+
+
+def test_malformed_item_is_skipped_and_counted():
+    parser = JSONArrayStream("pexels_prompts")
+
+    found = parser.feed('{"pexels_prompts": [{"query": "cat"}, {"query": cat}, {"query": "dog"}]}')
+
+    assert found == [{"query": "cat"}, {"query": "dog"}]
+    assert parser.errors == 1
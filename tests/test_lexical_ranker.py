@@ -0,0 +1,33 @@
+from modules.lexical_ranker import LexicalRanker
+
+
+def _video(video_id, title):
+    return {"id": video_id, "url": f"https://www.pexels.com/video/{title.replace(' ', '-')}-{video_id}/"}
+
+
+def test_lexical_ranker_prefers_direct_matches_over_synonyms():
+    videos = [
+        _video(1, "city traffic at night"),
+        _video(2, "flock over the lake"),
+        _video(3, "bird flying over the lake")
+    ]
+    ranker = LexicalRanker()
+
+    assert ranker.top_k("bird", videos, k=0) == [2, 1, 0]
+    assert ranker.normalized_scores("bird", videos)[2] == 1.0
+    assert ranker.normalized_scores("bird", videos)[0] == 0.0
+
+
+def test_tags_outweigh_the_uploader_name():
+    videos = [
+        {"id": 1, "url": "", "user": {"name": "Bird Studio"}},
+        {"id": 2, "url": "", "tags": ["bird"]}
+    ]
+
+    assert LexicalRanker().top_k("bird", videos, k=1) == [1]
+
+
+def test_ties_keep_search_order():
+    videos = [_video(1, "empty road"), _video(2, "quiet street")]
+
+    assert LexicalRanker().top_k("bird", videos, k=0) == [0, 1]
@@ -0,0 +1,73 @@
+import os
+import threading
+import time
+
+import pytest
+
+from modules.memo_cache import PersistentMemo
+
+
+def test_waiters_are_released_when_the_computation_fails(tmp_path):
+    memo = PersistentMemo(str(tmp_path))
+    started = threading.Event()
+    release = threading.Event()
+
+    def compute():
+        started.set()
+        release.wait(timeout=5)
+        raise RuntimeError("API hatası")
+
+    errors = []
+
+    def waiter():
+        try:
+            memo.get_or_compute("key", lambda: "unused")
+        except RuntimeError as e:
+            errors.append(e)
+
+    owner = threading.Thread(target=lambda: pytest.raises(RuntimeError, memo.get_or_compute, "key", compute))
+    owner.start()
+    assert started.wait(timeout=5)
+    other = threading.Thread(target=waiter)
+    other.start()
+    time.sleep(0.05)
+    release.set()
+
+    owner.join(timeout=5)
+    other.join(timeout=5)
+    assert not other.is_alive()
+    assert len(errors) == 1
+    # Başarısız hesaplama kalıcı değildir; sonraki çağrı yeniden hesaplar
+    assert memo.get_or_compute("key", lambda: "value") == "value"
+
+
+def test_unserializable_value_is_returned_but_not_cached(tmp_path):
+    memo = PersistentMemo(str(tmp_path))
+    value = object()
+
+    assert memo.get_or_compute("key", lambda: value) is value
+    assert memo.get("key") is None
+    assert not os.path.exists(memo._path("key"))
+    assert [name for name in os.listdir(str(tmp_path)) if name.startswith(".tmp_")] == []
+
+
+def test_prune_removes_expired_and_least_recently_used_entries(tmp_path):
+    memo = PersistentMemo(str(tmp_path), ttl=60, max_bytes=10 ** 6)
+    for key in ("old", "a", "b"):
+        memo.set(key, "x" * 100)
+    past = time.time() - 120
+    os.utime(memo._path("old"), (past, past))
+
+    memo.prune()
+    assert not os.path.exists(memo._path("old"))
+
+    # "a" okunduğu için en son kullanılan; boyut sınırında önce "b" silinir
+    os.utime(memo._path("b"), (time.time() - 10, time.time() - 10))
+    os.utime(memo._path("a"), (time.time() - 20, time.time() - 20))
+    memo._memory.clear()
+    assert memo.get("a") == "x" * 100
+    memo.max_bytes = os.path.getsize(memo._path("a")) + 1
+    memo.prune()
+
+    assert os.path.exists(memo._path("a"))
+    assert not os.path.exists(memo._path("b"))
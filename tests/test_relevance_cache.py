@@ -0,0 +1,26 @@
+import time
+
+from modules.relevance_cache import RelevanceCache
+
+
+def test_scores_are_keyed_by_normalized_query_and_prompt_version(tmp_path):
+    cache = RelevanceCache(str(tmp_path / "relevance.sqlite3"))
+    cache.set_many("Cat  Sleeping", {1: (0.9, "uyuyan kedi"), 2: (0.4, "")}, "v1")
+
+    assert cache.get_many("cat sleeping", [1, 2, 3], "v1") == {1: (0.9, "uyuyan kedi"), 2: (0.4, "")}
+    assert cache.get("cat sleeping", 1, "v2") is None
+    assert cache.stats()["hits"] == 2
+    assert cache.stats()["misses"] == 2
+
+
+def test_expired_scores_are_ignored_and_purged(tmp_path):
+    cache = RelevanceCache(str(tmp_path / "relevance.sqlite3"), ttl=60)
+    cache.set("cat", 1, "v1", 0.9, "")
+    cache.set("cat", 2, "v1", 0.8, "")
+    with cache._db:
+        cache._db.execute("UPDATE relevance SET stored_at = ? WHERE video_id = 1", (time.time() - 120,))
+
+    assert cache.get_many("cat", [1, 2], "v1") == {2: (0.8, "")}
+    assert cache.purge() == 1
+    assert cache.invalidate(query="CAT") == 1
+    assert cache.get("cat", 2, "v1") is None
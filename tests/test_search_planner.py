@@ -0,0 +1,104 @@
+import json
+from types import SimpleNamespace
+
+import pytest
+
+from modules.memo_cache import PersistentMemo
+from modules.search_planner import SearchPlanner
+
+SCENES = [
+    {"query": "cat sleeping", "description": "Kedi uyuyor"},
+    {"query": "kitten playing", "description": "Yavru kedi oynuyor"},
+    "yarn ball"
+]
+
+
+class FakeClient:
+    """Sırayla verilen yanıtları (ya da hataları) döndüren sahte OpenAI istemcisi"""
+
+    def __init__(self, *responses):
+        self.responses = list(responses)
+        self.calls = 0
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self.create))
+
+    def create(self, **kwargs):
+        self.calls += 1
+        response = self.responses.pop(0)
+        if isinstance(response, Exception):
+            raise response
+        content = json.dumps(response)
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=content))])
+
+
+@pytest.fixture
+def planner_with(tmp_path):
+    def build(*responses):
+        planner = SearchPlanner(client=FakeClient(*responses))
+        planner.memo = PersistentMemo(str(tmp_path))
+        return planner
+    return build
+
+
+def test_scenes_are_mapped_by_index_and_missing_ones_use_their_query(planner_with):
+    planner = planner_with({
+        "main_subject": "cat",
+        "subject_type": "animal",
+        "shared_terms": ["cat", "Cat", " domestic  cat "],
+        "scenes": [
+            {"index": 2, "terms": ["kitten play", "kitten play", ""]},
+            {"index": 1, "terms": ["sleeping cat"]},
+            {"index": "3", "terms": ["wrong"]}
+        ]
+    })
+
+    plan = planner.plan("Kediler", SCENES)
+
+    assert plan["main_subject"] == "cat"
+    assert plan["shared_terms"] == ["cat", "domestic cat"]
+    assert plan["scenes"] == [
+        {"query": "cat sleeping", "terms": ["sleeping cat"]},
+        {"query": "kitten playing", "terms": ["kitten play"]},
+        {"query": "yarn ball", "terms": ["yarn ball"]}
+    ]
+    assert SearchPlanner.scene_plan(plan, 1) == {
+        "main_subject": "cat",
+        "subject_type": "animal",
+        "terms": ["kitten play"],
+        "backup_terms": ["cat", "domestic cat"]
+    }
+
+
+def test_failed_request_falls_back_without_caching(planner_with):
+    good = {"main_subject": "cat", "scenes": [{"index": 1, "terms": ["sleeping cat"]}]}
+    planner = planner_with(RuntimeError("API down"), good)
+
+    plan = planner.plan("Kediler", SCENES)
+
+    assert plan == SearchPlanner.fallback_plan("Kediler", SCENES)
+    assert [scene["terms"] for scene in plan["scenes"]] == [["cat sleeping"], ["kitten playing"], ["yarn ball"]]
+
+    # Yedek plan önbelleğe yazılmadığı için sonraki çağrı tekrar istek atar ve sonucu önbelleğe alır
+    assert planner.plan("Kediler", SCENES)["scenes"][0]["terms"] == ["sleeping cat"]
+    assert planner.plan("Kediler", SCENES)["main_subject"] == "cat"
+    assert planner.client.calls == 2
+
+
+def test_response_without_scene_terms_falls_back(planner_with):
+    planner = planner_with({"main_subject": "cat", "scenes": []})
+
+    assert planner.plan("Kediler", SCENES) == SearchPlanner.fallback_plan("Kediler", SCENES)
+
+
+def test_cached_plan_is_not_shared_with_callers(planner_with):
+    planner = planner_with({"main_subject": "cat", "scenes": [{"index": 1, "terms": ["sleeping cat"]}]})
+
+    planner.plan("Kediler", SCENES)["scenes"][0]["terms"].append("changed")
+
+    assert planner.plan("Kediler", SCENES)["scenes"][0]["terms"] == ["sleeping cat"]
+
+
+def test_empty_scene_list_needs_no_request(planner_with):
+    planner = planner_with()
+
+    assert planner.plan("Kediler", [])["scenes"] == []
+    assert planner.client.calls == 0
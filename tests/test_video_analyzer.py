@@ -0,0 +1,54 @@
+import random
+
+import numpy as np
+import pytest
+
+from modules.video_analyzer import VideoAnalyzer, build_quality_columns
+
+
+def _random_video(rng):
+    width, height = rng.choice([(1280, 720), (1920, 1080), (3840, 2160), (1080, 1920), (640, 360), (0, 0)])
+    video = {
+        'width': width,
+        'height': height,
+        'duration': rng.choice([rng.randint(3, 90), 0, None]),
+        'quality': rng.choice(['hd', 'sd', 'low', 'HD', None, 'uhd'])
+    }
+    if rng.random() < 0.5:
+        video['fps'] = rng.choice([24, 25, 29.97, 30, 50, 60, 0])
+    if rng.random() < 0.3:
+        video['views'] = rng.randint(0, 50000)
+    if rng.random() < 0.3:
+        video['likes'], video['dislikes'] = rng.randint(0, 500), rng.randint(0, 50)
+    return video
+
+
+@pytest.fixture
+def analyzer():
+    # Kalite skorlaması OpenAI istemcisi gerektirmez
+    return VideoAnalyzer.__new__(VideoAnalyzer)
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_vectorized_quality_scores_match_scalar(analyzer, seed):
+    rng = random.Random(seed)
+    videos = [_random_video(rng) for _ in range(200)]
+
+    scalar = [analyzer.calculate_quality_score(video) for video in videos]
+    vector, details = analyzer.calculate_quality_scores(videos)
+    columnar, _ = analyzer.calculate_quality_scores(build_quality_columns(videos))
+
+    np.testing.assert_array_equal(vector, [score for score, _ in scalar])
+    np.testing.assert_array_equal(vector, columnar)
+    for index, (_, scalar_details) in enumerate(scalar):
+        if 'error' in scalar_details:
+            # Skaler sürümün hata verdiği kayıtlar (eksik süre vb.) 0.5 alır
+            assert vector[index] == 0.5
+            continue
+        for key, value in scalar_details.items():
+            assert details[key][index] == pytest.approx(value, abs=1e-12)
+
+
+def test_vectorized_quality_scores_handle_empty_pool(analyzer):
+    scores, _ = analyzer.calculate_quality_scores([])
+    assert len(scores) == 0
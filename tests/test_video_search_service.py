@@ -0,0 +1,97 @@
+import os
+
+from modules import video_search_service
+from modules.clip_store import ClipStore
+from modules.video_search_service import VideoSearchService
+
+
+def _service(ok_urls, attempts):
+    service = VideoSearchService.__new__(VideoSearchService)
+    service.clip_store = None
+
+    def download_file(video, output_path, chunk_size=65536):
+        attempts.append(video["download_url"])
+        return output_path if video["download_url"] in ok_urls else None
+
+    service._download_file = download_file
+    return service
+
+
+VIDEO = {
+    "id": 7,
+    "duration": 12,
+    "width": 1080,
+    "height": 1920,
+    "download_url": "https://example.com/1080.mp4",
+    "file_size": 10,
+    "alternatives": [
+        {"width": 1440, "height": 2560, "download_url": "https://example.com/1440.mp4", "file_size": 20},
+        {"width": 2160, "height": 3840, "download_url": "https://example.com/2160.mp4", "file_size": 40}
+    ]
+}
+
+
+def test_download_falls_back_to_next_rendition():
+    attempts = []
+    service = _service({"https://example.com/1440.mp4"}, attempts)
+
+    assert service.download_video(dict(VIDEO), "clip.mp4") == "clip.mp4"
+    assert attempts == ["https://example.com/1080.mp4", "https://example.com/1440.mp4"]
+
+
+def test_download_stops_at_chosen_rendition_when_it_succeeds():
+    attempts = []
+    service = _service({"https://example.com/1080.mp4"}, attempts)
+
+    assert service.download_video(dict(VIDEO), "clip.mp4") == "clip.mp4"
+    assert attempts == ["https://example.com/1080.mp4"]
+
+
+def test_download_fails_when_every_rendition_fails():
+    attempts = []
+    service = _service(set(), attempts)
+
+    assert service.download_video(dict(VIDEO), "clip.mp4") is None
+    assert len(attempts) == 3
+
+
+def _partial_service(tmp_path, monkeypatch, partial_ok):
+    monkeypatch.setattr(video_search_service, "PARTIAL_FETCH_ENABLED", True)
+    monkeypatch.setattr(video_search_service, "FFMPEG_PATH", "ffmpeg")
+    service = VideoSearchService.__new__(VideoSearchService)
+    service.clip_store = ClipStore(str(tmp_path / "store"))
+
+    def write(path, size):
+        with open(path, "wb") as f:
+            f.write(b"\0" * size)
+        return path
+
+    service._download_partial = lambda video, path, seconds: write(path, 5) if partial_ok else None
+    service._download_file = lambda video, path, chunk_size=65536: write(path, 50)
+    return service
+
+
+def _indexed(store):
+    with store._db:
+        return store._db.execute("SELECT rendition, size, duration FROM clips ORDER BY rendition").fetchall()
+
+
+def test_partial_clip_is_indexed_with_its_span(tmp_path, monkeypatch):
+    service = _partial_service(tmp_path, monkeypatch, partial_ok=True)
+    video = {**VIDEO, "duration": 30, "alternatives": []}
+
+    path = service.download_video(video, str(tmp_path / "p" / "clip.mp4"), max_seconds=4)
+
+    assert os.path.getsize(path) == 5
+    span = service._partial_span(video, 4)
+    assert _indexed(service.clip_store) == [(f"1080x1920@{span}s", 5, span)]
+
+
+def test_failed_partial_download_stores_the_full_clip_under_the_full_key(tmp_path, monkeypatch):
+    service = _partial_service(tmp_path, monkeypatch, partial_ok=False)
+    video = {**VIDEO, "duration": 30, "alternatives": []}
+
+    path = service.download_video(video, str(tmp_path / "p" / "clip.mp4"), max_seconds=4)
+
+    assert os.path.getsize(path) == 50
+    assert _indexed(service.clip_store) == [("1080x1920", 50, 30)]